@@ -0,0 +1,121 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import time
+from collections import namedtuple
+
+import libtorrent as lt
+
+
+# Private / link-local address ranges treated as LAN for the peer class filter
+LAN_RANGES = (
+    ("10.0.0.0", "10.255.255.255"),
+    ("172.16.0.0", "172.31.255.255"),
+    ("192.168.0.0", "192.168.255.255"),
+    ("127.0.0.0", "127.255.255.255"),
+    ("169.254.0.0", "169.254.255.255"),
+    ("fc00::", "fdff:ffff:ffff:ffff:ffff:ffff:ffff:ffff"),
+    ("fe80::", "febf:ffff:ffff:ffff:ffff:ffff:ffff:ffff"),
+    ("::1", "::1"),
+)
+
+# Effective session-wide limits in bytes/s (0 = unlimited); rule is the active schedule rule's name
+BandwidthLimits = namedtuple("BandwidthLimits", "download_limit upload_limit rule lan_bypass")
+
+
+def peer_class_filter(lan_bypass):
+    """Returns the ip_filter for session.set_peer_class_filter.
+
+    Every address is in the global peer class, which is the one the session-wide
+    rate limits apply to. With lan_bypass, LAN ranges are moved to the local
+    class only, which has no limit.
+    """
+    global_class = 1 << lt.session.global_peer_class_id
+    local_class = 1 << lt.session.local_peer_class_id
+
+    pcf = lt.ip_filter()
+    pcf.add_rule("0.0.0.0", "255.255.255.255", global_class)
+    pcf.add_rule("::", "ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff", global_class)
+    if lan_bypass:
+        for first, last in LAN_RANGES:
+            pcf.add_rule(first, last, local_class)
+    return pcf
+
+
+def _minutes(hhmm):
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def rule_matches(rule, now):
+    """True if a schedule rule covers the struct_time now; end < start wraps past midnight."""
+    start, end = _minutes(rule["start"]), _minutes(rule["end"])
+    minute = now.tm_hour * 60 + now.tm_min
+    days = rule.get("days", range(7))
+    if start <= end:
+        return now.tm_wday in days and start <= minute < end
+    # Overnight rule: the part after midnight belongs to the previous day's window
+    if minute >= start:
+        return now.tm_wday in days
+    return minute < end and (now.tm_wday - 1) % 7 in days
+
+
+class BandwidthScheduler:
+    """Global rate limits plus a weekday/time-of-day schedule, persisted in settings.json.
+
+    The "bandwidth" entry looks like:
+
+        {"download_limit": 0, "upload_limit": 0, "lan_bypass": true,
+         "schedule": [{"name": "business hours", "days": [0, 1, 2, 3, 4],
+                       "start": "09:00", "end": "18:00",
+                       "download_limit": 2097152, "upload_limit": 262144}]}
+
+    Days are 0 = Monday as in time.struct_time. The first matching rule wins;
+    outside every rule the plain download_limit/upload_limit apply.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.config = dict(settings.get("bandwidth", {}))
+
+    def _save(self):
+        self.settings.set("bandwidth", self.config)
+
+    def active(self, now=None):
+        """Returns the BandwidthLimits in force at now (a struct_time, default: local time)."""
+        now = now or time.localtime()
+        lan_bypass = self.config.get("lan_bypass", True)
+        for rule in self.config.get("schedule", []):
+            try:
+                if rule_matches(rule, now):
+                    return BandwidthLimits(rule.get("download_limit", 0), rule.get("upload_limit", 0),
+                                           rule.get("name", f"{rule['start']}-{rule['end']}"), lan_bypass)
+            except (KeyError, ValueError) as e:
+                print(f"DEBUG: Ignoring malformed bandwidth rule {rule!r}: {e}")
+        return BandwidthLimits(self.config.get("download_limit", 0), self.config.get("upload_limit", 0),
+                               None, lan_bypass)
+
+    def set_global(self, download_limit, upload_limit):
+        self.config["download_limit"] = max(0, int(download_limit))
+        self.config["upload_limit"] = max(0, int(upload_limit))
+        self._save()
+
+    def set_schedule(self, rules):
+        # Validate up front so a typo can't silently disable the schedule later
+        for rule in rules:
+            _minutes(rule["start"])
+            _minutes(rule["end"])
+        self.config["schedule"] = list(rules)
+        self._save()
+
+    def set_lan_bypass(self, enabled):
+        self.config["lan_bypass"] = bool(enabled)
+        self._save()
@@ -0,0 +1,69 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import libtorrent as lt
+
+
+# Paused torrents are demoted to cold after this long (seconds); 0 disables demotion
+DEFAULT_DEMOTE_AFTER = 24 * 60 * 60
+
+
+class ColdRecord:
+    """A torrent kept out of the libtorrent session: just enough to show its row.
+
+    The resume file stays on disk and is read back only when the torrent is
+    resumed. The record doubles as the torrent's status, with the attributes
+    TorrentModel.update and the RPC layer read from torrent_status.
+    """
+
+    __slots__ = ("name", "has_metadata", "total_wanted", "total_done", "progress", "save_path", "added_time")
+
+    # Fixed for every cold torrent
+    paused = True
+    auto_managed = False
+    num_peers = 0
+    download_rate = 0
+    upload_rate = 0
+    queue_position = -1
+    need_save_resume = False
+    state = "cold"
+
+    def __init__(self, name, has_metadata, total_wanted, total_done, save_path, added_time):
+        self.name = name
+        self.has_metadata = has_metadata
+        self.total_wanted = total_wanted
+        self.total_done = total_done
+        self.progress = total_done / total_wanted if total_wanted else 0.0
+        self.save_path = save_path
+        self.added_time = added_time
+
+    @classmethod
+    def from_params(cls, params):
+        """Builds a record from add_torrent_params as decoded from resume data."""
+        ti = params.ti
+        if ti is not None:
+            name = ti.name()
+            total = ti.total_size()
+            piece_length = ti.piece_length()
+        else:
+            name = params.name
+            total = 0
+            piece_length = 0
+        have = sum(1 for piece in params.have_pieces if piece) if params.have_pieces else 0
+        # Piece-granular, like the list's progress bar; the last piece may be short
+        done = min(total, have * piece_length)
+        return cls(name, ti is not None, total, done, params.save_path, int(params.added_time))
+
+
+def is_cold_candidate(params):
+    """True for torrents the user paused: not auto-managed, so nothing would start them."""
+    flags = params.flags
+    return bool(flags & lt.torrent_flags.paused) and not flags & lt.torrent_flags.auto_managed
@@ -0,0 +1,92 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import time
+from array import array
+
+
+# One sample slot per second of wall-clock time
+HISTORY_RESOLUTION = 1.0
+# Two minutes per torrent, ten for the session totals
+TORRENT_HISTORY_LENGTH = 120
+SESSION_HISTORY_LENGTH = 600
+
+# Unsigned 32-bit bytes/s: up to 4 GiB/s, 8 bytes per sample for both directions
+_TYPECODE = "I"
+_MAX_RATE = 0xFFFFFFFF
+
+
+def history_slot(now=None):
+    """Returns the sample slot for a monotonic timestamp (default: now)."""
+    return int((time.monotonic() if now is None else now) / HISTORY_RESOLUTION)
+
+
+class RateHistory:
+    """Fixed-size ring buffer of download/upload rate samples.
+
+    Statuses only arrive for torrents that changed, so record() fills skipped
+    slots with the previous value and values() extends the newest sample up
+    to the requested slot. The arrays are allocated on the first non-zero
+    sample: torrents that never transfer anything cost no history memory.
+    """
+
+    __slots__ = ("length", "download", "upload", "newest")
+
+    def __init__(self, length=TORRENT_HISTORY_LENGTH):
+        self.length = length
+        self.download = None
+        self.upload = None
+        self.newest = None # slot of the most recent sample
+
+    def record(self, slot, download_rate, upload_rate):
+        if self.download is None:
+            if not download_rate and not upload_rate:
+                return
+            self.download = array(_TYPECODE, bytes(4 * self.length))
+            self.upload = array(_TYPECODE, bytes(4 * self.length))
+            self.newest = slot - 1
+
+        if slot > self.newest:
+            # Repeat the last sample across slots nobody reported (at most one full turn)
+            last = self.newest % self.length
+            down, up = self.download[last], self.upload[last]
+            for missing in range(max(self.newest + 1, slot - self.length + 1), slot):
+                self.download[missing % self.length] = down
+                self.upload[missing % self.length] = up
+            self.newest = slot
+
+        index = self.newest % self.length
+        self.download[index] = min(max(0, int(download_rate)), _MAX_RATE)
+        self.upload[index] = min(max(0, int(upload_rate)), _MAX_RATE)
+
+    def values(self, end_slot, count):
+        """Returns ([download], [upload]) for the count slots ending at end_slot, oldest first.
+
+        Slots before the first sample read as 0; slots after the newest one
+        repeat it, since an unreported torrent kept its rate.
+        """
+        if self.download is None:
+            return [0] * count, [0] * count
+
+        downloads, uploads = [], []
+        oldest_kept = self.newest - self.length + 1
+        newest = self.newest % self.length
+        for slot in range(end_slot - count + 1, end_slot + 1):
+            if slot < oldest_kept:
+                downloads.append(0)
+                uploads.append(0)
+            elif slot > self.newest:
+                downloads.append(self.download[newest])
+                uploads.append(self.upload[newest])
+            else:
+                downloads.append(self.download[slot % self.length])
+                uploads.append(self.upload[slot % self.length])
+        return downloads, uploads
@@ -0,0 +1,56 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+
+
+def torrent_key(obj):
+    """Returns the hex info-hash used to identify a torrent across handles, statuses and params.
+
+    Works with libtorrent 2.x (info_hashes) as well as 1.2 (info_hash), and with
+    both the method form (torrent_handle) and the attribute form (torrent_status,
+    add_torrent_params).
+    """
+    hashes = getattr(obj, "info_hashes", None)
+    if hashes is not None:
+        if callable(hashes):
+            hashes = hashes()
+        return str(hashes.get_best())
+
+    info_hash = obj.info_hash
+    if callable(info_hash):
+        info_hash = info_hash()
+    return str(info_hash)
+
+
+def params_key(params):
+    """Returns the key for add_torrent_params, whose hashes may only be known through ti."""
+    if params.ti is not None:
+        return torrent_key(params.ti)
+    return torrent_key(params)
+
+
+def torrent_aliases(obj):
+    """Returns every hex info-hash a torrent can be referred to by (best, v1 and full v2)."""
+    aliases = {torrent_key(obj)}
+    hashes = getattr(obj, "info_hashes", None)
+    if hashes is not None:
+        if callable(hashes):
+            hashes = hashes()
+        if hashes.has_v1():
+            aliases.add(str(hashes.v1))
+        if hashes.has_v2():
+            aliases.add(str(hashes.v2))
+    return aliases
+
+
+def shard_index(key, count):
+    """Returns which of count shards owns a torrent; stable for a given info-hash and shard count."""
+    return int(key[:8], 16) % count
@@ -0,0 +1,205 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from pathlib import Path
+
+from gi.repository import Gio
+
+from CascadeRT.core.registry import DuplicateTorrentError
+
+
+TORRENT_SUFFIX = ".torrent"
+# Text files holding one magnet link per line
+MAGNET_LIST_SUFFIXES = (".magnet", ".magnets", ".txt")
+# Watch-folder files are renamed with this suffix once imported, so they aren't picked up again
+IMPORTED_SUFFIX = ".added"
+# Lines of an imported magnet list that could not be added are kept in a file with this suffix;
+# a file nothing could be added from is renamed with it
+FAILED_SUFFIX = ".failed"
+# Sources parsed per round; bounds the futures and parsed params held at once
+IMPORT_CHUNK = 256
+
+
+def expand_sources(sources):
+    """Flattens folders and magnet-list files into (origin, source) pairs.
+
+    source is a single magnet link or .torrent path; origin is the file it came
+    from (the .torrent itself, or the magnet list), or None for a bare magnet.
+    """
+    for source in sources:
+        source = source.strip()
+        if not source:
+            continue
+        if source.startswith("magnet:"):
+            yield None, source
+            continue
+
+        path = Path(source).expanduser()
+        if path.is_dir():
+            for child in sorted(path.iterdir()):
+                if child.suffix == TORRENT_SUFFIX:
+                    yield str(child), str(child)
+        elif path.suffix in MAGNET_LIST_SUFFIXES:
+            try:
+                lines = path.read_text().splitlines()
+            except OSError as e:
+                print(f"DEBUG: Could not read magnet list {path}: {e}")
+                continue
+            for line in lines:
+                if line.strip().startswith("magnet:"):
+                    yield str(path), line.strip()
+        else:
+            yield str(path), str(path)
+
+
+class Importer:
+    """Bulk ingestion for TorrentSession: parse in a worker pool, dedupe by info-hash, add asynchronously.
+
+    Nothing here runs on the GTK main thread. Parsed torrents go through
+    TorrentSession.add_params (async_add_torrent, throttled to one batch in
+    flight), and rows reach the UI through the usual chunked subscribe_added path.
+    """
+
+    def __init__(self, session, workers=None):
+        self.session = session
+        self._pool = ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 2),
+                                        thread_name_prefix="cascadert-import")
+        self._monitor = None
+        self._stopping = threading.Event()
+
+    def submit(self, sources, save_path, on_imported=None):
+        """Starts importing in the background.
+
+        on_imported(path, imported, failed) runs once per file the sources
+        came from: imported is False if nothing in it could be added, and
+        failed lists the sources from it that could not be (lines of a
+        magnet list). An import cut short by shutdown() reports nothing.
+        """
+        sources = list(sources)
+        threading.Thread(target=self._run, args=(sources, str(save_path), on_imported),
+                         name="cascadert-import-batch", daemon=True).start()
+
+    def _run(self, sources, save_path, on_imported):
+        started = time.monotonic()
+        counts = {"added": 0, "duplicate": 0, "failed": 0}
+        pairs = expand_sources(sources)
+        consumed = set()
+        failed = {} # origin -> its sources that could not be added
+
+        # Parsing is the expensive part and runs across the pool, one chunk at a
+        # time; results are consumed in order so duplicates resolve deterministically.
+        try:
+            while not self._stopping.is_set():
+                chunk = list(itertools.islice(pairs, IMPORT_CHUNK))
+                if not chunk:
+                    break
+                parsed = self._pool.map(lambda pair: self._parse(pair[1], save_path), chunk)
+                for (origin, source), result in zip(chunk, parsed):
+                    outcome = "failed" if result is None else self._add(source, result)
+                    counts[outcome] += 1
+                    if origin is None:
+                        continue
+                    if outcome == "failed":
+                        failed.setdefault(origin, []).append(source)
+                    else:
+                        consumed.add(origin)
+        except (RuntimeError, CancelledError):
+            # The pool was shut down under us; only shutdown() does that
+            if not self._stopping.is_set():
+                raise
+        if self._stopping.is_set():
+            # Files are left as they are and picked up again on the next start
+            return
+
+        if on_imported is not None:
+            for origin in consumed | set(failed):
+                on_imported(origin, origin in consumed, failed.get(origin, []))
+
+        print(f"DEBUG: Imported {counts['added']} torrents ({counts['duplicate']} duplicates, "
+              f"{counts['failed']} failed) in {time.monotonic() - started:.2f}s.")
+
+    def _add(self, source, parsed):
+        key, params = parsed
+        # The session registry covers both live torrents and adds still in flight
+        try:
+            self.session.add_params(key, params, throttle=True)
+        except DuplicateTorrentError:
+            return "duplicate"
+        except Exception as e:
+            print(f"DEBUG: Failed to import {source}: {e}")
+            return "failed"
+        return "added"
+
+    def _parse(self, source, save_path):
+        try:
+            return self.session.parse_source(source, save_path)
+        except Exception as e:
+            print(f"DEBUG: Failed to import {source}: {e}")
+            return None
+
+    def watch(self, folder, save_path):
+        """Imports everything already in folder, then follows it through an inotify-backed Gio monitor."""
+        folder.mkdir(parents=True, exist_ok=True)
+        self._watch_save_path = save_path
+        self.submit([str(p) for p in sorted(folder.iterdir()) if self._is_candidate(p)],
+                    save_path, on_imported=self._mark_imported)
+
+        self._monitor = Gio.File.new_for_path(str(folder)).monitor_directory(
+            Gio.FileMonitorFlags.WATCH_MOVES, None)
+        self._monitor.connect("changed", self._on_folder_changed)
+        print(f"DEBUG: Watching {folder} for new torrents.")
+
+    def _is_candidate(self, path):
+        return path.is_file() and (path.suffix == TORRENT_SUFFIX or path.suffix in MAGNET_LIST_SUFFIXES)
+
+    def _on_folder_changed(self, monitor, file, other_file, event_type):
+        # Only react once a file is complete: written and closed, or moved in whole
+        if event_type == Gio.FileMonitorEvent.CHANGES_DONE_HINT:
+            path = Path(file.get_path())
+        elif event_type == Gio.FileMonitorEvent.MOVED_IN:
+            path = Path(file.get_path())
+        elif event_type == Gio.FileMonitorEvent.RENAMED and other_file is not None:
+            path = Path(other_file.get_path())
+        else:
+            return
+        if self._is_candidate(path):
+            self.submit([str(path)], self._watch_save_path, on_imported=self._mark_imported)
+
+    def _mark_imported(self, origin, imported, failed):
+        path = Path(origin)
+        if not imported:
+            # Nothing in it could be added; set it aside so it isn't parsed on every start
+            target = path.with_name(path.name + FAILED_SUFFIX)
+        else:
+            target = path.with_name(path.name + IMPORTED_SUFFIX)
+            if failed:
+                # The rest of the list is in; keep what didn't make it next to it
+                try:
+                    with open(path.with_name(path.name + FAILED_SUFFIX), "a") as f:
+                        f.write("".join(f"{source}\n" for source in failed))
+                except OSError as e:
+                    print(f"DEBUG: Could not record failed lines of {path}: {e}")
+        try:
+            os.replace(path, target)
+        except OSError as e:
+            print(f"DEBUG: Could not mark {path} as imported: {e}")
+
+    def shutdown(self):
+        self._stopping.set()
+        if self._monitor is not None:
+            self._monitor.cancel()
+            self._monitor = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
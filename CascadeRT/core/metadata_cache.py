@@ -0,0 +1,102 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class MetadataCache:
+    """Bencoded .torrent files for magnets whose metadata has been seen, named by info-hash.
+
+    Bounded by total size with least-recently-used eviction. Use order is
+    kept in file mtimes, so it survives restarts. Entries are only a
+    shortcut, so writes aren't fsync'ed: a lost entry just means fetching
+    the metadata from the swarm again.
+    """
+
+    SUFFIX = ".torrent"
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # info-hash -> size, least recently used first
+        self._total = 0
+
+        paths = []
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            paths.append((stat.st_mtime, path.name[:-len(self.SUFFIX)], stat.st_size))
+        for _, key, size in sorted(paths):
+            self._entries[key] = size
+            self._total += size
+        with self._lock:
+            self._evict_locked()
+
+    def path_for(self, key):
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key):
+        """Returns the cached bytes for an info-hash, or None; a hit makes it most recently used."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        path = self.path_for(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError as e:
+            print(f"DEBUG: Metadata cache entry {key} unreadable: {e}")
+            self.discard(key)
+            return None
+        return data
+
+    def put(self, key, data):
+        path = self.path_for(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"DEBUG: Could not cache metadata for {key}: {e}")
+            return
+
+        with self._lock:
+            self._total += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict_locked()
+
+    def discard(self, key):
+        """Drops an entry, e.g. one whose bytes turned out not to be valid metadata."""
+        with self._lock:
+            self._total -= self._entries.pop(key, 0)
+        self.path_for(key).unlink(missing_ok=True)
+
+    def _evict_locked(self):
+        while self._total > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total -= size
+            self.path_for(key).unlink(missing_ok=True)
@@ -0,0 +1,202 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in sorted(labels.items())) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def families(self):
+        yield self.name, self.kind, self.help, [({}, self._value)]
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self._values = {} # frozenset of label items -> value
+
+    def set(self, value, **labels):
+        self._values[frozenset(labels.items())] = value
+
+    def families(self):
+        yield self.name, self.kind, self.help, [(dict(labels), value) for labels, value in list(self._values.items())]
+
+
+class Timing:
+    """Durations in seconds, exported as a summary (_count, _sum) plus _max and _last gauges."""
+
+    kind = "summary"
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._last = 0.0
+
+    def observe(self, seconds):
+        with self._lock:
+            self._count += 1
+            self._sum += seconds
+            self._last = seconds
+            if seconds > self._max:
+                self._max = seconds
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def families(self):
+        with self._lock:
+            count, total, largest, last = self._count, self._sum, self._max, self._last
+        yield self.name, self.kind, self.help, [({}, count, "_count"), ({}, total, "_sum")]
+        yield self.name + "_max", "gauge", f"Largest sample of {self.name}", [({}, largest)]
+        yield self.name + "_last", "gauge", f"Latest sample of {self.name}", [({}, last)]
+
+
+class MetricsRegistry:
+    """Named counters, gauges and timings, rendered in the Prometheus text format.
+
+    Recording is cheap and lock-light, so the hot paths (status pump, GTK flush)
+    can record every tick. Collectors run only at scrape time and are where
+    bulk data such as the libtorrent session counters gets exported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = []
+
+    def _get(self, cls, name, help):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help)
+            return metric
+
+    def counter(self, name, help=""):
+        return self._get(Counter, name, help)
+
+    def gauge(self, name, help=""):
+        return self._get(Gauge, name, help)
+
+    def timing(self, name, help=""):
+        return self._get(Timing, name, help)
+
+    def add_collector(self, collector):
+        """Registers collector() -> iterable of (name, kind, help, [(labels, value), ...]) families."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        families = [family for metric in metrics for family in metric.families()]
+
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                print(f"DEBUG: Metrics collector failed: {e}")
+
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            # A sample may carry a suffix (_count, _sum) after labels and value
+            for labels, value, *suffix in samples:
+                lines.append(f"{name}{''.join(suffix)}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry; the session and the UI both record into it
+METRICS = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood stdout
+        pass
+
+
+class MetricsServer:
+    """Serves a MetricsRegistry over HTTP on localhost (GET /metrics)."""
+
+    def __init__(self, registry=METRICS, port=9808, host=DEFAULT_METRICS_HOST):
+        self.registry = registry
+        self.address = (host, port)
+        self._server = None
+
+    def start(self):
+        self._server = ThreadingHTTPServer(self.address, _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.registry = self.registry
+        threading.Thread(target=self._server.serve_forever, name="cascadert-metrics", daemon=True).start()
+        print(f"DEBUG: Metrics at http://{self.address[0]}:{self._server.server_port}/metrics")
+
+    def shutdown(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
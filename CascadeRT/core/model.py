@@ -13,6 +13,38 @@ import gi
 gi.require_version("GObject", "2.0")
 from gi.repository import GObject
 
+from CascadeRT.core.history import RateHistory
+
+# Smallest changes worth pushing to the UI (rates are shown in KB/s, progress as a bar)
+RATE_MIN_DELTA = 1024 // 10 # one step of the labels' 0.1 KB/s
+RATE_REL_DELTA = 0.02
+PROGRESS_MIN_DELTA = 0.001
+
+# ETA used for sorting when there is no estimate (paused, stalled, no metadata)
+ETA_UNKNOWN = 1 << 62
+
+# libtorrent torrent_status.state -> coarse state used for filtering
+STATE_GROUPS = {
+    "checking_files": "checking",
+    "checking_resume_data": "checking",
+    "allocating": "checking",
+    "downloading_metadata": "metadata",
+    "downloading": "downloading",
+    "finished": "seeding",
+    "seeding": "seeding",
+}
+
+
+def state_name(state):
+    """Returns the libtorrent state as a plain string (enum from the bindings, or already a str over RPC)."""
+    return getattr(state, "name", None) or str(state).rsplit(".", 1)[-1]
+
+
+# Properties TorrentModel.sync() copies from a StatusTable row
+SYNCED_PROPS = ("name", "paused", "state", "added_time", "queue_position", "progress", "total_size",
+                "num_peers", "download_rate", "upload_rate", "eta", "eta_seconds")
+
+
 class TorrentModel(GObject.GObject):
     name = GObject.Property(type=str)
     progress = GObject.Property(type=float)
@@ -22,21 +54,44 @@ class TorrentModel(GObject.GObject):
     eta = GObject.Property(type=str)
     paused = GObject.Property(type=bool, default=False)
 
+    # Sort / filter keys
+    eta_seconds = GObject.Property(type=GObject.TYPE_INT64, default=ETA_UNKNOWN)
+    added_time = GObject.Property(type=GObject.TYPE_INT64)
+    state = GObject.Property(type=str, default="downloading")
+    # Download queue position; -1 while seeding or not in the queue
+    queue_position = GObject.Property(type=GObject.TYPE_INT, default=-1)
+
     # NEW PROPERTIES for Detail Panel
     num_peers = GObject.Property(type=GObject.TYPE_INT)
     num_trackers = GObject.Property(type=GObject.TYPE_INT)
-    dht_nodes = GObject.Property(type=GObject.TYPE_INT)
+    trackers_working = GObject.Property(type=GObject.TYPE_INT)
+    trackers_failing = GObject.Property(type=GObject.TYPE_INT)
+    last_announce = GObject.Property(type=float) # unix time, 0 if never announced
 
-    def __init__(self, handle):
+    def __init__(self, key, name="", paused=False):
         super().__init__()
-        self.handle = handle
+        # Info-hash; every action goes through the session by key, so the model
+        # works the same against an embedded session or a remote daemon.
+        self.key = key
+        # Row of the list's StatusTable holding this torrent's latest status
+        self.slot = -1
+        # True while a list row widget shows this torrent
+        self.bound = False
 
-        self.paused = handle.status().paused
-        initial_name = self.handle.status().name
+        # Seeded from the add_torrent_alert; no synchronous handle.status() round trip
+        self.paused = paused
+        initial_name = name
         if not initial_name:
             initial_name = "(fetching metadata…)"
             
         self.name = initial_name
+        # Precomputed for the text filter so searching never lowercases per keystroke
+        self.name_lower = initial_name.lower()
+        self.state = "paused" if paused else "downloading"
+        self._changed = set()
+        # Rate samples for the detail panel's sparkline; allocated once the torrent transfers
+        # (recorded by the list for every status, on screen or not)
+        self.history = RateHistory()
         self.progress = 0.0
         self.download_rate = 0
         self.upload_rate = 0
@@ -46,52 +101,79 @@ class TorrentModel(GObject.GObject):
         # Initialize new properties
         self.num_peers = 0
         self.num_trackers = 0 
-        self.dht_nodes = 0
+        self.trackers_working = 0
+        self.trackers_failing = 0
+        self.last_announce = 0.0
 
-    def update(self, status, dht_count=0): # Accepting dht_count from session
-        # CRITICAL FIX 1: Ensure the model's internal paused state is updated 
-        self.paused = status.paused
+    def _set(self, name, value):
+        # Only write when the value actually changed: every write emits notify::*,
+        # which in turn rebuilds label strings in the list rows.
+        if self.get_property(name) != value:
+            self.set_property(name, value)
+            self._changed.add(name)
 
-        if status.has_metadata:
-            self.name = status.name
-            self.progress = status.progress
-            self.total_size = status.total_wanted
+    def _set_rate(self, name, value):
+        old = self.get_property(name)
+        if value == old:
+            return
+        # Ignore jitter below what the KB/s display can meaningfully show,
+        # but always let a rate drop to zero through.
+        if value and abs(value - old) < max(RATE_MIN_DELTA, old * RATE_REL_DELTA):
+            return
+        self.set_property(name, value)
+        self._changed.add(name)
 
-            # PEERS: Correct and always available in status
-            self.num_peers = status.num_peers 
-            
-            # 💡 FINAL FIX: TRACKERS - Calculate the number of WORKING trackers manually.
-            # This is done by checking the error status of each announcement entry.
-            try:
-                # Count configured trackers once metadata is ready
-                self.num_trackers = len(self.handle.trackers())
-            except Exception:
-                # Fallback for transient errors or if handle is invalid
-                self.num_trackers = 0
-            
-            # DHT NODES: Using the correct, session-level count passed in from window.py
-            self.dht_nodes = dht_count 
-
-            # CRITICAL FIX 2: Check for the paused flag FIRST to control UI.
-            if self.paused:
-                self.download_rate = 0
-                self.upload_rate = 0
-                self.eta = "Paused"
-            else:
-                # If not paused, use live stats
-                self.download_rate = status.download_rate
-                self.upload_rate = status.upload_rate
-                if status.download_rate > 0:
-                    remaining = status.total_wanted - status.total_done
-                    seconds = remaining / status.download_rate
-                    # Incorporating your good practice for ETA calculation
-                    self.eta = f"{int(round(seconds // 60))}m {int(round(seconds % 60))}s"
-                else:
-                    self.eta = "∞"
+    def sync(self, table, props=None):
+        """Copies this torrent's row of a StatusTable into its properties.
+
+        props limits the copy to some property names (default: all of them);
+        rows that are not on screen only need their sort and filter keys.
+        Returns the set of property names that were written.
+        """
+        self._changed = set()
+        slot = self.slot
+        with self.freeze_notify():
+            for prop in SYNCED_PROPS if props is None else props:
+                self._sync_prop(table, slot, prop)
+        if "name" in self._changed:
+            self.name_lower = self.name.lower()
+        return self._changed
+
+    def update_trackers(self, summary):
+        """Applies a TrackerSummary from the session's tracker cache."""
+        self._changed = set()
+        with self.freeze_notify():
+            self._set("num_trackers", summary.total)
+            self._set("trackers_working", summary.working)
+            self._set("trackers_failing", summary.failing)
+            self._set("last_announce", summary.last_announce)
+
+    def _sync_prop(self, table, slot, prop):
+        if prop in ("download_rate", "upload_rate"):
+            self._set_rate(prop, getattr(table, prop)[slot])
+        elif prop == "progress":
+            progress = table.progress[slot]
+            if abs(progress - self.progress) >= PROGRESS_MIN_DELTA or progress in (0.0, 1.0):
+                self._set("progress", progress)
+        elif prop == "name":
+            self._set("name", table.names[slot] if table.has_metadata[slot] else "(fetching metadata…)")
+        elif prop == "state":
+            self._set("state", table.state_name(slot))
+        elif prop == "paused":
+            self._set("paused", table.state_name(slot) in ("queued", "paused"))
+        elif prop == "eta":
+            self._set("eta", eta_text(table, slot))
         else:
-            # Metadata missing logic
-            self.name = "(fetching metadata…)"
-            self.progress = 0.0
-            self.download_rate = status.download_rate 
-            self.total_size = 0
-            self.eta = "---"
\ No newline at end of file
+            self._set(prop, getattr(table, prop)[slot])
+
+
+def eta_text(table, slot):
+    state = table.state_name(slot)
+    if not table.has_metadata[slot]:
+        return "---"
+    if state in ("queued", "paused"):
+        return state.capitalize()
+    seconds = table.eta_seconds[slot]
+    if seconds == ETA_UNKNOWN:
+        return "∞"
+    return f"{seconds // 60}m {seconds % 60}s"
@@ -0,0 +1,54 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import libtorrent as lt
+
+
+# Fields of each peer dict returned by TorrentSession.get_peer_info
+PEER_FIELDS = ("endpoint", "client", "download_rate", "upload_rate", "progress", "flags")
+
+
+def peer_flags(peer):
+    """Returns the usual one-letter peer flags (D/d, U/u, O, S, E, P, I)."""
+    flags = peer.flags
+    info = lt.peer_info
+    letters = []
+    if flags & info.interesting:
+        letters.append("d" if flags & info.remote_choked else "D")
+    if flags & info.remote_interested:
+        letters.append("u" if flags & info.choked else "U")
+    if flags & info.optimistic_unchoke:
+        letters.append("O")
+    if flags & info.snubbed:
+        letters.append("S")
+    if flags & (info.rc4_encrypted | info.plaintext_encrypted):
+        letters.append("E")
+    if flags & info.utp_socket:
+        letters.append("P")
+    if not flags & info.local_connection:
+        letters.append("I")
+    return "".join(letters)
+
+
+def peer_to_dict(peer):
+    address, port = peer.ip
+    endpoint = f"[{address}]:{port}" if ":" in address else f"{address}:{port}"
+    client = peer.client
+    if isinstance(client, bytes):
+        client = client.decode("utf-8", "replace")
+    return {
+        "endpoint": endpoint,
+        "client": client,
+        "download_rate": peer.down_speed,
+        "upload_rate": peer.up_speed,
+        "progress": peer.progress,
+        "flags": peer_flags(peer),
+    }
@@ -0,0 +1,92 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import threading
+
+
+class DuplicateTorrentError(KeyError):
+    pass
+
+
+class TorrentEntry:
+    __slots__ = ("key", "aliases", "handle", "cold", "model", "position")
+
+    def __init__(self, key, aliases, handle=None, model=None, position=None):
+        self.key = key
+        self.aliases = aliases
+        self.handle = handle     # engine side: lt.torrent_handle (None while the add is pending)
+        self.cold = None         # engine side: ColdRecord while the torrent is kept out of libtorrent
+        self.model = model       # UI side: TorrentModel
+        self.position = position # UI side: index in the Gio.ListStore
+
+
+class TorrentRegistry:
+    """Info-hash keyed index of torrents with constant-time add, lookup and remove.
+
+    A torrent can be looked up by any of its aliases (v1 hash, full v2 hash, or
+    the key itself), so a hybrid torrent added once by v1 magnet and again from
+    its .torrent file is caught as a duplicate.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = {} # key -> TorrentEntry
+        self._aliases = {} # alias -> key
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def add(self, key, aliases=(), handle=None, model=None, position=None):
+        """Registers a torrent; raises DuplicateTorrentError if any of its hashes is known."""
+        aliases = set(aliases) | {key}
+        with self._lock:
+            for alias in aliases:
+                if alias in self._aliases:
+                    raise DuplicateTorrentError(self._aliases[alias])
+            entry = TorrentEntry(key, aliases, handle, model, position)
+            self._entries[key] = entry
+            for alias in aliases:
+                self._aliases[alias] = key
+            return entry
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(self._aliases.get(key, key))
+
+    def remove(self, key):
+        """Drops a torrent and all its aliases; returns its entry, or None if unknown."""
+        with self._lock:
+            entry = self._entries.pop(self._aliases.get(key, key), None)
+            if entry is not None:
+                for alias in entry.aliases:
+                    self._aliases.pop(alias, None)
+            return entry
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def entries(self):
+        with self._lock:
+            return list(self._entries.values())
+
+    def handles(self):
+        """Returns the handles of every torrent libtorrent has confirmed (cold torrents have none)."""
+        with self._lock:
+            return [entry.handle for entry in self._entries.values() if entry.handle is not None]
+
+    def cold_entries(self):
+        """Returns the entries of torrents held as cold records."""
+        with self._lock:
+            return [entry for entry in self._entries.values() if entry.cold is not None]
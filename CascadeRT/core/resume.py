@@ -0,0 +1,123 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import os
+from pathlib import Path
+
+from CascadeRT.core.infohash import shard_index
+
+
+class ResumeStore:
+    """Keeps one bencoded fast-resume file per torrent, named by info-hash.
+
+    Every write goes to a temporary file that is fsync'ed and then renamed over
+    the old one, so a crash leaves either the previous or the new checkpoint on
+    disk, never a half-written file.
+    """
+
+    SUFFIX = ".fastresume"
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key):
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def write(self, key, data):
+        path = self.path_for(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._sync_directory()
+
+    def read(self, key):
+        """Returns the stored bytes for one torrent; raises OSError if there are none."""
+        return self.path_for(key).read_bytes()
+
+    def delete(self, key):
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def quarantine(self, key):
+        """Moves an unreadable entry aside so it is kept for inspection but not retried."""
+        path = self.path_for(key)
+        try:
+            os.replace(path, path.with_name(path.name + ".corrupt"))
+        except OSError as e:
+            print(f"DEBUG: Could not quarantine {path}: {e}")
+
+    def load_all(self):
+        """Yields (key, data) for every stored entry, skipping the ones that cannot be read."""
+        for path in sorted(self.directory.glob(f"*{self.SUFFIX}.tmp")):
+            # Leftovers of a write interrupted before its rename; the previous file is intact
+            path.unlink(missing_ok=True)
+
+        for path in sorted(self.directory.glob(f"*{self.SUFFIX}")):
+            key = path.name[:-len(self.SUFFIX)]
+            try:
+                data = path.read_bytes()
+            except OSError as e:
+                print(f"DEBUG: Failed to read resume file {path}: {e}. Skipping.")
+                continue
+            if not data:
+                print(f"DEBUG: Resume file {path} is empty. Skipping.")
+                continue
+            yield key, data
+
+    def _sync_directory(self):
+        # Make the rename itself durable
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def shard_data_dir(config_dir, index):
+    return Path(config_dir) / "shards" / str(index)
+
+
+def rebalance_resume_files(config_dir, count):
+    """Moves resume files to the shard that owns them under count shards.
+
+    With count == 1 everything goes back to config_dir/resume, the unsharded
+    layout; otherwise to config_dir/shards/<index>/resume. Runs before any
+    session is started, so no store is writing while files move.
+    """
+    config_dir = Path(config_dir)
+    sources = [config_dir / "resume"] + sorted((config_dir / "shards").glob("*/resume"))
+
+    def target(key):
+        if count == 1:
+            return config_dir / "resume"
+        return shard_data_dir(config_dir, shard_index(key, count)) / "resume"
+
+    moved = 0
+    for directory in sources:
+        for path in directory.glob(f"*{ResumeStore.SUFFIX}"):
+            destination = target(path.name[:-len(ResumeStore.SUFFIX)])
+            if destination == directory:
+                continue
+            destination.mkdir(parents=True, exist_ok=True)
+            try:
+                os.replace(path, destination / path.name)
+                moved += 1
+            except OSError as e:
+                print(f"DEBUG: Could not move {path} to {destination}: {e}")
+    if moved:
+        print(f"DEBUG: Moved {moved} resume files for {count} shard(s).")
+    return moved
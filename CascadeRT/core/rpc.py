@@ -0,0 +1,549 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import itertools
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+from CascadeRT.core.bandwidth import BandwidthLimits
+from CascadeRT.core.model import state_name
+from CascadeRT.core.registry import DuplicateTorrentError
+from CascadeRT.core.stats import SessionSnapshot
+from CascadeRT.core.trackers import TrackerSummary
+
+
+# Wire format: one JSON object per line in both directions.
+#   request:  {"id": 1, "method": "pause_torrent", "params": {"key": "..."}}
+#   response: {"id": 1, "result": ...} or {"id": 1, "error": "...", "error_type": "KeyError"}
+#   event:    {"event": "status", "data": ...}  (only after a "subscribe" call)
+
+# torrent_status fields mirrored to clients; TorrentModel.update reads exactly these
+STATUS_FIELDS = (
+    "name",
+    "paused",
+    "has_metadata",
+    "progress",
+    "total_wanted",
+    "total_done",
+    "num_peers",
+    "download_rate",
+    "upload_rate",
+    "state",
+    "added_time",
+    "auto_managed",
+    "queue_position",
+)
+
+# TorrentSession methods a client may call by name
+RPC_METHODS = (
+    "add_torrent",
+    "add_source",
+    "remove_torrent",
+    "pause_torrent",
+    "resume_torrent",
+    "demote_torrent",
+    "get_statuses",
+    "get_peer_info",
+    "get_files",
+    "get_file_progress",
+    "set_file_priorities",
+    "list_torrents",
+    "import_sources",
+    "list_profiles",
+    "apply_profile",
+    "get_limits",
+    "set_global_limits",
+    "set_bandwidth_schedule",
+    "set_lan_bypass",
+    "set_rate_shares",
+    "get_torrent_limits",
+    "set_torrent_limits",
+    "move_queue",
+    "get_queue_limits",
+    "set_queue_limits",
+)
+
+# Events queued for a client that stops reading before it gets disconnected
+MAX_OUTBOX = 1000
+
+
+class RpcError(Exception):
+    pass
+
+
+# Server-side exceptions a client gets back as themselves rather than as RpcError
+REMOTE_ERRORS = {
+    "DuplicateTorrentError": DuplicateTorrentError,
+}
+
+
+def default_socket_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    base = Path(runtime_dir) if runtime_dir else Path.home() / ".config" / "CascadeRT"
+    return base / "cascadert.sock"
+
+
+def shard_socket_path(index):
+    """Socket of sharded mode's worker number index."""
+    return default_socket_path().with_name(f"cascadert-shard{index}.sock")
+
+
+def socket_in_use(path):
+    """True if something accepts connections on the Unix socket at path (a stale file doesn't)."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+def status_to_dict(status):
+    data = {field: getattr(status, field) for field in STATUS_FIELDS}
+    # torrent_status.state is a bindings enum; clients only need its name
+    data["state"] = state_name(status.state)
+    data["queue_position"] = int(status.queue_position)
+    return data
+
+
+class _Connection(socketserver.StreamRequestHandler):
+    """One client. Reads requests on the server thread, writes from its own writer thread.
+
+    Everything sent to the client goes through the outbox, so a slow client can
+    never block the status pump that produces the events.
+    """
+
+    def setup(self):
+        super().setup()
+        self._outbox = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="cascadert-rpc-writer", daemon=True)
+        self._writer.start()
+
+    def handle(self):
+        rpc = self.server.rpc
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                self.send({"id": None, "error": "malformed request"})
+                continue
+            rpc.dispatch(self, request)
+
+    def finish(self):
+        self.server.rpc.unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        super().finish()
+
+    def send(self, message):
+        line = (json.dumps(message) + "\n").encode()
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._outbox) >= MAX_OUTBOX:
+                print("DEBUG: RPC client is not reading; dropping connection.")
+                self._closed = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+            else:
+                self._outbox.append(line)
+            self._cond.notify()
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while not self._outbox and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                data, self._outbox = b"".join(self._outbox), []
+            try:
+                self.connection.sendall(data)
+            except OSError:
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class RpcServer:
+    """Serves a TorrentSession over a local Unix socket.
+
+    Subscribed clients get the torrent list on subscribe and then push events:
+    "status" carries only the fields that changed per torrent since the last
+    broadcast, "added"/"removed" carry library changes, "stats" and "trackers"
+    carry the session snapshot and tracker summaries, "limits" the effective
+    bandwidth limits.
+    """
+
+    def __init__(self, session, socket_path=None):
+        self.session = session
+        self.socket_path = Path(socket_path or default_socket_path())
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._mirror = {} # info-hash -> last broadcast status dict
+        self._server = None
+
+        session.subscribe_status(self._on_status)
+        session.subscribe_added(self._on_added)
+        session.subscribe_removed(self._on_removed)
+        session.subscribe_stats(self._on_stats)
+        session.subscribe_trackers(self._on_trackers)
+        session.subscribe_limits(self._on_limits)
+
+    def start(self):
+        if self.socket_path.exists():
+            # A stale socket from a crashed daemon; refuse to steal a live one
+            if socket_in_use(self.socket_path):
+                raise RpcError(f"Another daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # Owner-only from the moment bind() creates it; a chmod afterwards leaves a window
+        umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(str(self.socket_path), _Connection)
+        finally:
+            os.umask(umask)
+        self._server.rpc = self
+        threading.Thread(target=self._server.serve_forever, name="cascadert-rpc", daemon=True).start()
+        print(f"DEBUG: RPC listening on {self.socket_path}")
+
+    def shutdown(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self.socket_path.unlink(missing_ok=True)
+
+    def dispatch(self, conn, request):
+        request_id = request.get("id")
+        method = request.get("method")
+        params = request.get("params") or {}
+        try:
+            if method == "subscribe":
+                self._subscribe(conn)
+                result = True
+            elif method in RPC_METHODS:
+                result = getattr(self.session, method)(**params)
+                if method == "get_statuses":
+                    result = {key: status_to_dict(status) for key, status in result.items()}
+                elif method == "get_limits":
+                    result = result._asdict()
+            else:
+                raise RpcError(f"Unknown method {method!r}")
+        except Exception as e:
+            conn.send({"id": request_id, "error": f"{type(e).__name__}: {e}", "error_type": type(e).__name__,
+                       "error_args": [arg for arg in e.args if isinstance(arg, (str, int, float))]})
+            return
+        conn.send({"id": request_id, "result": result})
+
+    def _subscribe(self, conn):
+        torrents = self.session.list_torrents()
+        with self._lock:
+            # Same lock as the broadcasts, so the client's view starts exactly
+            # where the next diff picks up.
+            conn.send({"event": "added", "data": torrents})
+            if self._mirror:
+                conn.send({"event": "status", "data": dict(self._mirror)})
+            conn.send({"event": "limits", "data": self.session.get_limits()._asdict()})
+            self._subscribers.add(conn)
+
+    def unsubscribe(self, conn):
+        with self._lock:
+            self._subscribers.discard(conn)
+
+    def _broadcast_locked(self, event, data):
+        message = {"event": event, "data": data}
+        for conn in list(self._subscribers):
+            conn.send(message)
+
+    def _on_status(self, statuses):
+        with self._lock:
+            diffs = {}
+            for key, status in statuses.items():
+                new = status_to_dict(status)
+                old = self._mirror.get(key)
+                if old is None:
+                    diffs[key] = new
+                else:
+                    changed = {field: value for field, value in new.items() if old[field] != value}
+                    if changed:
+                        diffs[key] = changed
+                self._mirror[key] = new
+            if diffs:
+                self._broadcast_locked("status", diffs)
+
+    def _on_added(self, added):
+        with self._lock:
+            self._broadcast_locked("added", added)
+
+    def _on_removed(self, keys):
+        with self._lock:
+            for key in keys:
+                self._mirror.pop(key, None)
+            self._broadcast_locked("removed", keys)
+
+    def _on_stats(self, snapshot):
+        with self._lock:
+            self._broadcast_locked("stats", snapshot._asdict())
+
+    def _on_trackers(self, summaries):
+        with self._lock:
+            self._broadcast_locked("trackers", {key: summary._asdict() for key, summary in summaries.items()})
+
+    def _on_limits(self, limits):
+        with self._lock:
+            self._broadcast_locked("limits", limits._asdict())
+
+
+class RemoteSession:
+    """Client for a CascadeRT daemon with the interface MainWindow expects of TorrentSession.
+
+    Subscription callbacks run on the connection's reader thread, just as
+    TorrentSession runs them on its pump thread.
+    """
+
+    def __init__(self, socket_path=None, timeout=30.0):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.timeout = timeout
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(str(self.socket_path))
+        self._rfile = self._sock.makefile("rb")
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._calls_lock = threading.Lock()
+        self._calls = {} # request id -> [Event, result, (error, error type, error args) or None]
+        self._statuses = {} # info-hash -> full status dict, patched by diffs
+
+        self._status_callbacks = []
+        self._added_callbacks = []
+        self._removed_callbacks = []
+        self._stats_callbacks = []
+        self._tracker_callbacks = []
+        self._limits_callbacks = []
+
+        threading.Thread(target=self._read_loop, name="cascadert-rpc-client", daemon=True).start()
+
+    def call(self, method, **params):
+        request_id = next(self._ids)
+        slot = [threading.Event(), None, None]
+        with self._calls_lock:
+            self._calls[request_id] = slot
+
+        line = json.dumps({"id": request_id, "method": method, "params": params}) + "\n"
+        with self._send_lock:
+            self._sock.sendall(line.encode())
+
+        if not slot[0].wait(self.timeout):
+            with self._calls_lock:
+                self._calls.pop(request_id, None)
+            raise RpcError(f"{method} timed out")
+        if slot[2] is not None:
+            error, error_type, error_args = slot[2]
+            if error_type in REMOTE_ERRORS:
+                raise REMOTE_ERRORS[error_type](*error_args)
+            raise RpcError(error)
+        return slot[1]
+
+    # --- TorrentSession interface ---
+
+    def add_torrent(self, source, save_path):
+        return self.call("add_torrent", source=source, save_path=str(save_path))
+
+    def add_source(self, source, save_path):
+        return self.call("add_source", source=source, save_path=str(save_path))
+
+    def remove_torrent(self, key, delete_files=False):
+        self.call("remove_torrent", key=key, delete_files=delete_files)
+
+    def pause_torrent(self, key):
+        self.call("pause_torrent", key=key)
+
+    def resume_torrent(self, key):
+        self.call("resume_torrent", key=key)
+
+    def demote_torrent(self, key):
+        self.call("demote_torrent", key=key)
+
+    def get_statuses(self, keys=None):
+        result = self.call("get_statuses", keys=keys)
+        return {key: SimpleNamespace(**fields) for key, fields in result.items()}
+
+    def get_peer_info(self, key):
+        return self.call("get_peer_info", key=key)
+
+    def get_files(self, key):
+        return self.call("get_files", key=key)
+
+    def get_file_progress(self, key, indices):
+        return self.call("get_file_progress", key=key, indices=list(indices))
+
+    def set_file_priorities(self, key, priorities):
+        # JSON object keys are strings; the session converts them back
+        self.call("set_file_priorities", key=key, priorities={str(i): p for i, p in priorities.items()})
+
+    def list_torrents(self):
+        return [tuple(entry) for entry in self.call("list_torrents")]
+
+    def import_sources(self, sources, save_path):
+        self.call("import_sources", sources=list(sources), save_path=str(save_path))
+
+    def start_watch_folder(self):
+        # run_daemon starts the daemon's watch folder; a second watcher here would import everything twice
+        pass
+
+    def start_metrics_server(self, port=None):
+        # The daemon serves the engine's metrics; see its --metrics-port
+        pass
+
+    def set_tick_interval(self, seconds):
+        # The daemon's pump serves every client; a window only slows its own refresh
+        pass
+
+    def list_profiles(self):
+        active, names = self.call("list_profiles")
+        return active, names
+
+    def apply_profile(self, name, overrides=None):
+        self.call("apply_profile", name=name, overrides=overrides)
+
+    def get_limits(self):
+        return BandwidthLimits(**self.call("get_limits"))
+
+    def set_global_limits(self, download_limit, upload_limit):
+        self.call("set_global_limits", download_limit=download_limit, upload_limit=upload_limit)
+
+    def set_bandwidth_schedule(self, rules):
+        self.call("set_bandwidth_schedule", rules=rules)
+
+    def set_lan_bypass(self, enabled):
+        self.call("set_lan_bypass", enabled=enabled)
+
+    def set_rate_shares(self, download_share, upload_share):
+        self.call("set_rate_shares", download_share=download_share, upload_share=upload_share)
+
+    def get_torrent_limits(self, key):
+        return tuple(self.call("get_torrent_limits", key=key))
+
+    def set_torrent_limits(self, key, download_limit, upload_limit):
+        self.call("set_torrent_limits", key=key, download_limit=download_limit, upload_limit=upload_limit)
+
+    def move_queue(self, key, direction):
+        self.call("move_queue", key=key, direction=direction)
+
+    def get_queue_limits(self):
+        return self.call("get_queue_limits")
+
+    def set_queue_limits(self, **limits):
+        self.call("set_queue_limits", **limits)
+
+    def subscribe_status(self, callback):
+        self._status_callbacks.append(callback)
+
+    def subscribe_added(self, callback):
+        self._added_callbacks.append(callback)
+
+    def subscribe_removed(self, callback):
+        self._removed_callbacks.append(callback)
+
+    def subscribe_stats(self, callback):
+        self._stats_callbacks.append(callback)
+
+    def subscribe_trackers(self, callback):
+        self._tracker_callbacks.append(callback)
+
+    def subscribe_limits(self, callback):
+        self._limits_callbacks.append(callback)
+
+    def start_status_pump(self):
+        """Starts the event stream; the daemon sends the current library first."""
+        self.call("subscribe")
+
+    def load_state(self):
+        # The daemon owns the library and has loaded it already
+        pass
+
+    def stop(self):
+        """Detaches from the daemon; the engine keeps running."""
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+    # --- connection ---
+
+    def _read_loop(self):
+        try:
+            for line in self._rfile:
+                message = json.loads(line)
+                if "event" in message:
+                    self._dispatch_event(message["event"], message["data"])
+                    continue
+                with self._calls_lock:
+                    slot = self._calls.pop(message.get("id"), None)
+                if slot is not None:
+                    slot[1] = message.get("result")
+                    if "error" in message:
+                        slot[2] = (message["error"], message.get("error_type"), message.get("error_args", []))
+                    slot[0].set()
+        except (OSError, ValueError) as e:
+            print(f"DEBUG: RPC connection error: {e}")
+
+        print("DEBUG: Disconnected from daemon.")
+        with self._calls_lock:
+            calls, self._calls = self._calls, {}
+        for slot in calls.values():
+            slot[2] = ("connection closed", None, [])
+            slot[0].set()
+
+    def _dispatch_event(self, event, data):
+        if event == "status":
+            batch = {}
+            for key, fields in data.items():
+                status = self._statuses.setdefault(key, {})
+                status.update(fields)
+                batch[key] = SimpleNamespace(**status)
+            for callback in self._status_callbacks:
+                callback(batch)
+        elif event == "added":
+            added = [tuple(entry) for entry in data]
+            for callback in self._added_callbacks:
+                callback(added)
+        elif event == "removed":
+            for key in data:
+                self._statuses.pop(key, None)
+            for callback in self._removed_callbacks:
+                callback(data)
+        elif event == "stats":
+            snapshot = SessionSnapshot(**data)
+            for callback in self._stats_callbacks:
+                callback(snapshot)
+        elif event == "trackers":
+            summaries = {key: TrackerSummary(**fields) for key, fields in data.items()}
+            for callback in self._tracker_callbacks:
+                callback(summaries)
+        elif event == "limits":
+            limits = BandwidthLimits(**data)
+            for callback in self._limits_callbacks:
+                callback(limits)
@@ -12,139 +12,924 @@
 import libtorrent as lt
 import time
 import threading
-from gi.repository import GLib
 from pathlib import Path
 import os
 import pickle
 
+from CascadeRT.core.bandwidth import BandwidthScheduler, peer_class_filter
+from CascadeRT.core.cold import DEFAULT_DEMOTE_AFTER, ColdRecord, is_cold_candidate
+from CascadeRT.core.infohash import params_key, torrent_aliases, torrent_key
+from CascadeRT.core.ingest import Importer
+from CascadeRT.core.metadata_cache import DEFAULT_MAX_BYTES, MetadataCache
+from CascadeRT.core.metrics import METRICS, MetricsServer
+from CascadeRT.core.peers import peer_to_dict
+from CascadeRT.core.registry import DuplicateTorrentError, TorrentRegistry
+from CascadeRT.core.resume import ResumeStore, rebalance_resume_files
+from CascadeRT.core.rpc import shard_socket_path, socket_in_use
+from CascadeRT.core.settings import QUEUE_SETTINGS, SettingsManager
+from CascadeRT.core.stats import SessionStats
+from CascadeRT.core.trackers import TrackerCache
+
+# Settings CascadeRT itself relies on; applied on top of every profile
+REQUIRED_SETTINGS = {
+    # Status alerts cover torrent removal; storage alerts cover resume-data failures
+    "alert_mask": lt.alert.category_t.error_notification
+                  | lt.alert.category_t.status_notification
+                  | lt.alert.category_t.storage_notification
+                  | lt.alert.category_t.tracker_notification,
+    # Bulk async adds post one add_torrent_alert each; don't drop any
+    "alert_queue_size": 10000,
+}
+
 class TorrentSession:
-    def __init__(self):
-        self.session = lt.session()
-        self.session.listen_on(6881, 6891)
-        self.session.start_dht()
-        self._running = True 
-        
+    def __init__(self, data_dir=None, listen_port=None, rate_share=1):
+        """data_dir, listen_port and rate_share are set by ShardedSession for its worker processes.
+
+        A shard keeps resume files and cached metadata in its own data_dir,
+        listens on its own port and starts out applying 1/rate_share of the
+        global limits, so the shards together stay within them; the
+        coordinator then moves the shares to where the traffic is (see
+        set_rate_shares). Settings are shared.
+        """
         # Define storage path for session data
         self.config_dir = Path.home() / ".config" / "CascadeRT"
         self.config_dir.mkdir(parents=True, exist_ok=True)
-        self.resume_file = self.config_dir / "resume.dat"
+        if data_dir is None:
+            # Unsharded: take back any resume files a sharded run left behind,
+            # but never from under shards that are still running
+            for shard_dir in (self.config_dir / "shards").glob("*"):
+                if shard_dir.name.isdigit() and socket_in_use(shard_socket_path(int(shard_dir.name))):
+                    raise RuntimeError(f"Shard {shard_dir.name} of a sharded CascadeRT is still running; "
+                                       "stop it or start with the same --shards")
+            self.data_dir = self.config_dir
+            rebalance_resume_files(self.config_dir, 1)
+        else:
+            self.data_dir = Path(data_dir)
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.listen_port = listen_port
+        # Fractions of the global (download, upload) limits this session applies
+        share = 1.0 / max(1, int(rate_share))
+        self.rate_shares = (share, share)
+        self._applied_shares = self.rate_shares
+
+        # 💡 Performance profile from ~/.config/CascadeRT (listen interfaces, buffers, threads...)
+        self.settings = SettingsManager(self.config_dir)
+
+        # 💡 Global rate limits and their time-of-day schedule; LAN peers bypass them
+        self.bandwidth = BandwidthScheduler(self.settings)
+        self.limits = self.bandwidth.active()
+        self.bandwidth_interval = 30.0
+        self._bandwidth_due = False
+        self._limits_callbacks = []
+
+        self.session = lt.session(self._settings_pack(self.settings.build_pack()))
+        self.session.set_peer_class_filter(peer_class_filter(self.limits.lan_bypass))
+        print(f"DEBUG: Using settings profile {self.settings.profile!r}")
+        self._running = True 
+        
+        # Legacy single-file snapshot, migrated to per-torrent files on first load
+        self.resume_file = self.data_dir / "resume.dat"
+        self.resume_store = ResumeStore(self.data_dir / "resume")
         
-        # List to keep track of all active torrent handles (CRITICAL FOR SAVE/LOAD)
-        self.handles = [] 
+        # 💡 Every torrent in (or being added to) the session, keyed by info-hash
+        self.registry = TorrentRegistry()
 
-    def get_dht_node_count(self):
-        """Returns the actual number of connected DHT nodes in the session."""
-        status = self.session.status()
+        # 💡 Single session-wide status pump (replaces one polling thread per torrent)
+        self.tick_interval = 1.0
+        self._tick_due = False
+        self._status_callbacks = []
+        self._added_callbacks = []
+        self._stats_callbacks = []
+        self._tracker_callbacks = []
+        self._removed_callbacks = []
+        self._pump_thread = None
+        self._pump_running = False
+
+        # 💡 Session-wide counters, fetched once per tick instead of once per torrent
+        self.stats = SessionStats()
+
+        # 💡 Tracker health from tracker alerts; replaces per-tick handle.trackers() copies
+        self.trackers = TrackerCache()
+
+        # 💡 Hot-path timings for the localhost metrics endpoint (see start_metrics_server)
+        self.metrics = METRICS
+        self._metrics_server = None
+        self._torrent_states = {} # info-hash -> state label, kept current by state updates
+        self._pump_lag = METRICS.timing("cascadert_pump_lag_seconds", "How late each status tick fired")
+        self._pump_dispatch = METRICS.timing("cascadert_pump_dispatch_seconds",
+                                             "Time spent dispatching one batch of alerts on the pump thread")
+        self._alerts_per_pop = METRICS.gauge("cascadert_alerts_per_pop",
+                                             "Alerts returned by the last pop_alerts()")
+        self._alerts_total = METRICS.counter("cascadert_alerts_total", "Alerts popped from libtorrent")
+        self._resume_write = METRICS.timing("cascadert_resume_write_seconds", "Writing one resume file")
+        self._save_state_timing = METRICS.timing("cascadert_save_state_seconds",
+                                                 "Full resume save on shutdown")
+        self._load_state_timing = METRICS.timing("cascadert_load_state_seconds",
+                                                 "Reading and queueing every resume file at startup")
+        METRICS.add_collector(self._collect_metrics)
+
+        # 💡 Incremental checkpoints: only torrents libtorrent flags as modified get saved
+        self.checkpoint_interval = 60.0
+        self._dirty_lock = threading.Lock()
+        self._dirty = {} # info-hash -> handle with need_save_resume set
+
+        # Resume requests whose save_resume_data(_failed)_alert has not arrived yet
+        self._outstanding_saves = 0
+        self._save_report = None
+        # Upper bound for shutdown if libtorrent never answers (normally returns much sooner)
+        self.shutdown_timeout = 30.0
+
+        # 💡 Asynchronous adds: the loader thread throttles on the number of
+        # async_add_torrent calls that have not produced an add_torrent_alert yet
+        self.load_batch_size = 500
+        self._adds_cond = threading.Condition()
+        self._pending_adds = 0
+        self._fresh_keys = set() # user adds without a checkpoint on disk yet
+        self._added_batch = []
+        self._removed_batch = []
+        self._load_thread = None
+
+        # 💡 Metadata of magnets seen before, so re-adding one skips the swarm round trip
+        self.metadata_cache = MetadataCache(self.data_dir / "metadata",
+                                            self.settings.get("metadata_cache_bytes", DEFAULT_MAX_BYTES))
+
+        # 💡 Cold tier: user-paused torrents stay out of libtorrent as ColdRecords
+        # until resumed; paused ones are demoted again after cold_demote_after seconds
+        self.cold_storage = self.settings.get("cold_storage", True)
+        self.cold_demote_after = self.settings.get("cold_demote_after", DEFAULT_DEMOTE_AFTER)
+        self.cold_check_interval = 60.0
+        self._cold_lock = threading.Lock()
+        self._cold_added = [] # info-hashes of cold records not announced yet
+        self._cold_removed = []
+        self._cold_changed = {} # pump thread only: info-hash -> ColdRecord of fresh demotions
+        self._paused_since = {} # info-hash -> monotonic time the torrent was seen user-paused
+        self._demoting = set()
+        self._delete_after_add = set()
+        # Under _cold_lock: demoted torrents whose torrent_removed_alert hasn't come
+        # back yet -> the paused flag of a resume waiting for it (None: no resume)
+        self._removal_pending = {}
+        # Under _cold_lock: cold torrents being re-added -> their ColdRecord, kept
+        # until the add_torrent_alert in case the add fails
+        self._materialising = {}
+
+        # 💡 Bulk import and watch-folder ingestion (parsing happens in a worker pool)
+        self.importer = Importer(self)
+
+        # Alert type -> handler, dispatched from the pump thread
+        self._alert_handlers = {
+            lt.state_update_alert: self._on_state_update,
+            lt.add_torrent_alert: self._on_add_torrent,
+            lt.session_stats_alert: self._on_session_stats,
+            lt.tracker_announce_alert: self._on_tracker_announce,
+            lt.tracker_reply_alert: self._on_tracker_reply,
+            lt.tracker_error_alert: self._on_tracker_error,
+            lt.save_resume_data_alert: self._on_save_resume_data,
+            lt.save_resume_data_failed_alert: self._on_save_resume_data_failed,
+            lt.torrent_removed_alert: self._on_torrent_removed,
+            lt.metadata_received_alert: self._on_metadata_received,
+        }
+
+    def _settings_pack(self, pack):
+        pack = dict(pack)
+        pack.update(REQUIRED_SETTINGS)
+        pack["download_rate_limit"] = self._rate_share(self.limits.download_limit, self.rate_shares[0])
+        pack["upload_rate_limit"] = self._rate_share(self.limits.upload_limit, self.rate_shares[1])
+        if self.listen_port is not None:
+            pack["listen_interfaces"] = f"0.0.0.0:{self.listen_port},[::]:{self.listen_port}"
+        return pack
+
+    def _rate_share(self, limit, share):
+        # This session's part of a global limit; never rounds a real limit down to 0 (= unlimited)
+        if not limit:
+            return limit
+        return max(1, int(limit * share))
+
+    def list_profiles(self):
+        """Returns (active profile name, [available profile names])."""
+        return self.settings.profile, self.settings.profile_names()
+
+    def apply_profile(self, name, overrides=None):
+        """Switches performance profile at runtime via apply_settings and persists the choice."""
+        pack = self.settings.select(name, overrides)
+        self.session.apply_settings(self._settings_pack(pack))
+        print(f"DEBUG: Applied settings profile {name!r}")
+
+    def get_limits(self):
+        """Returns the BandwidthLimits currently applied to the session."""
+        return self.limits
+
+    def set_global_limits(self, download_limit, upload_limit):
+        """Sets the unscheduled session-wide limits in bytes/s (0 = unlimited)."""
+        self.bandwidth.set_global(download_limit, upload_limit)
+        self._bandwidth_due = True
+
+    def set_bandwidth_schedule(self, rules):
+        """Replaces the limit schedule (see BandwidthScheduler for the rule format)."""
+        self.bandwidth.set_schedule(rules)
+        self._bandwidth_due = True
+
+    def set_lan_bypass(self, enabled):
+        self.bandwidth.set_lan_bypass(enabled)
+        self._bandwidth_due = True
+
+    def set_rate_shares(self, download_share, upload_share):
+        """Sets the fractions (0-1) of the global download and upload limits this session applies."""
+        self.rate_shares = (float(download_share), float(upload_share))
+        self._bandwidth_due = True
+
+    def subscribe_limits(self, callback):
+        """Registers callback(BandwidthLimits) run on the pump thread whenever the effective limits change."""
+        self._limits_callbacks.append(callback)
+
+    def _apply_bandwidth(self):
+        # Runs on the pump thread: settings and schedule edits only flag
+        # _bandwidth_due, so limits are always applied from one place.
+        self._bandwidth_due = False
+        limits = self.bandwidth.active()
+        shares = self.rate_shares
+        if limits == self.limits and shares == self._applied_shares:
+            return
+
+        previous, self.limits = self.limits, limits
+        self._applied_shares = shares
+        self.session.apply_settings({
+            "download_rate_limit": self._rate_share(limits.download_limit, shares[0]),
+            "upload_rate_limit": self._rate_share(limits.upload_limit, shares[1]),
+        })
+        if limits == previous:
+            # Only this shard's part moved; the effective global limits are unchanged
+            return
+        if limits.lan_bypass != previous.lan_bypass:
+            self.session.set_peer_class_filter(peer_class_filter(limits.lan_bypass))
+        print(f"DEBUG: Bandwidth limits now D:{limits.download_limit} U:{limits.upload_limit} "
+              f"(rule: {limits.rule or 'none'})")
+
+        for callback in self._limits_callbacks:
+            callback(limits)
+
+    def get_torrent_limits(self, key):
+        """Returns (download_limit, upload_limit) for one torrent in bytes/s (0 = unlimited)."""
+        handle = self._handle_for(key)
+        return max(0, handle.download_limit()), max(0, handle.upload_limit())
+
+    def set_torrent_limits(self, key, download_limit, upload_limit):
+        """Applies per-torrent limits; they are stored in the torrent's resume data."""
+        handle = self._handle_for(key)
+        handle.set_download_limit(int(download_limit) or -1)
+        handle.set_upload_limit(int(upload_limit) or -1)
+        # Limits are part of the resume data; checkpoint them with the next save
+        self._mark_dirty(key, handle)
+
+    def start_metrics_server(self, port=None):
+        """Serves METRICS on localhost if a port is given or metrics_port is set in settings.json."""
+        port = port or self.settings.get("metrics_port")
+        if not port or self._metrics_server is not None:
+            return
+        self._metrics_server = MetricsServer(METRICS, int(port))
         try:
-            return status.dht.dht_nodes
-        except AttributeError:
-            try:
-                return status.dht_nodes
-            except AttributeError:
-                return 0
+            self._metrics_server.start()
+        except OSError as e:
+            print(f"DEBUG: Could not start metrics endpoint on port {port}: {e}")
+            self._metrics_server = None
+
+    def _collect_metrics(self):
+        # Runs at scrape time on the metrics server thread; reads only cached data
+        for name, is_gauge, value in self.stats.all_values():
+            yield ("libtorrent_" + name.replace(".", "_"), "gauge" if is_gauge else "counter",
+                   f"libtorrent session counter {name}", [({}, value)])
+
+        counts = {}
+        for state in list(self._torrent_states.values()):
+            counts[state] = counts.get(state, 0) + 1
+        yield ("cascadert_torrents", "gauge", "Torrents per state",
+               [({"state": state}, count) for state, count in sorted(counts.items())])
+        yield ("cascadert_registry_size", "gauge", "Torrents in the session or being added", [({}, len(self.registry))])
+        yield ("cascadert_pending_adds", "gauge", "async_add_torrent calls without an add_torrent_alert yet",
+               [({}, self._pending_adds)])
+        yield ("cascadert_outstanding_resume_saves", "gauge", "save_resume_data requests not answered yet",
+               [({}, self._outstanding_saves)])
+        yield ("cascadert_dirty_torrents", "gauge", "Torrents waiting for the next checkpoint", [({}, len(self._dirty))])
+
+    def _state_label(self, status):
+        if status.paused:
+            return "queued" if status.auto_managed else "paused"
+        return getattr(status.state, "name", str(status.state))
+
+    def get_dht_node_count(self):
+        """Returns the number of DHT nodes from the latest cached session snapshot."""
+        return self.stats.snapshot.dht_nodes
+
+    def subscribe_stats(self, callback):
+        """Registers callback(snapshot) receiving each new SessionSnapshot on the pump thread."""
+        self._stats_callbacks.append(callback)
+
+    def _on_session_stats(self, alert):
+        snapshot = self.stats.on_alert(alert)
+        for callback in self._stats_callbacks:
+            callback(snapshot)
+
+    def subscribe_trackers(self, callback):
+        """Registers callback({info-hash: TrackerSummary}) for torrents whose trackers changed."""
+        self._tracker_callbacks.append(callback)
+
+    def _on_tracker_announce(self, alert):
+        self.trackers.on_announce(torrent_key(alert.handle), alert)
+
+    def _on_tracker_reply(self, alert):
+        self.trackers.on_reply(torrent_key(alert.handle), alert)
+
+    def _on_tracker_error(self, alert):
+        self.trackers.on_error(torrent_key(alert.handle), alert)
 
     def add_torrent(self, source, save_path):
-        params = {
-            "save_path": str(save_path),
-            "storage_mode": lt.storage_mode_t.storage_mode_sparse
-        }
-        params["flags"] = lt.torrent_flags.auto_managed
-        params["flags"] &= ~lt.torrent_flags.auto_managed
+        """Queues a magnet link or .torrent file for adding and returns its info-hash.
+
+        The torrent is added with async_add_torrent; subscribers registered with
+        subscribe_added() hear about it once libtorrent posts its add_torrent_alert.
+        Returns None if the source can't be parsed or the torrent is already here.
+        """
+        try:
+            return self.add_source(source, save_path)
+        except RuntimeError as e:
+            print(f"Failed to parse torrent file: {e}")
+        except DuplicateTorrentError as e:
+            print(f"DEBUG: Torrent {e.args[0]} is already in the session.")
+        return None
+
+    def add_source(self, source, save_path):
+        """Like add_torrent, but raises instead of returning None.
+
+        Raises FileNotFoundError or RuntimeError for a source that can't be
+        parsed and DuplicateTorrentError for a torrent already in the session.
+        """
+        key, params = self.parse_source(source, save_path)
+        self.add_params(key, params)
+        return key
+
+    def parse_source(self, source, save_path):
+        """Turns a magnet link or .torrent path into (info-hash, add_torrent_params).
 
+        Safe to call from worker threads; raises FileNotFoundError or RuntimeError.
+        """
         if source.startswith("magnet:"):
-            handle = lt.add_magnet_uri(self.session, source, params)
-            handle.set_flags(lt.torrent_flags.paused, lt.torrent_flags.paused)
+            params = lt.parse_magnet_uri(source)
+            key = params_key(params)
+            cached = self.metadata_cache.get(key)
+            if cached is not None:
+                try:
+                    info = lt.torrent_info(lt.bdecode(cached))
+                except Exception as e:
+                    # Truncated or corrupt entry: drop it and fetch the metadata from the swarm again
+                    print(f"DEBUG: Discarding cached metadata for {key}: {e}")
+                    self.metadata_cache.discard(key)
+                    cached = None
+            if cached is not None:
+                # Seen before: hand libtorrent the metadata and queue it like a .torrent file
+                params.ti = info
+                params.flags = lt.torrent_flags.auto_managed
+            else:
+                # Magnets still wait for the user; resume_torrent hands them to the queue
+                params.flags = lt.torrent_flags.paused
         else:
             file_path = Path(source)
             if not file_path.exists():
                 raise FileNotFoundError(f"{source} does not exist")
+            info = lt.torrent_info(str(file_path))
+
+            params = lt.add_torrent_params()
+            params.ti = info
+            params.name = info.name()
+            # Queued: libtorrent starts it once an active download slot is free
+            params.flags = lt.torrent_flags.auto_managed
+
+        params.save_path = str(save_path)
+        params.storage_mode = lt.storage_mode_t.storage_mode_sparse
+
+        return params_key(params), params
+
+    def add_params(self, key, params, throttle=False):
+        """Adds parsed params asynchronously; throttle=True blocks while a full batch is in flight.
+
+        Raises DuplicateTorrentError if any of the torrent's info-hashes is already
+        in the session or on its way in.
+        """
+        self.registry.add(key, torrent_aliases(params.ti if params.ti is not None else params))
+        # Write a first checkpoint once it is added so a crash can't lose it
+        with self._dirty_lock:
+            self._fresh_keys.add(key)
+        if throttle:
+            self._wait_for_add_slot()
+        self._async_add(params)
+
+    def has_torrent(self, key):
+        return key in self.registry
+
+    def import_sources(self, sources, save_path):
+        """Bulk-imports .torrent files, folders, magnet links and magnet lists in the background."""
+        self.importer.submit(sources, save_path)
+
+    def start_watch_folder(self):
+        """Starts the watch folder configured in settings.json, if any (needs a GLib main loop)."""
+        folder = self.settings.get("watch_folder")
+        if folder:
+            save_path = self.settings.get("watch_save_path") or str(Path.home() / "Downloads")
+            self.importer.watch(Path(folder).expanduser(), save_path)
+
+    def _wait_for_add_slot(self):
+        # Don't run ahead of libtorrent: keep at most one batch of adds in flight
+        with self._adds_cond:
+            while self._pending_adds >= self.load_batch_size and self._running:
+                self._adds_cond.wait(1.0)
+
+    def _async_add(self, params):
+        with self._adds_cond:
+            self._pending_adds += 1
+        self.session.async_add_torrent(params)
+
+    def subscribe_added(self, callback):
+        """Registers callback(added) receiving [(info-hash, name, paused), ...] per alert batch.
+
+        Callbacks run on the pump thread, like subscribe_status() callbacks.
+        """
+        self._added_callbacks.append(callback)
+
+    def _on_add_torrent(self, alert):
+        with self._adds_cond:
+            self._pending_adds = max(0, self._pending_adds - 1)
+            self._adds_cond.notify_all()
+
+        if alert.error.value():
+            print(f"DEBUG: FAILURE! Could not add torrent: {alert.message()}")
+            key = params_key(alert.params)
+            with self._cold_lock:
+                record = self._materialising.pop(key, None)
+            entry = self.registry.get(key)
+            if entry is not None and entry.handle is None:
+                if record is not None:
+                    # A cold torrent that couldn't come back stays cold, resume file and row included
+                    self._delete_after_add.discard(entry.key)
+                    entry.cold = record
+                    self._cold_changed[entry.key] = record
+                else:
+                    # Only drop the reservation made by add_params, never a live torrent
+                    self.registry.remove(entry.key)
+            return
+
+        handle = alert.handle
+        if not handle.is_valid():
+            return
+
+        key = torrent_key(handle)
+        with self._cold_lock:
+            self._materialising.pop(key, None)
+        entry = self.registry.get(key)
+        if entry is None:
+            entry = self.registry.add(key, torrent_aliases(handle))
+        entry.handle = handle
+        key = entry.key
+
+        if key in self._delete_after_add:
+            # A cold torrent removed with its data: libtorrent needed the file layout to delete it
+            self._delete_after_add.discard(key)
+            self.session.remove_torrent(handle, lt.options_t.delete_files)
+            return
+
+        # The only announce-list copy we make; alerts keep it current from here on
+        try:
+            urls = [t["url"] if isinstance(t, dict) else t.url for t in handle.trackers()]
+        except Exception:
+            urls = []
+        self.trackers.seed(key, urls)
+
+        with self._dirty_lock:
+            fresh = key in self._fresh_keys
+            self._fresh_keys.discard(key)
+        if fresh:
+            self._mark_dirty(key, handle)
+
+        params = alert.params
+        name = params.ti.name() if params.ti else params.name
+        paused = bool(params.flags & lt.torrent_flags.paused)
+        self._added_batch.append((key, name, paused))
+
+    def _on_metadata_received(self, alert):
+        handle = alert.handle
+        info = handle.torrent_file()
+        if info is None:
+            return
+        try:
+            data = lt.bencode(lt.create_torrent(info).generate())
+        except Exception as e:
+            print(f"DEBUG: Could not serialise metadata for {torrent_key(handle)}: {e}")
+            return
+        # Under every hash, so a v1 magnet finds a hybrid torrent filed under its v2 hash
+        for alias in torrent_aliases(handle):
+            self.metadata_cache.put(alias, data)
+        # The checkpoint now carries the info dict too
+        self._mark_dirty(torrent_key(handle), handle)
+
+    def _handle_for(self, key):
+        entry = self.registry.get(key)
+        if entry is not None and entry.cold is not None:
+            raise KeyError(f"Torrent {key} is in cold storage; resume it first")
+        if entry is None or entry.handle is None:
+            raise KeyError(f"Unknown torrent {key}")
+        return entry.handle
+
+    def _cold_entry(self, key):
+        entry = self.registry.get(key)
+        return entry if entry is not None and entry.cold is not None else None
+
+    def pause_torrent(self, key):
+        if self._cold_entry(key) is not None:
+            return
+        # A paused auto-managed torrent would be restarted by the queue; take it out first
+        handle = self._handle_for(key)
+        handle.unset_flags(lt.torrent_flags.auto_managed)
+        handle.pause()
+
+    def resume_torrent(self, key):
+        """Hands the torrent back to the queue; it runs as soon as it gets an active slot."""
+        entry = self._cold_entry(key)
+        if entry is not None:
+            self._materialise(entry, paused=False)
+            return
+        # Cancels a demotion whose final save is still in flight
+        self._demoting.discard(key)
+        handle = self._handle_for(key)
+        handle.set_flags(lt.torrent_flags.auto_managed)
+        handle.resume()
+
+    def _materialise(self, entry, paused):
+        # Brings a cold torrent back into libtorrent from its resume file; the
+        # add_torrent_alert fills in entry.handle like for any other add.
+        # Returns False if the resume file can't be read; the torrent stays cold.
+        with self._cold_lock:
+            if entry.key in self._removal_pending:
+                # Still leaving libtorrent after a demotion; _on_torrent_removed re-adds it
+                self._removal_pending[entry.key] = paused
+                return True
+        try:
+            params = lt.read_resume_data(self.resume_store.read(entry.key))
+        except Exception as e:
+            print(f"DEBUG: Could not read resume data for cold torrent {entry.key}: {e}")
+            return False
+        if paused:
+            params.flags |= lt.torrent_flags.paused
+        else:
+            if params.flags & lt.torrent_flags.paused:
+                params.flags ^= lt.torrent_flags.paused
+            params.flags |= lt.torrent_flags.auto_managed
+        with self._cold_lock:
+            self._materialising[entry.key] = entry.cold
+        entry.cold = None
+        self._async_add(params)
+        return True
+
+    def demote_torrent(self, key):
+        """Pauses a torrent and moves it out of libtorrent into a cold record.
+
+        The record (name, size, progress, save path) is built from a final
+        resume save; the torrent then leaves the session but keeps its resume
+        file and its place in the registry, and resume_torrent() brings it back.
+        """
+        if self._cold_entry(key) is not None:
+            return
+        handle = self._handle_for(key)
+        self.pause_torrent(key)
+        self._demoting.add(torrent_key(handle))
+        with self._dirty_lock:
+            self._outstanding_saves += 1
+        handle.save_resume_data(lt.torrent_handle.save_info_dict)
+
+    def _finish_demote(self, key, alert):
+        if key not in self._demoting:
+            return
+        self._demoting.discard(key)
+        entry = self.registry.get(key)
+        if entry is None or entry.handle is None:
+            return
+        # Resumed (or handed to the queue) while the save was in flight: keep it live
+        status = entry.handle.status()
+        if not status.paused or status.auto_managed:
+            return
+        with self._cold_lock:
+            self._removal_pending[key] = None
+        entry.cold = ColdRecord.from_params(alert.params)
+        entry.handle = None
+        self.session.remove_torrent(alert.handle)
+
+    def _demote_idle(self, now):
+        for key, since in list(self._paused_since.items()):
+            if now - since < self.cold_demote_after or key in self._demoting:
+                continue
             try:
-                info = lt.torrent_info(str(file_path))
-            except RuntimeError as e:
-                print(f"Failed to parse torrent file: {e}")
-                return None
+                self.demote_torrent(key)
+            except KeyError:
+                self._paused_since.pop(key, None)
+
+    def move_queue(self, key, direction):
+        """Moves a torrent in the download queue; direction is "up", "down", "top" or "bottom"."""
+        handle = self._handle_for(key)
+        moves = {
+            "up": handle.queue_position_up,
+            "down": handle.queue_position_down,
+            "top": handle.queue_position_top,
+            "bottom": handle.queue_position_bottom,
+        }
+        if direction not in moves:
+            raise ValueError(f"Unknown queue direction {direction!r}")
+        moves[direction]()
+
+    def get_queue_limits(self):
+        """Returns the active queue settings ({"active_downloads": n, ...})."""
+        pack = self.settings.build_pack()
+        return {name: pack[name] for name in QUEUE_SETTINGS if name in pack}
+
+    def set_queue_limits(self, **limits):
+        """Changes active slot limits on top of the current profile and persists them as overrides."""
+        unknown = set(limits) - set(QUEUE_SETTINGS)
+        if unknown:
+            raise ValueError(f"Not a queue setting: {', '.join(sorted(unknown))}")
+        overrides = dict(self.settings.overrides)
+        overrides.update(limits)
+        self.apply_profile(self.settings.profile, overrides)
+
+    def remove_torrent(self, key, delete_files=False):
+        """Removes a torrent; subscribe_removed() listeners hear about it from torrent_removed_alert."""
+        entry = self._cold_entry(key)
+        if entry is not None:
+            if delete_files:
+                # Removed through libtorrent, which knows the file layout; see _on_add_torrent
+                self._delete_after_add.add(entry.key)
+                if self._materialise(entry, paused=True):
+                    return
+                # No file layout to delete by; the data stays on disk
+                self._delete_after_add.discard(entry.key)
+                self._forget_cold(entry)
+            else:
+                self._forget_cold(entry)
+            return
+        handle = self._handle_for(key)
+        if delete_files:
+            self.session.remove_torrent(handle, lt.options_t.delete_files)
+        else:
+            self.session.remove_torrent(handle)
+
+    def _forget_cold(self, entry):
+        self.resume_store.delete(entry.key)
+        self.trackers.forget(entry.key)
+        self._torrent_states.pop(entry.key, None)
+        self.registry.remove(entry.key)
+        with self._cold_lock:
+            self._cold_removed.append(entry.key)
+
+    def get_statuses(self, keys=None):
+        """Returns {info-hash: torrent_status} for the given torrents, or all of them.
+
+        Cold torrents are reported by their ColdRecord, which carries the same fields.
+        """
+        if keys is None:
+            statuses = self.session.get_torrent_status(lambda status: True)
+            result = {torrent_key(status): status for status in statuses}
+            for entry in self.registry.cold_entries():
+                result[entry.key] = entry.cold
+            return result
+
+        result = {}
+        for key in keys:
+            entry = self._cold_entry(key)
+            if entry is not None:
+                result[entry.key] = entry.cold
+            else:
+                status = self._handle_for(key).status()
+                result[torrent_key(status)] = status
+        return result
+
+    def get_peer_info(self, key):
+        """Returns one dict per connected peer of a torrent (see peers.PEER_FIELDS).
+
+        Copies the whole peer list out of libtorrent, so it is only meant for
+        the one torrent a user is looking at, never for the whole library.
+        """
+        return [peer_to_dict(peer) for peer in self._handle_for(key).get_peer_info()]
+
+    def get_files(self, key):
+        """Returns {"paths", "sizes", "priorities"} lists indexed by file; all empty until metadata arrives."""
+        handle = self._handle_for(key)
+        info = handle.torrent_file()
+        if info is None:
+            return {"paths": [], "sizes": [], "priorities": []}
+        files = info.files()
+        count = files.num_files()
+        return {
+            "paths": [files.file_path(i) for i in range(count)],
+            "sizes": [files.file_size(i) for i in range(count)],
+            "priorities": [int(p) for p in handle.get_file_priorities()],
+        }
+
+    def get_file_progress(self, key, indices):
+        """Returns downloaded bytes for the given file indices, in the same order.
+
+        piece_granularity counts only complete pieces, which is much cheaper for
+        libtorrent than byte-exact progress on torrents with many files.
+        """
+        progress = self._handle_for(key).file_progress(lt.torrent_handle.piece_granularity)
+        return [progress[i] for i in indices]
+
+    def set_file_priorities(self, key, priorities):
+        """Applies {file index: priority} (0 = skip ... 7 = top) in a single prioritize_files call.
+
+        Skipped files are never requested, and with sparse storage no disk
+        space is allocated for them.
+        """
+        handle = self._handle_for(key)
+        current = [int(p) for p in handle.get_file_priorities()]
+        for index, priority in priorities.items():
+            current[int(index)] = int(priority)
+        handle.prioritize_files(current)
+        # File priorities are part of the resume data
+        self._mark_dirty(key, handle)
 
-            params["ti"] = info
-            params["name"] = info.name()
-            handle = self.session.add_torrent(params)
+    def list_torrents(self):
+        """Returns [(info-hash, name, paused), ...] in the shape subscribe_added() delivers."""
+        return [(key, status.name, status.paused) for key, status in self.get_statuses().items()]
 
-        # 💡 CRITICAL FIX: Add the new handle to the session-wide list!
-        if handle.is_valid():
-            self.handles.append(handle)
+    def subscribe_removed(self, callback):
+        """Registers callback([info-hash, ...]) for torrents removed from the session."""
+        self._removed_callbacks.append(callback)
 
-        return handle
+    def _mark_dirty(self, key, handle):
+        with self._dirty_lock:
+            self._dirty[key] = handle
 
-    def save_state(self):
-        """Saves fast resume data for all active torrents."""
+    def checkpoint(self):
+        """Requests resume data for every torrent modified since its last checkpoint.
+
+        The data arrives asynchronously as save_resume_data_alert and is written by
+        _on_save_resume_data, one file per torrent.
+        """
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, {}
+
+        requested = 0
+        for handle in dirty.values():
+            if handle.is_valid():
+                # Counted before asking: the alert may be handled before save_resume_data() returns
+                with self._dirty_lock:
+                    self._outstanding_saves += 1
+                handle.save_resume_data(lt.torrent_handle.save_info_dict)
+                requested += 1
+        return requested
+
+    def _resume_request_done(self, key, saved):
+        with self._dirty_lock:
+            self._outstanding_saves = max(0, self._outstanding_saves - 1)
+            if self._save_report is not None:
+                self._save_report["saved" if saved else "failed"].append(key)
+
+    def _resume_data_bytes(self, alert):
+        if hasattr(lt, "write_resume_data_buf"):
+            return lt.write_resume_data_buf(alert.params)
+        return lt.bencode(alert.resume_data)
+
+    def _on_save_resume_data(self, alert):
+        key = torrent_key(alert.handle)
+        try:
+            with self._resume_write.time():
+                self.resume_store.write(key, self._resume_data_bytes(alert))
+        except Exception as e:
+            print(f"DEBUG: ERROR writing resume data for {key}: {e}")
+            # Try again on the next checkpoint; a demotion waits for the next idle check
+            self._demoting.discard(key)
+            self._mark_dirty(key, alert.handle)
+            self._resume_request_done(key, saved=False)
+            return
+        self._resume_request_done(key, saved=True)
+        self._finish_demote(key, alert)
+
+    def _on_save_resume_data_failed(self, alert):
+        print(f"DEBUG: Resume data request failed: {alert.message()}")
+        key = torrent_key(alert.handle)
+        self._demoting.discard(key)
+        self._resume_request_done(key, saved=False)
+
+    def _on_torrent_removed(self, alert):
+        key = torrent_key(alert)
+        with self._dirty_lock:
+            self._dirty.pop(key, None)
+        self._paused_since.pop(key, None)
+        with self._cold_lock:
+            demoted = key in self._removal_pending
+            resume_paused = self._removal_pending.pop(key, None)
+        if demoted:
+            # Demoted, not removed: the resume file and registry entry stay
+            # (unless the cold record was removed meanwhile)
+            self.trackers.forget(key)
+            entry = self._cold_entry(key)
+            if entry is None:
+                return
+            self._torrent_states[key] = "cold"
+            self._cold_changed[key] = entry.cold
+            if resume_paused is not None:
+                # Resumed while it was on its way out
+                self._materialise(entry, resume_paused)
+            return
+        self.resume_store.delete(key)
+        self.trackers.forget(key)
+        self._torrent_states.pop(key, None)
+        self.registry.remove(key)
+        self._removed_batch.append(key)
+
+    def _save_state(self):
+        """Checkpoints every torrent that still has unsaved changes; the last step of stop().
+
+        Runs on the caller's thread once the pump has exited, so it is the only
+        reader of the alert queue. Waits for exactly the outstanding
+        save_resume_data requests (including any still in flight from the last
+        periodic checkpoint) and returns a report dict with the info-hashes that
+        were "saved", "failed" or left "missing".
+        """
         print("DEBUG: Executing save_state()...")
-        resume_data_list = []
+        started = time.monotonic()
+        with self._dirty_lock:
+            self._save_report = {"saved": [], "failed": [], "missing": 0}
         
-        # Step 1: Request resume data for all valid handles
+        # Step 1: Request resume data for all modified handles
         self.session.pause()
-        # Give libtorrent a moment to process the pause command
-        time.sleep(0.1) 
-        self.session.post_torrent_updates() # Trigger a status update alert
 
-        flags = lt.torrent_handle.save_info_dict
-        
-        for h in self.handles:
-            if h.is_valid():
-                h.save_resume_data(flags)
+        for h in self.registry.handles():
+            if h.is_valid() and h.need_save_resume_data():
+                self._mark_dirty(torrent_key(h), h)
+        self.checkpoint()
 
-        # Step 2: Collect the resume data from status alerts
-        # We MUST ensure this loop finishes before we exit the application!
-        
-        # Set a hard limit on how long we wait for resume data
-        timeout = time.time() + 3.0 # Wait up to 3 seconds
-        
-        while time.time() < timeout:
-            updates = self.session.pop_alerts()
-            if not updates: 
-                # If no alerts for a moment, break to write the file
-                time.sleep(0.05) 
+        # Step 2: Block on the alert queue until every request has been answered
+        deadline = time.monotonic() + self.shutdown_timeout
+        while self._outstanding_saves > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self.session.wait_for_alert(int(remaining * 1000)) is None:
                 continue
-            
-            for alert in updates:
-                if isinstance(alert, lt.save_resume_data_alert):
-                    resume_data_list.append(lt.bencode(alert.resume_data))
-                    print(f"DEBUG: Collected resume data for one torrent. Total: {len(resume_data_list)}")
+            # Each save_resume_data_alert is written to its own file by the handler
+            self._handle_alerts(self.session.pop_alerts())
 
-        # Step 3: Write the list of bencoded data to a file
-        try:
-            with open(self.resume_file, "wb") as f:
-                pickle.dump(resume_data_list, f)
-            print(f"DEBUG: SUCCESSFULLY WROTE {len(resume_data_list)} torrents to {self.resume_file}")
-        except Exception as e:
-            print(f"DEBUG: ERROR writing session state: {e}")
-            
-        # Resume session if it's not the final stop
-        if self._running:
-            self.session.resume()
+        with self._dirty_lock:
+            report, self._save_report = self._save_report, None
+            report["missing"] = self._outstanding_saves
+        self._save_state_timing.observe(time.monotonic() - started)
 
-    def load_state(self, torrent_list_ui):
-        """Loads and re-adds all torrents from saved fast resume data."""
-        
-        # 💡 DEBUG 1: Check if the resume file exists
+        print(f"DEBUG: Resume data saved for {len(report['saved'])} torrents, "
+              f"{len(report['failed'])} failed, {report['missing']} timed out.")
+        return report
+
+    def _migrate_legacy_resume_file(self):
+        """Splits an old single-file resume.dat into per-torrent checkpoint files."""
         if not self.resume_file.exists():
-            print("DEBUG: Resume file NOT found. Skipping load.")
             return
 
         try:
             with open(self.resume_file, "rb") as f:
                 resume_data_list = pickle.load(f)
         except Exception as e:
-            print(f"DEBUG: Error loading resume file: {e}. Skipping load.")
+            print(f"DEBUG: Error loading legacy resume file: {e}. Skipping migration.")
             return
 
-        # 💡 DEBUG 2: Check if any data was actually loaded
-        if not resume_data_list:
-            print("DEBUG: Resume file found, but it contained NO torrent data. Skipping load.")
+        migrated = 0
+        for i, data in enumerate(resume_data_list or []):
+            try:
+                params = lt.read_resume_data(data)
+                self.resume_store.write(torrent_key(params), data)
+                migrated += 1
+            except Exception as e:
+                print(f"DEBUG: Failed to migrate legacy torrent #{i}: {e}. Skipping.")
+
+        self.resume_file.rename(self.resume_file.with_name("resume.dat.migrated"))
+        print(f"DEBUG: Migrated {migrated} torrents from {self.resume_file}")
+
+    def load_state(self):
+        """Starts re-adding all torrents from their fast resume files in the background.
+
+        Returns immediately: decoding happens on a loader thread, torrents are added
+        with async_add_torrent and reach the UI through subscribe_added() batches.
+        The status pump must be running to collect the add_torrent_alerts.
+        """
+        if self._load_thread is not None:
             return
-            
-        print(f"DEBUG: Loading {len(resume_data_list)} torrents...")
+
+        self._load_thread = threading.Thread(target=self._load_worker, name="cascadert-load", daemon=True)
+        self._load_thread.start()
+
+    def _load_worker(self):
+        started = time.monotonic()
+        self._migrate_legacy_resume_file()
         
         # 💡 CORRECTED LOOP: Replaces all manual parsing with a single libtorrent call
-        for i, data in enumerate(resume_data_list):
+        loaded = 0
+        cold = 0
+        for key, data in self.resume_store.load_all():
+            if not self._running:
+                break
             
             # CRITICAL FIX: Use lt.read_resume_data() to convert the bencoded data 
             # into a fully-populated lt.add_torrent_params object. This replaces 
@@ -154,74 +939,200 @@ class TorrentSession:
                 
                 # Ensure we skip entries that don't have enough info to load
                 if not params.info_hash and not params.ti:
-                    print(f"DEBUG: Torrent #{i} has no info_hash or torrent_info. Skipping.")
+                    print(f"DEBUG: Torrent {key} has no info_hash or torrent_info. Skipping.")
                     continue
+
+                # Checkpoints from before queueing have running torrents unmanaged
+                if not params.flags & lt.torrent_flags.paused:
+                    params.flags |= lt.torrent_flags.auto_managed
                     
             except Exception as e:
-                print(f"DEBUG: Failed to read/parse resume data for torrent #{i}: {e}. Skipping.")
+                # One corrupt checkpoint must not cost us the rest of the library
+                print(f"DEBUG: Failed to read/parse resume data for torrent {key}: {e}. Skipping.")
+                self.resume_store.quarantine(key)
                 continue
 
-            # Add the torrent back to the session
-            handle = self.session.add_torrent(params)
-            
-            # 💡 DEBUG 3: Check if libtorrent successfully created a valid handle
-            if handle.is_valid():
-                print(f"DEBUG: SUCCESS! Loaded torrent #{i} with path: {params.save_path}")
-                
-                self.handles.append(handle)
-                
-                # Re-add to the UI list and restart the loop
-                torrent_row = torrent_list_ui.add_torrent(handle) 
-                
-                # ... (rest of the update loop setup, unchanged) ...
-                def on_update(h, status):
-                    dht_count = self.get_dht_node_count() 
-                    GLib.idle_add(torrent_row.update, status, dht_count)
+            try:
+                entry = self.registry.add(params_key(params),
+                                          torrent_aliases(params.ti if params.ti is not None else params))
+            except DuplicateTorrentError:
+                print(f"DEBUG: Torrent {key} is already in the session. Skipping.")
+                continue
 
-                self.start_background_loop(handle, on_update)
-            else:
-                 print(f"DEBUG: FAILURE! Could not re-add torrent #{i} from resume data. Check parameters.")
+            if self.cold_storage and is_cold_candidate(params):
+                # Only the record stays in memory; params (and the info dict) are dropped
+                entry.cold = ColdRecord.from_params(params)
+                with self._cold_lock:
+                    self._cold_added.append(entry.key)
+                cold += 1
+                continue
 
-    def start_background_loop(self, handle, callback):
-        # ... (Your existing start_background_loop function remains here)
-        def loop():
-            while self._running:
-                try:
-                    if not handle.is_valid():
-                        print("Background loop stopping for invalid handle.")
-                        break
+            self._wait_for_add_slot()
 
-                    # Get torrent status with the necessary alerts flag (important for progress/speed)
-                    status = handle.status() 
-                    
-                    # Schedule UI update on GTK main thread
-                    GLib.idle_add(callback, handle, status)
-                    
-                except Exception as e:
-                    error_message = str(e)
-                    if "invalid torrent handle" in error_message or not handle.is_valid():
-                        print("Background loop stopping for invalid handle.")
-                        break
-                    else:
-                        print("Error in loop:", e)
-                
-                if not self._running:
-                    break
-                    
-                time.sleep(1)
+            # Add the torrent back to the session without waiting for it
+            self._async_add(params)
+            loaded += 1
+
+        self._load_state_timing.observe(time.monotonic() - started)
+        print(f"DEBUG: Queued {loaded} torrents from resume data in {time.monotonic() - started:.2f}s "
+              f"({cold} kept cold).")
+
+    def subscribe_status(self, callback):
+        """Registers callback({info-hash: status}) to receive the changed torrent statuses once per tick.
+
+        Callbacks run on the pump thread; UI code must marshal to the GTK main loop itself.
+        """
+        self._status_callbacks.append(callback)
+
+    def set_tick_interval(self, seconds):
+        """Changes how often the pump requests status updates and session stats.
 
-        threading.Thread(target=loop, daemon=True).start()
+        The window slows the pump down while nobody is looking; alerts (adds,
+        removals, resume saves) are still handled as soon as they arrive.
+        """
+        faster = seconds < self.tick_interval
+        self.tick_interval = seconds
+        if faster and self._pump_thread is not None:
+            # Tick now rather than at the end of the old, longer interval; the stats alert wakes the pump
+            self._tick_due = True
+            self.session.post_session_stats()
+
+    def start_status_pump(self):
+        """Starts the single background thread that drives status updates and alert dispatch."""
+        if self._pump_thread is not None:
+            return
+
+        self._pump_running = True
+        self._pump_thread = threading.Thread(target=self._pump_loop, name="cascadert-pump", daemon=True)
+        self._pump_thread.start()
+
+    def _stop_pump(self):
+        self._pump_running = False
+        if self._pump_thread is not None:
+            self._pump_thread.join()
+            self._pump_thread = None
+
+    def _pump_loop(self):
+        next_tick = time.monotonic()
+        next_checkpoint = next_tick + self.checkpoint_interval
+        next_bandwidth = next_tick + self.bandwidth_interval
+        next_demote = next_tick + self.cold_check_interval
+        while self._pump_running:
+            try:
+                now = time.monotonic()
+                if now >= next_checkpoint:
+                    self.checkpoint()
+                    next_checkpoint = now + self.checkpoint_interval
+
+                # Schedule boundaries are minute-granular; checking twice a minute is plenty
+                if self._bandwidth_due or now >= next_bandwidth:
+                    self._apply_bandwidth()
+                    next_bandwidth = now + self.bandwidth_interval
+
+                if self.cold_demote_after and now >= next_demote:
+                    self._demote_idle(now)
+                    next_demote = now + self.cold_check_interval
+
+                if self._tick_due or now >= next_tick:
+                    self._tick_due = False
+                    self._pump_lag.observe(max(0.0, now - next_tick))
+                    # Ask libtorrent for a state_update_alert holding ONLY the torrents
+                    # whose status changed since the previous request.
+                    self.session.post_torrent_updates()
+                    self.session.post_session_stats()
+                    next_tick = now + self.tick_interval
+
+                # Block inside libtorrent until an alert arrives or the next tick is due
+                timeout_ms = max(0, int((next_tick - time.monotonic()) * 1000))
+                self.session.wait_for_alert(timeout_ms)
+                alerts = self.session.pop_alerts()
+                self._alerts_per_pop.set(len(alerts))
+                self._alerts_total.inc(len(alerts))
+                with self._pump_dispatch.time():
+                    self._handle_alerts(alerts)
+            except Exception as e:
+                print("Error in status pump:", e)
+                time.sleep(self.tick_interval)
+
+    def _handle_alerts(self, alerts):
+        for alert in alerts:
+            handler = self._alert_handlers.get(type(alert))
+            if handler is not None:
+                handler(alert)
+
+        # Cold records never produce alerts; announce them along with this batch
+        with self._cold_lock:
+            cold_added, self._cold_added = self._cold_added, []
+            cold_removed, self._cold_removed = self._cold_removed, []
+        cold_statuses, self._cold_changed = self._cold_changed, {}
+        for key in cold_added:
+            entry = self._cold_entry(key)
+            if entry is not None:
+                self._added_batch.append((key, entry.cold.name, True))
+                self._torrent_states[key] = "cold"
+                cold_statuses[key] = entry.cold
+        self._removed_batch.extend(cold_removed)
+
+        # Everything added by this batch of alerts goes out as one notification
+        if self._added_batch:
+            added, self._added_batch = self._added_batch, []
+            for callback in self._added_callbacks:
+                callback(added)
+
+        if self._removed_batch:
+            removed, self._removed_batch = self._removed_batch, []
+            for callback in self._removed_callbacks:
+                callback(removed)
+
+        if cold_statuses:
+            for callback in self._status_callbacks:
+                callback(cold_statuses)
+
+        if self._tracker_callbacks:
+            changed = self.trackers.pop_changed()
+            if changed:
+                for callback in self._tracker_callbacks:
+                    callback(changed)
+
+    def _on_state_update(self, alert):
+        statuses = alert.status
+        if not statuses:
+            return
+
+        batch = {}
+        now = time.monotonic()
+        for status in statuses:
+            key = torrent_key(status)
+            batch[key] = status
+            label = self._torrent_states[key] = self._state_label(status)
+            # Idle clock for cold demotion: only torrents the user paused
+            if label == "paused":
+                self._paused_since.setdefault(key, now)
+            else:
+                self._paused_since.pop(key, None)
+            if status.need_save_resume:
+                self._mark_dirty(key, status.handle)
+
+        for callback in self._status_callbacks:
+            callback(batch)
 
     def stop(self):
         """Gracefully stops the libtorrent session, saves state, and background loops."""
         print("DEBUG: Executing session.stop()")
+        # A stopped session must not keep reporting (or be kept alive by) the global registry
+        METRICS.remove_collector(self._collect_metrics)
+        self.importer.shutdown()
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
+            self._metrics_server = None
+
+        # The pump must not steal the resume alerts that _save_state() waits for
+        self._stop_pump()
+        self._running = False
         
-        # 💡 CRITICAL: Save state on shutdown
-        self.save_state() 
-        
-        # Ensure the save has time to finish writing to disk before we abort
-        time.sleep(0.2) 
+        # 💡 CRITICAL: Save state on shutdown; returns once every file is written
+        report = self._save_state()
         
-        self._running = False
         self.session.pause()
-        print("DEBUG: Session aborted.")
\ No newline at end of file
+        print("DEBUG: Session aborted.")
+        return report
\ No newline at end of file
@@ -0,0 +1,186 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import json
+import os
+
+import libtorrent as lt
+
+
+DEFAULT_PROFILE = "desktop"
+
+# Settings shared by every profile unless the profile overrides them
+BASE_SETTINGS = {
+    "listen_interfaces": "0.0.0.0:6881,[::]:6881",
+    "enable_dht": True,
+    "enable_lsd": True,
+    "enable_upnp": True,
+    "enable_natpmp": True,
+    # Queueing: auto-managed torrents only run while a slot is free. Torrents
+    # below the inactive_*_rate thresholds don't hold one.
+    "active_downloads": 3,
+    "active_seeds": 5,
+    "active_limit": 15,
+    "dont_count_slow_torrents": True,
+}
+
+# Queue settings that can be changed on their own through set_queue_limits
+QUEUE_SETTINGS = ("active_downloads", "active_seeds", "active_limit", "dont_count_slow_torrents")
+
+# Built-in profiles, keyed by libtorrent settings_pack names. Enum settings use
+# the enum member name so the JSON copy in the config dir stays readable.
+BUILTIN_PROFILES = {
+    "desktop": {
+        "connections_limit": 200,
+        "unchoke_slots_limit": 8,
+        "choking_algorithm": "fixed_slots_choker",
+        "seed_choking_algorithm": "round_robin",
+        "send_buffer_watermark": 500 * 1024,
+        "send_buffer_low_watermark": 10 * 1024,
+        "send_buffer_watermark_factor": 50,
+        "aio_threads": 4,
+        "hashing_threads": 1,
+        "max_queued_disk_bytes": 1024 * 1024,
+    },
+    "high-throughput seedbox": {
+        "connections_limit": 8000,
+        "unchoke_slots_limit": 500,
+        "choking_algorithm": "rate_based_choker",
+        "seed_choking_algorithm": "fastest_upload",
+        "send_buffer_watermark": 3 * 1024 * 1024,
+        "send_buffer_low_watermark": 1024 * 1024,
+        "send_buffer_watermark_factor": 150,
+        "send_socket_buffer_size": 1024 * 1024,
+        "recv_socket_buffer_size": 1024 * 1024,
+        "aio_threads": 16,
+        "hashing_threads": 4,
+        "max_queued_disk_bytes": 7 * 1024 * 1024,
+        "file_pool_size": 500,
+        "listen_queue_size": 3000,
+        "max_out_request_queue": 1500,
+        "max_allowed_in_request_queue": 2000,
+        "mixed_mode_algorithm": "prefer_tcp",
+        "active_downloads": 20,
+        "active_seeds": 500,
+        "active_limit": 600,
+    },
+    "low-memory": {
+        "connections_limit": 50,
+        "unchoke_slots_limit": 4,
+        "choking_algorithm": "fixed_slots_choker",
+        "seed_choking_algorithm": "round_robin",
+        "send_buffer_watermark": 100 * 1024,
+        "send_buffer_low_watermark": 10 * 1024,
+        "send_buffer_watermark_factor": 50,
+        "send_socket_buffer_size": 64 * 1024,
+        "recv_socket_buffer_size": 64 * 1024,
+        "aio_threads": 1,
+        "hashing_threads": 1,
+        "max_queued_disk_bytes": 256 * 1024,
+        "file_pool_size": 8,
+        "max_peerlist_size": 500,
+        "max_paused_peerlist_size": 100,
+        "active_downloads": 2,
+        "active_seeds": 3,
+        "active_limit": 5,
+    },
+}
+
+# settings_pack names whose values are enum members, and the enum they belong to
+ENUM_SETTINGS = {
+    "choking_algorithm": "choking_algorithm_t",
+    "seed_choking_algorithm": "seed_choking_algorithm_t",
+    "mixed_mode_algorithm": "bandwidth_mixed_algo_t",
+}
+
+
+class SettingsManager:
+    """Loads performance profiles from the config dir and turns them into settings_pack dicts.
+
+    profiles.json holds the profile definitions (seeded with the built-ins on first
+    run, and user-editable); settings.json records the selected profile plus any
+    per-install overrides.
+    """
+
+    def __init__(self, config_dir):
+        self.profiles_file = config_dir / "profiles.json"
+        self.settings_file = config_dir / "settings.json"
+        # Every name this libtorrent build knows; anything else is dropped with a warning
+        self._known = set(lt.default_settings().keys())
+
+        self.profiles = dict(BUILTIN_PROFILES)
+        self.profiles.update(self._read_json(self.profiles_file, {}))
+        if not self.profiles_file.exists():
+            self._write_json(self.profiles_file, self.profiles)
+
+        # settings.json also carries non-libtorrent options (watch folder, ...)
+        self.config = self._read_json(self.settings_file, {})
+        self.profile = self.config.get("profile", DEFAULT_PROFILE)
+        if self.profile not in self.profiles:
+            print(f"DEBUG: Unknown profile {self.profile!r}, falling back to {DEFAULT_PROFILE!r}")
+            self.profile = DEFAULT_PROFILE
+        self.overrides = self.config.get("overrides", {})
+
+    def get(self, name, default=None):
+        return self.config.get(name, default)
+
+    def set(self, name, value):
+        self.config[name] = value
+        self._write_json(self.settings_file, self.config)
+
+    def _read_json(self, path, default):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+        except (OSError, ValueError) as e:
+            print(f"DEBUG: Could not read {path}: {e}. Using defaults.")
+            return default
+
+    def _write_json(self, path, data):
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def profile_names(self):
+        return sorted(self.profiles)
+
+    def build_pack(self, profile=None, overrides=None):
+        """Returns the settings_pack dict for a profile: base, then profile, then overrides."""
+        settings = dict(BASE_SETTINGS)
+        settings.update(self.profiles[profile or self.profile])
+        settings.update(self.overrides if overrides is None else overrides)
+        return self.translate(settings)
+
+    def translate(self, settings):
+        pack = {}
+        for name, value in settings.items():
+            if name not in self._known:
+                print(f"DEBUG: libtorrent has no setting {name!r}; skipping.")
+                continue
+            if name in ENUM_SETTINGS and isinstance(value, str):
+                value = int(getattr(getattr(lt, ENUM_SETTINGS[name]), value))
+            pack[name] = value
+        return pack
+
+    def select(self, profile, overrides=None):
+        """Makes a profile the persisted choice and returns its settings_pack dict."""
+        if profile not in self.profiles:
+            raise KeyError(f"Unknown profile {profile!r}")
+        self.profile = profile
+        if overrides is not None:
+            self.overrides = overrides
+        self.config["profile"] = self.profile
+        self.config["overrides"] = self.overrides
+        self._write_json(self.settings_file, self.config)
+        return self.build_pack()
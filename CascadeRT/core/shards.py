@@ -0,0 +1,345 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import libtorrent as lt
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from CascadeRT.core.infohash import params_key, shard_index
+from CascadeRT.core.ingest import Importer
+from CascadeRT.core.resume import rebalance_resume_files, shard_data_dir
+from CascadeRT.core.rpc import RemoteSession, RpcError, shard_socket_path, socket_in_use
+from CascadeRT.core.settings import SettingsManager
+from CascadeRT.core.stats import EMPTY_SNAPSHOT, SessionSnapshot
+
+# Shard i listens on shard_base_port + i unless settings.json says otherwise
+DEFAULT_BASE_PORT = 6881
+# Directory holding the CascadeRT package, so workers can run it with -m
+PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+# How long a worker gets to open its socket, and to save its resume data on shutdown
+START_TIMEOUT = 60.0
+STOP_TIMEOUT = 60.0
+# How often the global rate limits are re-split between the shards
+REBALANCE_INTERVAL = 10.0
+# Part of each global limit spread evenly so idle shards can still ramp up
+IDLE_SHARE = 0.1
+# A shard moving this fraction of its share counts as held back by it
+SATURATED = 0.9
+
+
+def source_key(source):
+    """Returns the info-hash of a magnet link or .torrent path without adding it anywhere."""
+    if source.startswith("magnet:"):
+        return params_key(lt.parse_magnet_uri(source))
+    file_path = Path(source)
+    if not file_path.exists():
+        raise FileNotFoundError(f"{source} does not exist")
+    params = lt.add_torrent_params()
+    params.ti = lt.torrent_info(str(file_path))
+    return params_key(params)
+
+
+def rebalance_shares(rates, shares, limit):
+    """Splits a global limit between shards moving rates[i] bytes/s under shares[i] of it.
+
+    Returns the new fractions, which add up to 1. IDLE_SHARE is spread
+    evenly; the rest follows the traffic, with shards running into their
+    current share weighted double so a busy shard keeps growing until it is
+    no longer the one being limited.
+    """
+    count = len(rates)
+    demand = [rate * (2 if limit and rate >= SATURATED * share * limit else 1)
+              for rate, share in zip(rates, shares)]
+    total = sum(demand)
+    if not limit or not total:
+        return [1.0 / count] * count
+    return [IDLE_SHARE / count + (1 - IDLE_SHARE) * d / total for d in demand]
+
+
+class ShardedSession:
+    """TorrentSession interface over several daemon processes, one libtorrent session each.
+
+    Each worker is a regular CascadeRT daemon with its own socket, data
+    folder (resume files, metadata cache) and listen port; settings.json is
+    shared. Torrents belong to shard shard_index(info-hash), so per-torrent
+    calls go straight to one worker while library-wide calls fan out to all
+    of them. Resume files are moved to their owner before the workers start,
+    which also covers changing the shard count between runs. The global rate
+    limits start out split evenly and are re-split every REBALANCE_INTERVAL
+    from the shards' traffic, so one busy shard isn't held to 1/count.
+    """
+
+    def __init__(self, count):
+        self.count = count
+        self.config_dir = Path.home() / ".config" / "CascadeRT"
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        socket_paths = [shard_socket_path(index) for index in range(count)]
+        for socket_path in socket_paths:
+            # Stale sockets are the workers' to clean up; a live one belongs to another instance
+            if socket_in_use(socket_path):
+                raise RuntimeError(f"{socket_path} is in use; is another sharded CascadeRT running?")
+        self.settings = SettingsManager(self.config_dir)
+        rebalance_resume_files(self.config_dir, count)
+
+        self._processes = []
+        self.shards = []
+        base_port = self.settings.get("shard_base_port", DEFAULT_BASE_PORT)
+        metrics_port = self.settings.get("metrics_port")
+        for index, socket_path in enumerate(socket_paths):
+            command = [sys.executable, "-m", "CascadeRT.daemon",
+                       "--socket", str(socket_path),
+                       "--data-dir", str(shard_data_dir(self.config_dir, index)),
+                       "--listen-port", str(base_port + index),
+                       "--rate-share", str(count),
+                       # The coordinator watches the folder and routes each file to its owner
+                       "--no-watch-folder"]
+            if metrics_port:
+                command += ["--metrics-port", str(int(metrics_port) + index)]
+            self._processes.append(subprocess.Popen(command, cwd=PACKAGE_ROOT))
+            self.shards.append(socket_path)
+        # Started in parallel above; now wait for each worker's socket
+        self.shards = [self._connect(index, path) for index, path in enumerate(self.shards)]
+
+        self._stats_lock = threading.Lock()
+        self._snapshots = [EMPTY_SNAPSHOT] * count
+        self._stats_callbacks = []
+        for index, shard in enumerate(self.shards):
+            shard.subscribe_stats(lambda snapshot, index=index: self._on_stats(index, snapshot))
+        # Fractions of the global (download, upload) limits each shard applies
+        self._shares = ([1.0 / count] * count, [1.0 / count] * count)
+        self._stopping = threading.Event()
+
+        # 💡 Parsing for bulk imports happens here; each parsed source goes to its owner
+        self.importer = Importer(self)
+
+    def _connect(self, index, socket_path):
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            try:
+                return RemoteSession(socket_path)
+            except OSError:
+                if self._processes[index].poll() is not None:
+                    raise RuntimeError(f"Shard {index} exited with status {self._processes[index].returncode}")
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"Shard {index} did not open {socket_path}")
+                time.sleep(0.1)
+
+    def shard_for(self, key):
+        return self.shards[shard_index(key, self.count)]
+
+    def _broadcast(self, method, *args, **kwargs):
+        # One shard after another: they share settings.json and each rewrites it
+        return [getattr(shard, method)(*args, **kwargs) for shard in self.shards]
+
+    # --- adding ---
+
+    def add_torrent(self, source, save_path):
+        try:
+            key = source_key(source)
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"Failed to parse torrent file: {e}")
+            return None
+        return self.shard_for(key).add_torrent(source, save_path)
+
+    def parse_source(self, source, save_path):
+        """Importer hook: routing only needs the info-hash; the owning shard parses the source again."""
+        return source_key(source), (source, str(save_path))
+
+    def add_params(self, key, params, throttle=False):
+        # DuplicateTorrentError comes back as itself; a shard failing to read the source is an RpcError
+        source, save_path = params
+        self.shard_for(key).add_source(source, save_path)
+
+    def has_torrent(self, key):
+        try:
+            return bool(self.shard_for(key).get_statuses([key]))
+        except RpcError:
+            return False
+
+    def import_sources(self, sources, save_path):
+        self.importer.submit(sources, save_path)
+
+    def start_watch_folder(self):
+        folder = self.settings.get("watch_folder")
+        if folder:
+            save_path = self.settings.get("watch_save_path") or str(Path.home() / "Downloads")
+            self.importer.watch(Path(folder).expanduser(), save_path)
+
+    # --- per torrent: routed to the owning shard ---
+
+    def remove_torrent(self, key, delete_files=False):
+        self.shard_for(key).remove_torrent(key, delete_files)
+
+    def pause_torrent(self, key):
+        self.shard_for(key).pause_torrent(key)
+
+    def resume_torrent(self, key):
+        self.shard_for(key).resume_torrent(key)
+
+    def demote_torrent(self, key):
+        self.shard_for(key).demote_torrent(key)
+
+    def move_queue(self, key, direction):
+        # Each shard has its own queue; this moves the torrent within its shard's
+        self.shard_for(key).move_queue(key, direction)
+
+    def get_peer_info(self, key):
+        return self.shard_for(key).get_peer_info(key)
+
+    def get_files(self, key):
+        return self.shard_for(key).get_files(key)
+
+    def get_file_progress(self, key, indices):
+        return self.shard_for(key).get_file_progress(key, indices)
+
+    def set_file_priorities(self, key, priorities):
+        self.shard_for(key).set_file_priorities(key, priorities)
+
+    def get_torrent_limits(self, key):
+        return self.shard_for(key).get_torrent_limits(key)
+
+    def set_torrent_limits(self, key, download_limit, upload_limit):
+        self.shard_for(key).set_torrent_limits(key, download_limit, upload_limit)
+
+    # --- library-wide: fanned out and merged ---
+
+    def get_statuses(self, keys=None):
+        if keys is None:
+            statuses = {}
+            for shard in self.shards:
+                statuses.update(shard.get_statuses())
+            return statuses
+        by_shard = {}
+        for key in keys:
+            by_shard.setdefault(shard_index(key, self.count), []).append(key)
+        statuses = {}
+        for index, shard_keys in by_shard.items():
+            statuses.update(self.shards[index].get_statuses(shard_keys))
+        return statuses
+
+    def list_torrents(self):
+        return [torrent for shard in self.shards for torrent in shard.list_torrents()]
+
+    def list_profiles(self):
+        return self.shards[0].list_profiles()
+
+    def apply_profile(self, name, overrides=None):
+        self._broadcast("apply_profile", name, overrides)
+
+    def get_limits(self):
+        # Every shard holds the same global limits and applies its share of them
+        return self.shards[0].get_limits()
+
+    def set_global_limits(self, download_limit, upload_limit):
+        self._broadcast("set_global_limits", download_limit, upload_limit)
+
+    def set_bandwidth_schedule(self, rules):
+        self._broadcast("set_bandwidth_schedule", rules)
+
+    def set_lan_bypass(self, enabled):
+        self._broadcast("set_lan_bypass", enabled)
+
+    def get_queue_limits(self):
+        """Returns the queue settings; they apply to each shard separately."""
+        return self.shards[0].get_queue_limits()
+
+    def set_queue_limits(self, **limits):
+        self._broadcast("set_queue_limits", **limits)
+
+    # --- subscriptions ---
+
+    def subscribe_status(self, callback):
+        self._broadcast("subscribe_status", callback)
+
+    def subscribe_added(self, callback):
+        self._broadcast("subscribe_added", callback)
+
+    def subscribe_removed(self, callback):
+        self._broadcast("subscribe_removed", callback)
+
+    def subscribe_trackers(self, callback):
+        self._broadcast("subscribe_trackers", callback)
+
+    def subscribe_limits(self, callback):
+        # Limit changes reach every shard at once; one of them is enough to report them
+        self.shards[0].subscribe_limits(callback)
+
+    def subscribe_stats(self, callback):
+        """Registers callback(snapshot) receiving the sum of the shards' latest SessionSnapshots."""
+        self._stats_callbacks.append(callback)
+
+    def _on_stats(self, index, snapshot):
+        # Runs on the shard's reader thread; every shard's tick publishes a new total
+        with self._stats_lock:
+            self._snapshots[index] = snapshot
+            totals = [sum(values) for values in zip(*self._snapshots)]
+        combined = SessionSnapshot(*totals)._replace(timestamp=snapshot.timestamp)
+        for callback in self._stats_callbacks:
+            callback(combined)
+
+    def _rebalance_loop(self):
+        # Own thread: a shard's reader thread can't wait on a call to its own shard
+        while not self._stopping.wait(REBALANCE_INTERVAL):
+            try:
+                limits = self.get_limits()
+                with self._stats_lock:
+                    snapshots = list(self._snapshots)
+                shares = (
+                    rebalance_shares([s.download_rate for s in snapshots], self._shares[0], limits.download_limit),
+                    rebalance_shares([s.upload_rate for s in snapshots], self._shares[1], limits.upload_limit),
+                )
+                moved = max(abs(new - old) for new_shares, old_shares in zip(shares, self._shares)
+                            for new, old in zip(new_shares, old_shares))
+                if moved < 0.01:
+                    continue
+                for shard, download_share, upload_share in zip(self.shards, *shares):
+                    shard.set_rate_shares(download_share, upload_share)
+                self._shares = shares
+            except (OSError, RpcError) as e:
+                print(f"DEBUG: Could not rebalance shard rate limits: {e}")
+
+    # --- lifecycle ---
+
+    def start_status_pump(self):
+        self._broadcast("start_status_pump")
+        threading.Thread(target=self._rebalance_loop, name="cascadert-shard-rates", daemon=True).start()
+
+    def load_state(self):
+        # Every worker loads its own resume files on start
+        pass
+
+    def start_metrics_server(self, port=None):
+        # Each worker serves its own metrics on metrics_port + shard index
+        pass
+
+    def set_tick_interval(self, seconds):
+        # Workers are daemons and keep their own pace, like for RemoteSession
+        pass
+
+    def stop(self):
+        """Stops every worker; each one saves its resume data before exiting."""
+        self._stopping.set()
+        self.importer.shutdown()
+        for shard in self.shards:
+            shard.stop()
+        for process in self._processes:
+            process.send_signal(signal.SIGTERM)
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for index, process in enumerate(self._processes):
+            try:
+                process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                print(f"DEBUG: Shard {index} did not stop in time; killing it.")
+                process.kill()
@@ -0,0 +1,104 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import time
+from collections import namedtuple
+
+import libtorrent as lt
+
+
+# One immutable snapshot per tick; readers never lock, the cache just swaps the reference
+SessionSnapshot = namedtuple("SessionSnapshot", [
+    "timestamp",
+    "dht_nodes",
+    "num_peers",
+    "download_rate",       # payload bytes/s, derived from the counter deltas
+    "upload_rate",
+    "disk_queued_jobs",
+    "disk_queued_write_bytes",
+])
+
+EMPTY_SNAPSHOT = SessionSnapshot(0.0, 0, 0, 0, 0, 0, 0)
+
+# libtorrent counter names decoded from every session_stats_alert
+METRIC_NAMES = (
+    "dht.dht_nodes",
+    "peer.num_peers_connected",
+    "net.recv_payload_bytes",
+    "net.sent_payload_bytes",
+    "disk.queued_disk_jobs",
+    "disk.queued_write_bytes",
+)
+
+
+class SessionStats:
+    """Session-wide metrics cache fed by session_stats_alert.
+
+    The status pump calls post_session_stats() once per tick; this class decodes
+    the counters and publishes a SessionSnapshot that any thread can read for free
+    through the `snapshot` attribute.
+    """
+
+    def __init__(self):
+        # Counter name -> index into session_stats_alert values, resolved once
+        metrics = lt.session_stats_metrics()
+        self.metric_index = {m.name: m.value_index for m in metrics}
+        self.metric_gauges = {m.name for m in metrics if m.type == lt.metric_type_t.gauge}
+        self.counters = {}
+        # The latest alert's full value set, kept by reference for the metrics endpoint
+        self.values = None
+        self.snapshot = EMPTY_SNAPSHOT
+        self._last_recv = None
+        self._last_sent = None
+
+    def _decode(self, alert):
+        values = alert.values
+        if isinstance(values, dict):
+            # Newer bindings already key the values by counter name
+            return {name: values.get(name, 0) for name in METRIC_NAMES}
+        return {name: values[self.metric_index[name]] for name in METRIC_NAMES if name in self.metric_index}
+
+    def all_values(self):
+        """Yields (counter name, is_gauge, value) for every libtorrent counter in the latest alert."""
+        values = self.values
+        if values is None:
+            return
+        for name, index in self.metric_index.items():
+            value = values.get(name, 0) if isinstance(values, dict) else values[index]
+            yield name, name in self.metric_gauges, value
+
+    def on_alert(self, alert):
+        self.values = alert.values
+        counters = self._decode(alert)
+        now = time.monotonic()
+
+        recv = counters.get("net.recv_payload_bytes", 0)
+        sent = counters.get("net.sent_payload_bytes", 0)
+        download_rate = upload_rate = 0
+        if self._last_recv is not None:
+            elapsed = now - self.snapshot.timestamp
+            if elapsed > 0:
+                download_rate = int(max(0, recv - self._last_recv) / elapsed)
+                upload_rate = int(max(0, sent - self._last_sent) / elapsed)
+        self._last_recv = recv
+        self._last_sent = sent
+
+        self.counters = counters
+        self.snapshot = SessionSnapshot(
+            timestamp=now,
+            dht_nodes=counters.get("dht.dht_nodes", 0),
+            num_peers=counters.get("peer.num_peers_connected", 0),
+            download_rate=download_rate,
+            upload_rate=upload_rate,
+            disk_queued_jobs=counters.get("disk.queued_disk_jobs", 0),
+            disk_queued_write_bytes=counters.get("disk.queued_write_bytes", 0),
+        )
+        return self.snapshot
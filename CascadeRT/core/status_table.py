@@ -0,0 +1,172 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+from array import array
+
+try:
+    import numpy
+except ImportError: # optional: aggregates fall back to the array module's C loops
+    numpy = None
+
+from CascadeRT.core.model import ETA_UNKNOWN, STATE_GROUPS, state_name
+
+# Coarse states as stored in the state column; 0 marks a free slot
+STATES = ("", "downloading", "seeding", "queued", "paused", "checking", "metadata")
+STATE_CODES = {name: code for code, name in enumerate(STATES) if name}
+FREE = 0
+
+# (column, array typecode); every column has one entry per slot
+COLUMNS = (
+    ("progress", "d"),
+    ("download_rate", "q"),
+    ("upload_rate", "q"),
+    ("total_size", "q"),
+    ("total_done", "q"),
+    ("num_peers", "i"),
+    ("eta_seconds", "q"),
+    ("queue_position", "i"),
+    ("added_time", "q"),
+    ("state", "b"),
+    ("has_metadata", "b"),
+)
+
+
+def status_state(status):
+    """Coarse state of a torrent_status: queued, paused or its STATE_GROUPS group."""
+    if status.paused:
+        # An auto-managed torrent that is paused is waiting for a queue slot, not stopped
+        return "queued" if status.auto_managed else "paused"
+    return STATE_GROUPS.get(state_name(status.state), "downloading")
+
+
+class StatusTable:
+    """Latest status of every torrent in the list, one typed array per field.
+
+    Rows are slots handed out by add() and reused after remove(). A status
+    batch is written straight into the columns; the GObject rows only copy
+    from here when they are on screen, and library-wide aggregates run over
+    the columns in C (NumPy when installed, the array module otherwise).
+    """
+
+    def __init__(self):
+        self.slots = {} # info-hash -> slot
+        self.names = [] # per slot; strings don't fit a typed array
+        self._free = []
+        for column, typecode in COLUMNS:
+            setattr(self, column, array(typecode))
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, key):
+        return key in self.slots
+
+    def add(self, key, name="", paused=False):
+        """Reserves a slot for a torrent shown before its first status; returns the slot."""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self.names)
+            self.names.append("")
+            for column, _ in COLUMNS:
+                getattr(self, column).append(0)
+        self.slots[key] = slot
+        self.names[slot] = name
+        self.eta_seconds[slot] = ETA_UNKNOWN
+        self.queue_position[slot] = -1
+        self.state[slot] = STATE_CODES["paused" if paused else "downloading"]
+        self.has_metadata[slot] = bool(name)
+        return slot
+
+    def remove(self, key):
+        slot = self.slots.pop(key, None)
+        if slot is None:
+            return
+        # Zeroed so the aggregates can run over every slot, free or not
+        for column, _ in COLUMNS:
+            getattr(self, column)[slot] = 0
+        self.names[slot] = ""
+        self._free.append(slot)
+
+    def update(self, slot, status):
+        """Writes one torrent_status (or RPC status) into a slot."""
+        state = status_state(status)
+        paused = state in ("queued", "paused")
+        self.state[slot] = STATE_CODES[state]
+        self.queue_position[slot] = int(status.queue_position)
+        self.added_time[slot] = int(status.added_time)
+        self.num_peers[slot] = status.num_peers
+
+        if paused:
+            download_rate = upload_rate = 0
+        else:
+            download_rate, upload_rate = status.download_rate, status.upload_rate
+        self.download_rate[slot] = download_rate
+        self.upload_rate[slot] = upload_rate
+
+        if status.has_metadata:
+            self.has_metadata[slot] = 1
+            self.names[slot] = status.name
+            self.progress[slot] = status.progress
+            self.total_size[slot] = total = status.total_wanted
+            self.total_done[slot] = done = status.total_done
+            if download_rate > 0:
+                self.eta_seconds[slot] = int((total - done) / download_rate)
+            else:
+                self.eta_seconds[slot] = ETA_UNKNOWN
+        else:
+            self.has_metadata[slot] = 0
+            self.progress[slot] = 0.0
+            self.total_size[slot] = 0
+            self.total_done[slot] = 0
+            self.eta_seconds[slot] = ETA_UNKNOWN
+
+    def state_name(self, slot):
+        return STATES[self.state[slot]]
+
+    # --- aggregates over the whole library ---
+
+    def total_rates(self):
+        """Returns (download, upload) summed over every torrent, in bytes/s."""
+        if numpy is not None and self.names:
+            return (int(numpy.frombuffer(self.download_rate, dtype=numpy.int64).sum()),
+                    int(numpy.frombuffer(self.upload_rate, dtype=numpy.int64).sum()))
+        return sum(self.download_rate), sum(self.upload_rate)
+
+    def state_counts(self):
+        """Returns {state: number of torrents} for every state with at least one torrent."""
+        if numpy is not None and self.names:
+            counts = numpy.bincount(numpy.frombuffer(self.state, dtype=numpy.int8), minlength=len(STATES))
+            return {STATES[code]: int(count) for code, count in enumerate(counts) if code != FREE and count}
+        counts = {}
+        for code in range(1, len(STATES)):
+            count = self.state.count(code)
+            if count:
+                counts[STATES[code]] = count
+        return counts
+
+    def session_eta(self):
+        """Seconds until every downloading torrent is done at the current total rate, or ETA_UNKNOWN."""
+        downloading = STATE_CODES["downloading"]
+        if numpy is not None and self.names:
+            active = numpy.frombuffer(self.state, dtype=numpy.int8) == downloading
+            remaining = (numpy.frombuffer(self.total_size, dtype=numpy.int64)[active].sum()
+                         - numpy.frombuffer(self.total_done, dtype=numpy.int64)[active].sum())
+            rate = numpy.frombuffer(self.download_rate, dtype=numpy.int64)[active].sum()
+        else:
+            remaining = rate = 0
+            for state, total, done, down in zip(self.state, self.total_size, self.total_done, self.download_rate):
+                if state == downloading:
+                    remaining += total - done
+                    rate += down
+        if rate <= 0:
+            return ETA_UNKNOWN
+        return int(remaining / rate)
@@ -0,0 +1,100 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import threading
+import time
+from collections import namedtuple
+
+
+UNKNOWN = "unknown"
+UPDATING = "updating"
+WORKING = "working"
+FAILING = "failing"
+
+TrackerSummary = namedtuple("TrackerSummary", ["total", "working", "failing", "updating", "last_announce"])
+
+EMPTY_SUMMARY = TrackerSummary(0, 0, 0, 0, 0.0)
+
+
+def alert_tracker_url(alert):
+    # libtorrent 2.x exposes a method, 1.2 a plain attribute
+    url = getattr(alert, "tracker_url", None)
+    if callable(url):
+        return url()
+    return alert.url
+
+
+class TrackerCache:
+    """Per-torrent tracker health, maintained from tracker alerts.
+
+    Each torrent's announce list is read once when it is added; after that the
+    state of every tracker changes only through tracker_announce_alert,
+    tracker_reply_alert and tracker_error_alert, so nothing copies the
+    announce-entry list on a timer.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._trackers = {} # info-hash -> {url: state}
+        self._last_announce = {} # info-hash -> unix time of the last announce
+        self._changed = set()
+
+    def seed(self, key, urls):
+        with self._lock:
+            trackers = self._trackers.setdefault(key, {})
+            for url in urls:
+                trackers.setdefault(url, UNKNOWN)
+            self._changed.add(key)
+
+    def forget(self, key):
+        with self._lock:
+            self._trackers.pop(key, None)
+            self._last_announce.pop(key, None)
+            self._changed.discard(key)
+
+    def _set_state(self, key, url, state, announced=False):
+        with self._lock:
+            self._trackers.setdefault(key, {})[url] = state
+            if announced:
+                self._last_announce[key] = time.time()
+            self._changed.add(key)
+
+    def on_announce(self, key, alert):
+        self._set_state(key, alert_tracker_url(alert), UPDATING, announced=True)
+
+    def on_reply(self, key, alert):
+        self._set_state(key, alert_tracker_url(alert), WORKING)
+
+    def on_error(self, key, alert):
+        self._set_state(key, alert_tracker_url(alert), FAILING)
+
+    def summary(self, key):
+        with self._lock:
+            return self._summary_locked(key)
+
+    def _summary_locked(self, key):
+        trackers = self._trackers.get(key)
+        if not trackers:
+            return EMPTY_SUMMARY
+        states = list(trackers.values())
+        return TrackerSummary(
+            total=len(states),
+            working=states.count(WORKING),
+            failing=states.count(FAILING),
+            updating=states.count(UPDATING),
+            last_announce=self._last_announce.get(key, 0.0),
+        )
+
+    def pop_changed(self):
+        """Returns {info-hash: TrackerSummary} for torrents touched since the last call."""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            return {key: self._summary_locked(key) for key in changed}
@@ -0,0 +1,83 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import argparse
+import signal
+
+from gi.repository import GLib
+
+from CascadeRT.core.rpc import RpcServer, default_socket_path
+from CascadeRT.core.session import TorrentSession
+from CascadeRT.core.shards import ShardedSession
+
+
+def run_daemon(socket_path=None, metrics_port=None, data_dir=None, listen_port=None, rate_share=1, shards=1,
+               watch_folder=True):
+    """Runs the engine without any display and serves it on a local Unix socket.
+
+    With shards > 1 the engine is a ShardedSession over that many worker
+    daemons; data_dir, listen_port and rate_share are what it starts each
+    worker with. watch_folder=False leaves settings.json's watch folder to
+    someone else (a sharded coordinator watches it for its workers).
+    """
+    if shards > 1:
+        session = ShardedSession(shards)
+    else:
+        session = TorrentSession(data_dir, listen_port, rate_share)
+    server = RpcServer(session, socket_path)
+
+    session.start_status_pump()
+    session.load_state()
+    if watch_folder:
+        session.start_watch_folder()
+    session.start_metrics_server(metrics_port)
+    server.start()
+
+    loop = GLib.MainLoop()
+
+    def on_signal():
+        print("DEBUG: Daemon shutting down...")
+        loop.quit()
+        return GLib.SOURCE_REMOVE
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, on_signal)
+
+    try:
+        loop.run()
+    finally:
+        server.shutdown()
+        session.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless CascadeRT engine")
+    parser.add_argument("--socket", default=str(default_socket_path()),
+                        help="Unix socket to serve the RPC interface on")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve Prometheus-style metrics on 127.0.0.1:PORT (default: metrics_port in settings.json)")
+    parser.add_argument("--data-dir", default=None,
+                        help="Keep resume files and cached metadata here instead of the config folder")
+    parser.add_argument("--listen-port", type=int, default=None,
+                        help="Listen on this port instead of the profile's listen_interfaces")
+    parser.add_argument("--rate-share", type=int, default=1,
+                        help="Start out applying 1/N of the global rate limits (one of N shards)")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Spread the library over N engine processes (see ShardedSession)")
+    parser.add_argument("--no-watch-folder", dest="watch_folder", action="store_false",
+                        help="Don't import from the watch folder in settings.json")
+    args = parser.parse_args(argv)
+    run_daemon(args.socket, args.metrics_port, args.data_dir, args.listen_port, args.rate_share, args.shards,
+               args.watch_folder)
+
+
+if __name__ == "__main__":
+    main()
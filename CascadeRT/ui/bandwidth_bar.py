@@ -0,0 +1,126 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import gi
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk
+
+from CascadeRT.ui.session_calls import call_session
+
+# Spin buttons work in KiB/s; the session takes bytes/s with 0 meaning unlimited
+KIB = 1024
+MAX_LIMIT_KIB = 1024 * 1024
+
+
+def _limit_spin(tooltip):
+    spin = Gtk.SpinButton.new_with_range(0, MAX_LIMIT_KIB, 64)
+    spin.set_tooltip_text(f"{tooltip} in KiB/s (0 = unlimited)")
+    spin.set_width_chars(7)
+    return spin
+
+
+class BandwidthBar(Gtk.Box):
+    """Global and per-torrent rate limits.
+
+    The global spin buttons edit the unscheduled limits; while a schedule rule
+    is active its limits are shown in the status label instead.
+    """
+
+    def __init__(self, session):
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        self.session = session
+        self._torrent = None
+        # Set while filling spin buttons from the session, so that doesn't write back
+        self._syncing = False
+
+        self._global_down = _limit_spin("Global download limit")
+        self._global_up = _limit_spin("Global upload limit")
+        self._global_down.connect("value-changed", self._on_global_changed)
+        self._global_up.connect("value-changed", self._on_global_changed)
+
+        self._lan_bypass = Gtk.CheckButton(label="LAN unlimited")
+        self._lan_bypass.connect("toggled", self._on_lan_bypass_toggled)
+
+        self._torrent_down = _limit_spin("Download limit for the selected torrent")
+        self._torrent_up = _limit_spin("Upload limit for the selected torrent")
+        self._torrent_down.connect("value-changed", self._on_torrent_changed)
+        self._torrent_up.connect("value-changed", self._on_torrent_changed)
+
+        self._status = Gtk.Label(xalign=0, hexpand=True)
+
+        self.append(Gtk.Label(label="Global D/U:"))
+        self.append(self._global_down)
+        self.append(self._global_up)
+        self.append(self._lan_bypass)
+        self.append(Gtk.Label(label="Torrent D/U:"))
+        self.append(self._torrent_down)
+        self.append(self._torrent_up)
+        self.append(self._status)
+
+        self.set_torrent(None)
+        call_session(session.get_limits, on_done=self.set_limits)
+
+    def set_limits(self, limits):
+        """Shows the session's effective BandwidthLimits (GTK main thread only)."""
+        self._syncing = True
+        try:
+            if limits.rule is None:
+                self._global_down.set_value(limits.download_limit // KIB)
+                self._global_up.set_value(limits.upload_limit // KIB)
+            self._lan_bypass.set_active(limits.lan_bypass)
+        finally:
+            self._syncing = False
+
+        down = f"{limits.download_limit // KIB} KiB/s" if limits.download_limit else "∞"
+        up = f"{limits.upload_limit // KIB} KiB/s" if limits.upload_limit else "∞"
+        rule = f" by schedule ({limits.rule})" if limits.rule else ""
+        self._status.set_markup(f"<span size='small'>Limit{rule}: D:{down} | U:{up}</span>")
+        return False
+
+    def set_torrent(self, torrent_model):
+        self._torrent = torrent_model
+        self._torrent_down.set_sensitive(torrent_model is not None)
+        self._torrent_up.set_sensitive(torrent_model is not None)
+
+        self._show_torrent_limits(torrent_model, (0, 0))
+        if torrent_model is not None:
+            call_session(self.session.get_torrent_limits, torrent_model.key,
+                         on_done=lambda limits: self._show_torrent_limits(torrent_model, limits))
+
+    def _show_torrent_limits(self, torrent_model, limits):
+        if torrent_model is not self._torrent:
+            return # The selection moved on while the lookup was out
+        down, up = limits
+        self._syncing = True
+        try:
+            self._torrent_down.set_value(down // KIB)
+            self._torrent_up.set_value(up // KIB)
+        finally:
+            self._syncing = False
+
+    def _on_global_changed(self, spin):
+        if self._syncing:
+            return
+        call_session(self.session.set_global_limits,
+                     self._global_down.get_value_as_int() * KIB,
+                     self._global_up.get_value_as_int() * KIB)
+
+    def _on_lan_bypass_toggled(self, button):
+        if self._syncing:
+            return
+        call_session(self.session.set_lan_bypass, button.get_active())
+
+    def _on_torrent_changed(self, spin):
+        if self._syncing or self._torrent is None:
+            return
+        call_session(self.session.set_torrent_limits, self._torrent.key,
+                     self._torrent_down.get_value_as_int() * KIB,
+                     self._torrent_up.get_value_as_int() * KIB)
@@ -0,0 +1,331 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import gi
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk, Gio, GObject, GLib
+
+import threading
+
+from CascadeRT.ui.session_calls import call_session
+
+# (label, libtorrent download priority)
+PRIORITIES = (("Skip", 0), ("Low", 1), ("Normal", 4), ("High", 7))
+# Shown for folders whose files don't all share one priority
+MIXED = -1
+
+PROGRESS_INTERVAL = 2
+
+
+def build_tree(paths, sizes):
+    """Turns flat file paths into nested dicts; directories also list every file index below them."""
+    root = {"name": "", "children": {}, "indices": [], "size": 0}
+    for index, (path, size) in enumerate(zip(paths, sizes)):
+        parts = path.replace("\\", "/").split("/")
+        node = root
+        node["indices"].append(index)
+        node["size"] += size
+        for part in parts[:-1]:
+            node = node["children"].setdefault(part, {"name": part, "children": {}, "indices": [], "size": 0})
+            node["indices"].append(index)
+            node["size"] += size
+        node["children"][parts[-1]] = {"name": parts[-1], "index": index, "size": size}
+    return root
+
+
+class FileNode(GObject.GObject):
+    """One row of the file tree. Only created for folders that have been expanded."""
+
+    name = GObject.Property(type=str)
+    size = GObject.Property(type=GObject.TYPE_INT64)
+    progress = GObject.Property(type=float)
+    priority = GObject.Property(type=int, default=4)
+
+    def __init__(self, node, priority):
+        super().__init__()
+        self.node = node
+        self.name = node["name"]
+        self.size = node["size"]
+        self.priority = priority
+
+    @property
+    def is_dir(self):
+        return "children" in self.node
+
+    @property
+    def index(self):
+        return self.node.get("index", -1)
+
+
+class FileView(Gtk.Box):
+    """File tree of the selected torrent on a lazily expanded Gtk.TreeListModel.
+
+    Row objects exist only for expanded folders, and progress is fetched only
+    for the file rows currently bound (on screen), so torrents with tens of
+    thousands of files cost no more than the rows the user is looking at.
+    """
+
+    def __init__(self, session):
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        self.session = session
+        self._key = None
+        self._torrent = None
+        self._metadata_handler = None
+        self._priorities = []
+        self._tree = None
+        self._file_nodes = {} # file index -> FileNode, for rows that exist
+        self._bound = set() # FileNodes currently shown
+        self._timer_id = None
+        self._fetching = False
+        self._generation = 0
+
+        self.root_store = Gio.ListStore(item_type=FileNode)
+        self.tree_model = Gtk.TreeListModel.new(self.root_store, False, False, self._create_children)
+
+        view = Gtk.ColumnView(model=Gtk.NoSelection(model=self.tree_model))
+        view.append_column(self._column("Name", self._setup_name, self._bind_name, self._unbind_row, expand=True))
+        view.append_column(self._column("Size", self._setup_label, self._bind_size, self._unbind_row))
+        view.append_column(self._column("Progress", self._setup_progress, self._bind_progress, self._unbind_row))
+        view.append_column(self._column("Priority", self._setup_priority, self._bind_priority, self._unbind_priority))
+
+        scrolled = Gtk.ScrolledWindow(vexpand=True)
+        scrolled.set_min_content_height(200)
+        scrolled.set_child(view)
+        self.append(scrolled)
+
+        self.connect("map", lambda widget: self._restart_timer())
+        self.connect("unmap", lambda widget: self._stop_timer())
+
+    def _column(self, title, setup, bind, unbind, expand=False):
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", setup)
+        factory.connect("bind", bind)
+        factory.connect("unbind", unbind)
+        column = Gtk.ColumnViewColumn(title=title, factory=factory)
+        column.set_expand(expand)
+        return column
+
+    # --- loading ---
+
+    def set_torrent(self, torrent_model):
+        if self._metadata_handler is not None:
+            self._torrent.disconnect(self._metadata_handler)
+            self._metadata_handler = None
+        self._torrent = torrent_model
+        if torrent_model is not None:
+            # A magnet has no file list until its metadata arrives (total_size goes from 0)
+            self._metadata_handler = torrent_model.connect("notify::total-size", self._on_size_changed)
+        self._reload()
+
+    def _on_size_changed(self, torrent_model, pspec):
+        if self._tree is not None and not self._tree["indices"]:
+            self._reload()
+
+    def _reload(self):
+        self._key = self._torrent.key if self._torrent is not None else None
+        self._generation += 1
+        self._tree = None
+        self._file_nodes = {}
+        self.root_store.remove_all()
+        if self._key is not None:
+            threading.Thread(target=self._load, args=(self._key, self._generation),
+                             name="cascadert-files", daemon=True).start()
+        self._restart_timer()
+
+    def _load(self, key, generation):
+        # Listing and tree building stay off the main thread for huge torrents
+        try:
+            files = self.session.get_files(key)
+        except Exception as e:
+            print(f"DEBUG: File list for {key} failed: {e}")
+            return
+        tree = build_tree(files["paths"], files["sizes"])
+        GLib.idle_add(self._loaded, generation, tree, files["priorities"])
+
+    def _loaded(self, generation, tree, priorities):
+        if generation != self._generation:
+            return GLib.SOURCE_REMOVE
+        self._tree = tree
+        self._priorities = priorities
+        self.root_store.splice(0, 0, self._nodes_for(tree))
+        return GLib.SOURCE_REMOVE
+
+    def _nodes_for(self, directory):
+        nodes = []
+        # Folders first, then files, each alphabetically
+        children = sorted(directory["children"].values(), key=lambda n: ("children" not in n, n["name"].lower()))
+        for child in children:
+            node = FileNode(child, self._priority_of(child))
+            if not node.is_dir:
+                self._file_nodes[node.index] = node
+            nodes.append(node)
+        return nodes
+
+    def _create_children(self, item):
+        if not item.is_dir:
+            return None
+        store = Gio.ListStore(item_type=FileNode)
+        store.splice(0, 0, self._nodes_for(item.node))
+        return store
+
+    def _priority_of(self, node):
+        if "index" in node:
+            return self._priorities[node["index"]]
+        values = {self._priorities[i] for i in node["indices"]}
+        return values.pop() if len(values) == 1 else MIXED
+
+    # --- priorities ---
+
+    def _set_priority(self, file_node, priority):
+        if self._key is None:
+            return
+        indices = file_node.node["indices"] if file_node.is_dir else [file_node.index]
+        changes = {i: priority for i in indices if self._priorities[i] != priority}
+        if not changes:
+            return
+        generation = self._generation
+        call_session(self.session.set_file_priorities, self._key, changes,
+                     on_done=lambda result: self._priorities_set(generation, changes))
+
+    def _priorities_set(self, generation, changes):
+        if generation != self._generation:
+            return
+        for i, priority in changes.items():
+            self._priorities[i] = priority
+            node = self._file_nodes.get(i)
+            if node is not None:
+                node.priority = priority
+        # Folder rows on screen may have become uniform or mixed
+        for node in list(self._bound):
+            if node.is_dir:
+                node.priority = self._priority_of(node.node)
+
+    # --- progress for visible rows ---
+
+    def _restart_timer(self):
+        self._stop_timer()
+        if self._key is None or not self.get_mapped():
+            return
+        self._timer_id = GLib.timeout_add_seconds(PROGRESS_INTERVAL, self._poll)
+
+    def _stop_timer(self):
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+
+    def _poll(self):
+        indices = [node.index for node in self._bound if not node.is_dir]
+        if indices and not self._fetching:
+            self._fetching = True
+            threading.Thread(target=self._fetch_progress, args=(self._key, self._generation, indices),
+                             name="cascadert-file-progress", daemon=True).start()
+        return GLib.SOURCE_CONTINUE
+
+    def _fetch_progress(self, key, generation, indices):
+        try:
+            progress = self.session.get_file_progress(key, indices)
+        except Exception as e:
+            print(f"DEBUG: File progress for {key} failed: {e}")
+            progress = None
+        GLib.idle_add(self._apply_progress, generation, indices, progress)
+
+    def _apply_progress(self, generation, indices, progress):
+        self._fetching = False
+        if generation != self._generation or progress is None:
+            return GLib.SOURCE_REMOVE
+        for index, done in zip(indices, progress):
+            node = self._file_nodes.get(index)
+            if node is not None and node.size:
+                fraction = done / node.size
+                if fraction != node.progress:
+                    node.progress = fraction
+        return GLib.SOURCE_REMOVE
+
+    # --- cells ---
+
+    def _setup_name(self, factory, list_item):
+        expander = Gtk.TreeExpander()
+        expander.set_child(Gtk.Label(xalign=0))
+        list_item.set_child(expander)
+
+    def _bind_name(self, factory, list_item):
+        row = list_item.get_item()
+        node = row.get_item()
+        expander = list_item.get_child()
+        expander.set_list_row(row)
+        expander.get_child().set_text(node.name)
+        self._bound.add(node)
+
+    def _setup_label(self, factory, list_item):
+        list_item.set_child(Gtk.Label(xalign=1))
+
+    def _bind_size(self, factory, list_item):
+        node = list_item.get_item().get_item()
+        list_item.get_child().set_text(f"{node.size / (1024 * 1024):.1f} MB")
+
+    def _setup_progress(self, factory, list_item):
+        list_item.set_child(Gtk.ProgressBar(valign=Gtk.Align.CENTER))
+
+    def _bind_progress(self, factory, list_item):
+        node = list_item.get_item().get_item()
+        bar = list_item.get_child()
+        bar.set_visible(not node.is_dir)
+        bar._binding = node.bind_property("progress", bar, "fraction", GObject.BindingFlags.SYNC_CREATE)
+
+    def _unbind_row(self, factory, list_item):
+        child = list_item.get_child()
+        binding = getattr(child, "_binding", None)
+        if binding is not None:
+            binding.unbind()
+            child._binding = None
+        if isinstance(child, Gtk.TreeExpander):
+            self._bound.discard(list_item.get_item().get_item())
+
+    def _setup_priority(self, factory, list_item):
+        dropdown = Gtk.DropDown.new_from_strings([label for label, _ in PRIORITIES])
+        dropdown._node = None
+        dropdown._handler_ids = []
+        dropdown.connect("notify::selected", self._on_priority_selected)
+        list_item.set_child(dropdown)
+
+    def _bind_priority(self, factory, list_item):
+        dropdown = list_item.get_child()
+        node = list_item.get_item().get_item()
+        dropdown._node = None # not yet: syncing the widget must not write back
+        self._sync_priority(node, None, dropdown)
+        dropdown._node = node
+        dropdown._handler_ids = [node.connect("notify::priority", self._sync_priority, dropdown)]
+
+    def _unbind_priority(self, factory, list_item):
+        dropdown = list_item.get_child()
+        if dropdown._node is not None:
+            for handler_id in dropdown._handler_ids:
+                dropdown._node.disconnect(handler_id)
+        dropdown._handler_ids = []
+        dropdown._node = None
+
+    def _sync_priority(self, node, pspec, dropdown):
+        current, dropdown._node = dropdown._node, None
+        # The nearest named level (e.g. 2, 3 show as Low); folders with mixed children show blank
+        if node.priority == MIXED:
+            dropdown.set_selected(Gtk.INVALID_LIST_POSITION)
+        else:
+            dropdown.set_selected(max(i for i, (_, value) in enumerate(PRIORITIES) if value <= node.priority))
+        dropdown._node = current
+
+    def _on_priority_selected(self, dropdown, pspec):
+        node = dropdown._node
+        selected = dropdown.get_selected()
+        if node is None or selected == Gtk.INVALID_LIST_POSITION:
+            return
+        priority = PRIORITIES[selected][1]
+        if priority != node.priority:
+            self._set_priority(node, priority)
@@ -0,0 +1,323 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+from gi.repository import Gio, GLib
+
+import threading
+import time
+
+from CascadeRT.core.history import history_slot
+from CascadeRT.core.metrics import METRICS
+from CascadeRT.core.model import ETA_UNKNOWN, TorrentModel
+from CascadeRT.core.registry import TorrentRegistry
+from CascadeRT.core.status_table import StatusTable, status_state
+
+# Rows inserted into the store per main-loop iteration while a batch streams in
+ADD_CHUNK_SIZE = 250
+
+# How long a torrent whose state changed keeps skipping a slowed-down refresh (seconds)
+HOT_SECONDS = 10.0
+
+# Main-thread cost of applying one coalesced status batch
+_FLUSH_TIMING = METRICS.timing("cascadert_ui_flush_seconds", "GTK main-thread time applying one status batch")
+
+
+class TorrentListData:
+    """TorrentList's data path without widgets: store, registry, status table and batching.
+
+    Session callbacks queue from any thread; everything else runs on the main
+    loop. TorrentList owns one and keeps resort_keys and row_props in step
+    with its sorter and filter; benchmarks/run.py drives one directly.
+    """
+
+    def __init__(self, on_resort=None, on_summary=None):
+        self.store = Gio.ListStore(item_type=TorrentModel)
+        # info-hash -> model and store position, used to route status batches to their rows
+        self.registry = TorrentRegistry()
+        # Latest status of every row; models copy from it only while on screen (see apply_statuses)
+        self.table = StatusTable()
+        self.shown = set() # models bound to a row widget, plus the selected one
+        # Model properties whose change can move a row or change whether it is shown
+        self.resort_keys = {"added_time"}
+        # Model properties kept current on every row, on screen or not: whatever sorting or filtering may read
+        self.row_props = {"added_time", "state", "name"}
+        # on_resort(positions): store positions whose resort keys changed in one batch
+        self._on_resort = on_resort or self._items_changed
+        # on_summary(text): library-wide counts after each applied batch
+        self._on_summary = on_summary
+
+        # Statuses waiting for the main loop, coalesced per torrent (latest wins)
+        self._pending_lock = threading.Lock()
+        self._pending = {}
+        self._pending_trackers = {}
+        self._flush_scheduled = False
+        # Seconds between UI flushes: 0 = every batch, None = hold everything (see set_refresh_interval)
+        self._refresh_interval = 0
+        self._timer_id = None
+        # Torrents refreshed on every batch even while slowed down: the selection, and
+        # info-hash -> monotonic expiry for torrents whose state just changed
+        self._selected_key = None
+        self._hot = {}
+        self._last_states = {} # pump side: info-hash -> coarse state of the last status seen
+        self._hot_scheduled = False
+        self._pending_added = []
+        # Updates that arrived before their row was inserted; applied on insert
+        self._early_statuses = {}
+        self._early_trackers = {}
+        self._add_scheduled = False
+
+    def show(self, model):
+        # Everything a visible row or the detail panel reads, copied in one go
+        if model not in self.shown:
+            self.shown.add(model)
+            model.sync(self.table)
+
+    def set_selected_key(self, key):
+        """The selection is hot: its statuses skip a slowed-down refresh."""
+        with self._pending_lock:
+            self._selected_key = key
+
+    def summary_text(self):
+        counts = self.table.state_counts()
+        text = f"{len(self.table)} torrents: {counts.get('downloading', 0)} downloading, " \
+               f"{counts.get('seeding', 0)} seeding"
+        eta = self.table.session_eta()
+        if eta != ETA_UNKNOWN:
+            text += f" • done in {eta // 3600}h {eta % 3600 // 60}m"
+        return text
+
+    def queue_added(self, added):
+        """Queues [(info-hash, name, paused), ...] from any thread for insertion."""
+        with self._pending_lock:
+            self._pending_added.extend(added)
+            if self._add_scheduled:
+                return
+            self._add_scheduled = True
+
+        GLib.idle_add(self._flush_added)
+
+    def _flush_added(self):
+        # Insert one chunk per main-loop iteration so the window keeps painting
+        # and handling input while a large library streams in.
+        with self._pending_lock:
+            chunk = self._pending_added[:ADD_CHUNK_SIZE]
+            del self._pending_added[:ADD_CHUNK_SIZE]
+            if not self._pending_added:
+                self._add_scheduled = False
+
+        models = []
+        position = self.store.get_n_items()
+        row_props = self.row_props
+        for key, name, paused in chunk:
+            if key in self.registry:
+                continue
+            model = TorrentModel(key, name, paused)
+            model.slot = self.table.add(key, name, paused)
+            self.registry.add(key, model=model, position=position + len(models))
+            status = self._early_statuses.pop(key, None)
+            if status is not None:
+                self.table.update(model.slot, status)
+                model.sync(self.table, row_props)
+            summary = self._early_trackers.pop(key, None)
+            if summary is not None:
+                model.update_trackers(summary)
+            models.append(model)
+
+        if models:
+            self.store.splice(self.store.get_n_items(), 0, models)
+
+        with self._pending_lock:
+            return self._add_scheduled
+
+    def queue_removed(self, keys):
+        """Queues removed info-hashes from any thread."""
+        GLib.idle_add(self.remove_torrents, keys)
+
+    def remove_torrents(self, keys):
+        with self._pending_lock:
+            for key in keys:
+                self._pending.pop(key, None)
+                self._pending_trackers.pop(key, None)
+                self._last_states.pop(key, None)
+                self._hot.pop(key, None)
+        for key in keys:
+            self._early_statuses.pop(key, None)
+            self._early_trackers.pop(key, None)
+            entry = self.registry.remove(key)
+            if entry is not None:
+                self.table.remove(key)
+                self.shown.discard(entry.model)
+                self._remove_position(entry.position)
+        return GLib.SOURCE_REMOVE
+
+    def _remove_position(self, position):
+        # Swap-remove: move the last row into the hole so no other entry's
+        # position changes and removal stays O(1) regardless of library size.
+        last = self.store.get_n_items() - 1
+        if position != last:
+            moved = self.store.get_item(last)
+            self.store.splice(position, 1, [moved])
+            self.registry.get(moved.key).position = position
+        self.store.remove(last)
+
+    def get_model(self, key):
+        entry = self.registry.get(key)
+        return entry.model if entry is not None else None
+
+    def pending_count(self):
+        """Statuses waiting for the next flush (any thread)."""
+        with self._pending_lock:
+            return len(self._pending)
+
+    def queue_statuses(self, statuses):
+        """Queues a {info-hash: status} batch from any thread.
+
+        At most one main-loop callback is outstanding: if the UI falls behind,
+        later ticks are merged into the pending batch instead of piling up.
+        While the refresh is slowed down, only hot torrents (the selection and
+        torrents whose state just changed) are pushed right away; the rest
+        wait for the next interval, coalesced to their latest status.
+        """
+        now = time.monotonic()
+        with self._pending_lock:
+            self._pending.update(statuses)
+            hot = False
+            for key, status in statuses.items():
+                state = status_state(status)
+                previous = self._last_states.get(key)
+                if previous != state:
+                    self._last_states[key] = state
+                    # A torrent's first status is not a change
+                    if previous is not None:
+                        self._hot[key] = now + HOT_SECONDS
+                        hot = True
+                if key == self._selected_key or self._hot.get(key, 0) > now:
+                    hot = True
+
+            if self._refresh_interval is None:
+                return
+            if self._refresh_interval == 0:
+                self._schedule_flush_locked()
+            elif hot and not self._hot_scheduled:
+                self._hot_scheduled = True
+                GLib.idle_add(self._flush_hot)
+
+    def queue_trackers(self, summaries):
+        """Queues {info-hash: TrackerSummary} from any thread; shares the status flush."""
+        with self._pending_lock:
+            self._pending_trackers.update(summaries)
+            # Slowed down or held: the refresh timer (or resuming) picks them up
+            if self._refresh_interval == 0:
+                self._schedule_flush_locked()
+
+    def _schedule_flush_locked(self):
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            GLib.idle_add(self.flush_pending)
+
+    def set_refresh_interval(self, seconds):
+        """Pushes statuses to the models every batch (0), every `seconds`, or not at all (None).
+
+        Held statuses are coalesced per torrent, so a hidden window costs one
+        dict entry per changed torrent and no GTK work; they are applied in
+        one go when the refresh resumes.
+        """
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+        with self._pending_lock:
+            self._refresh_interval = seconds
+            if seconds == 0:
+                self._schedule_flush_locked()
+        if seconds:
+            self._timer_id = GLib.timeout_add(int(seconds * 1000), self._on_refresh_timer)
+
+    def _on_refresh_timer(self):
+        with self._pending_lock:
+            if self._pending or self._pending_trackers:
+                self._schedule_flush_locked()
+        return GLib.SOURCE_CONTINUE
+
+    def _flush_hot(self):
+        now = time.monotonic()
+        with self._pending_lock:
+            self._hot_scheduled = False
+            self._hot = {key: until for key, until in self._hot.items() if until > now}
+            hot = {key: status for key, status in self._pending.items()
+                   if key == self._selected_key or key in self._hot}
+            for key in hot:
+                del self._pending[key]
+        if hot:
+            self.apply_statuses(hot)
+        return GLib.SOURCE_REMOVE
+
+    def flush_pending(self):
+        """Applies every queued status and tracker summary; the scheduled main-loop callback."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            trackers, self._pending_trackers = self._pending_trackers, {}
+            self._flush_scheduled = False
+
+        started = time.perf_counter()
+        self.apply_statuses(pending)
+        self.apply_trackers(trackers)
+        if pending and self._on_summary is not None:
+            self._on_summary(self.summary_text())
+        _FLUSH_TIMING.observe(time.perf_counter() - started)
+        return GLib.SOURCE_REMOVE
+
+    def apply_trackers(self, summaries):
+        """Applies a {info-hash: TrackerSummary} batch (GTK main thread only)."""
+        for key, summary in summaries.items():
+            model = self.get_model(key)
+            if model is not None:
+                model.update_trackers(summary)
+            else:
+                self._early_trackers[key] = summary
+
+    def apply_statuses(self, statuses):
+        """Applies a {info-hash: status} batch (GTK main thread only).
+
+        Every status goes into the StatusTable. Only models on screen (bound
+        rows and the selection) get all their properties copied; the others
+        just keep the keys sorting and filtering read, so off-screen rows
+        emit next to no notify signals.
+
+        The sort and filter models don't watch item properties, so the
+        positions of rows whose sort key, state or name changed are handed to
+        on_resort; the rest of the list is left alone instead of being
+        re-sorted every tick.
+        """
+        resort_keys = self.resort_keys
+        row_props = self.row_props
+        table = self.table
+        now = history_slot()
+        moved = []
+        for key, status in statuses.items():
+            entry = self.registry.get(key)
+            if entry is None:
+                self._early_statuses[key] = status
+                continue
+            model = entry.model
+            slot = model.slot
+            table.update(slot, status)
+            # Raw rates, not the thresholded properties, so the graph shows small changes too
+            model.history.record(now, table.download_rate[slot], table.upload_rate[slot])
+            changed = model.sync(table, None if model in self.shown else row_props)
+            if changed & resort_keys:
+                moved.append(entry.position)
+        if moved:
+            self._on_resort(moved)
+
+    def _items_changed(self, positions):
+        # Each items_changed only re-positions that row
+        for position in positions:
+            self.store.items_changed(position, 1, 1)
@@ -0,0 +1,184 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import gi
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk, Gio, GObject, GLib
+
+import threading
+
+DEFAULT_INTERVAL = 2
+
+
+class PeerModel(GObject.GObject):
+    endpoint = GObject.Property(type=str)
+    client = GObject.Property(type=str)
+    download_rate = GObject.Property(type=GObject.TYPE_INT64)
+    upload_rate = GObject.Property(type=GObject.TYPE_INT64)
+    progress = GObject.Property(type=float)
+    flags = GObject.Property(type=str)
+
+    def __init__(self, endpoint):
+        super().__init__()
+        self.endpoint = endpoint
+
+    def update(self, peer):
+        with self.freeze_notify():
+            for field in ("client", "download_rate", "upload_rate", "progress", "flags"):
+                if self.get_property(field) != peer[field]:
+                    self.set_property(field, peer[field])
+
+
+def _rate(binding, value):
+    return f"{value/1024:.1f} KB/s"
+
+
+def _percent(binding, value):
+    return f"{value * 100:.1f}%"
+
+
+# (title, PeerModel property, transform to text or None, expand)
+COLUMNS = (
+    ("Address", "endpoint", None, True),
+    ("Client", "client", None, True),
+    ("Flags", "flags", None, False),
+    ("Down", "download-rate", _rate, False),
+    ("Up", "upload-rate", _rate, False),
+    ("Progress", "progress", _percent, False),
+)
+
+
+class PeerList(Gtk.Box):
+    """Peers of the selected torrent, refreshed on a timer only while visible.
+
+    get_peer_info() copies the whole peer list, so it runs for one torrent at
+    a time, off the main thread, and not at all while nothing is selected or
+    the list is unmapped (collapsed expander, hidden panel). Results are
+    diffed into the store by endpoint, so existing rows update in place.
+    """
+
+    def __init__(self, session):
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        self.session = session
+        self.store = Gio.ListStore(item_type=PeerModel)
+        self._peers = {} # endpoint -> PeerModel
+        self._key = None
+        self._timer_id = None
+        self._fetching = False
+        # Bumped on every torrent change so late results for the old one are dropped
+        self._generation = 0
+
+        view = Gtk.ColumnView(model=Gtk.NoSelection(model=self.store))
+        for title, prop, transform, expand in COLUMNS:
+            factory = Gtk.SignalListItemFactory()
+            factory.connect("setup", self._setup_cell)
+            factory.connect("bind", self._bind_cell, prop, transform)
+            factory.connect("unbind", self._unbind_cell)
+            column = Gtk.ColumnViewColumn(title=title, factory=factory)
+            column.set_expand(expand)
+            view.append_column(column)
+
+        scrolled = Gtk.ScrolledWindow(vexpand=True)
+        scrolled.set_min_content_height(160)
+        scrolled.set_child(view)
+
+        interval_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        self.interval = Gtk.SpinButton.new_with_range(1, 60, 1)
+        self.interval.set_value(DEFAULT_INTERVAL)
+        self.interval.connect("value-changed", lambda spin: self._restart_timer())
+        interval_row.append(Gtk.Label(label="Refresh every (s):"))
+        interval_row.append(self.interval)
+
+        self.append(interval_row)
+        self.append(scrolled)
+
+        self.connect("map", lambda widget: self._restart_timer())
+        self.connect("unmap", lambda widget: self._stop_timer())
+
+    def set_torrent(self, torrent_model):
+        self._key = torrent_model.key if torrent_model is not None else None
+        self._generation += 1
+        self._peers = {}
+        self.store.remove_all()
+        self._restart_timer()
+
+    def _restart_timer(self):
+        self._stop_timer()
+        if self._key is None or not self.get_mapped():
+            return
+        self._poll()
+        self._timer_id = GLib.timeout_add_seconds(self.interval.get_value_as_int(), self._poll)
+
+    def _stop_timer(self):
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+
+    def _poll(self):
+        # Skip a tick rather than stack requests if the previous one is still out
+        if not self._fetching:
+            self._fetching = True
+            threading.Thread(target=self._fetch, args=(self._key, self._generation),
+                             name="cascadert-peers", daemon=True).start()
+        return GLib.SOURCE_CONTINUE
+
+    def _fetch(self, key, generation):
+        try:
+            peers = self.session.get_peer_info(key)
+        except Exception as e:
+            print(f"DEBUG: Peer list for {key} failed: {e}")
+            peers = None
+        GLib.idle_add(self._apply, generation, peers)
+
+    def _apply(self, generation, peers):
+        self._fetching = False
+        if generation != self._generation or peers is None:
+            return GLib.SOURCE_REMOVE
+
+        seen = set()
+        new = []
+        for peer in peers:
+            endpoint = peer["endpoint"]
+            seen.add(endpoint)
+            model = self._peers.get(endpoint)
+            if model is None:
+                model = self._peers[endpoint] = PeerModel(endpoint)
+                new.append(model)
+            model.update(peer)
+
+        gone = set(self._peers) - seen
+        if gone:
+            # Highest position first so the remaining indices stay valid
+            for position in reversed(range(self.store.get_n_items())):
+                if self.store.get_item(position).endpoint in gone:
+                    self.store.remove(position)
+            for endpoint in gone:
+                del self._peers[endpoint]
+        if new:
+            self.store.splice(self.store.get_n_items(), 0, new)
+        return GLib.SOURCE_REMOVE
+
+    def _setup_cell(self, factory, list_item):
+        list_item.set_child(Gtk.Label(xalign=0))
+
+    def _bind_cell(self, factory, list_item, prop, transform):
+        label = list_item.get_child()
+        if transform is None:
+            label._binding = list_item.get_item().bind_property(prop, label, "label",
+                                                                 GObject.BindingFlags.SYNC_CREATE)
+        else:
+            label._binding = list_item.get_item().bind_property(prop, label, "label",
+                                                                 GObject.BindingFlags.SYNC_CREATE, transform)
+
+    def _unbind_cell(self, factory, list_item):
+        label = list_item.get_child()
+        label._binding.unbind()
+        label._binding = None
@@ -0,0 +1,79 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import gi
+gi.require_version("Gtk", "4.0")
+gi.require_version("Gdk", "4.0")
+from gi.repository import Gdk
+
+# mode -> (session pump tick in seconds, list refresh: 0 = every batch, None = held)
+REFRESH_MODES = {
+    "active": (1.0, 0),
+    "unfocused": (2.0, 3.0),
+    "hidden": (5.0, None),
+}
+
+
+class RefreshScheduler:
+    """Slows status refresh down while the window is unfocused and stops it while hidden.
+
+    Watches the window's focus, mapping and minimized state, and sets the
+    session's pump tick and the torrent list's refresh interval to match.
+    The list still pushes hot torrents (the selection, recent state
+    changes) right away while unfocused; see TorrentListData.queue_statuses.
+    """
+
+    def __init__(self, window, torrent_list, session):
+        self.window = window
+        self.torrent_list = torrent_list
+        self.session = session
+        self.mode = "active"
+        self._surface = None
+        self._surface_handler = None
+
+        window.connect("notify::is-active", self._update)
+        window.connect("map", self._update)
+        window.connect("unmap", self._update)
+        window.connect("realize", self._on_realize)
+        window.connect("unrealize", self._on_unrealize)
+
+    def _on_realize(self, window):
+        # Minimizing keeps the window mapped; only the toplevel surface knows
+        self._surface = window.get_surface()
+        self._surface_handler = self._surface.connect("notify::state", self._update)
+        self._update()
+
+    def _on_unrealize(self, window):
+        if self._surface is not None:
+            self._surface.disconnect(self._surface_handler)
+            self._surface = None
+        self._update()
+
+    def _minimized(self):
+        if self._surface is None or not isinstance(self._surface, Gdk.Toplevel):
+            return False
+        return bool(self._surface.get_state() & Gdk.ToplevelState.MINIMIZED)
+
+    def _current_mode(self):
+        if not self.window.get_mapped() or self._minimized():
+            return "hidden"
+        if not self.window.is_active():
+            return "unfocused"
+        return "active"
+
+    def _update(self, *args):
+        mode = self._current_mode()
+        if mode == self.mode:
+            return
+        self.mode = mode
+        tick, refresh = REFRESH_MODES[mode]
+        self.session.set_tick_interval(tick)
+        self.torrent_list.set_refresh_interval(refresh)
@@ -0,0 +1,53 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+from gi.repository import GLib
+
+import queue
+import threading
+
+# Session calls from GTK handlers, run in order on one worker so a slow daemon
+# (RemoteSession waits up to its timeout) never blocks the main loop
+_calls = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def call_session(func, *args, on_done=None, label=None):
+    """Runs func(*args) off the GTK main thread; on_done(result) then runs on the main loop.
+
+    Calls run one at a time in the order they were made, so a pause followed by
+    a resume reaches the session in that order. Errors are printed and skip
+    on_done.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name="cascadert-session-calls", daemon=True)
+            _worker.start()
+    _calls.put((func, args, on_done, label or getattr(func, "__name__", "session call")))
+
+
+def _run():
+    while True:
+        func, args, on_done, label = _calls.get()
+        try:
+            result = func(*args)
+        except Exception as e:
+            print(f"DEBUG: {label} failed: {e}")
+            continue
+        if on_done is not None:
+            GLib.idle_add(_done, on_done, result)
+
+
+def _done(on_done, result):
+    on_done(result)
+    return GLib.SOURCE_REMOVE
@@ -0,0 +1,126 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import cairo
+import gi
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk
+
+DOWNLOAD_COLOR = (0.21, 0.52, 0.89, 0.85)
+UPLOAD_COLOR = (0.20, 0.70, 0.30, 1.0)
+# Smallest full-scale value, so an idle torrent doesn't draw noise at full height
+MIN_SCALE = 16 * 1024
+
+
+def _nice_scale(peak):
+    # Powers of two: the scale, and with it a full repaint, changes only on big swings
+    scale = MIN_SCALE
+    while scale < peak:
+        scale *= 2
+    return scale
+
+
+class Sparkline(Gtk.DrawingArea):
+    """Download (filled) and upload (line) rate graph for a RateHistory.
+
+    GTK 4 always repaints a widget's whole area, so the work lives in a cached
+    surface instead: each new sample scrolls the surface left and paints only
+    the new columns, and the draw function itself is a single blit. The whole
+    graph is repainted only when the history, the size or the scale changes.
+    """
+
+    def __init__(self, samples, sample_width=2, height=36):
+        super().__init__()
+        self.samples = samples
+        self.sample_width = sample_width
+        self.set_content_width(samples * sample_width)
+        self.set_content_height(height)
+        self.set_draw_func(self._draw)
+        self.connect("resize", self._on_resize)
+
+        self._history = None
+        self._surface = None
+        self._scale = MIN_SCALE
+        self._drawn_slot = None
+
+    def set_history(self, history, slot):
+        """Shows a different RateHistory (or None to clear), repainting everything."""
+        self._history = history
+        self._repaint(slot)
+
+    def push(self, slot):
+        """Brings the graph up to slot, painting only the columns that are new."""
+        if self._history is None:
+            return
+        if self._surface is None or self._drawn_slot is None:
+            self._repaint(slot)
+            return
+
+        new = slot - self._drawn_slot
+        downloads, uploads = self._history.values(slot, self.samples)
+        if new < 0 or new >= self.samples or _nice_scale(max(downloads + uploads)) != self._scale:
+            self._repaint(slot, downloads, uploads)
+            return
+
+        width, height = self._surface.get_width(), self._surface.get_height()
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        cr = cairo.Context(surface)
+        cr.set_source_surface(self._surface, -new * self.sample_width, 0)
+        cr.paint()
+        # The previously newest column is repainted too: its sample may have been updated since
+        first = self.samples - new - 1
+        self._paint_columns(cr, downloads, uploads, first, height)
+        self._surface = surface
+        self._drawn_slot = slot
+        self.queue_draw()
+
+    def _repaint(self, slot, downloads=None, uploads=None):
+        width, height = self.samples * self.sample_width, self.get_content_height()
+        self._surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+        self._drawn_slot = slot
+        if self._history is not None:
+            if downloads is None:
+                downloads, uploads = self._history.values(slot, self.samples)
+            self._scale = _nice_scale(max(downloads + uploads))
+            self._paint_columns(cairo.Context(self._surface), downloads, uploads, 0, height)
+        self.queue_draw()
+
+    def _paint_columns(self, cr, downloads, uploads, first, height):
+        w = self.sample_width
+        cr.set_operator(cairo.OPERATOR_CLEAR)
+        cr.rectangle(first * w, 0, (self.samples - first) * w, height)
+        cr.fill()
+        cr.set_operator(cairo.OPERATOR_OVER)
+
+        cr.set_source_rgba(*DOWNLOAD_COLOR)
+        for i in range(first, self.samples):
+            bar = height * downloads[i] / self._scale
+            if bar:
+                cr.rectangle(i * w, height - bar, w, bar)
+        cr.fill()
+
+        cr.set_source_rgba(*UPLOAD_COLOR)
+        for i in range(max(first, 1), self.samples):
+            cr.move_to((i - 1) * w + w / 2, height - height * uploads[i - 1] / self._scale)
+            cr.line_to(i * w + w / 2, height - height * uploads[i] / self._scale)
+        cr.set_line_width(1)
+        cr.stroke()
+
+    def _on_resize(self, area, width, height):
+        if self._drawn_slot is not None:
+            self._repaint(self._drawn_slot)
+
+    def _draw(self, area, cr, width, height):
+        if self._surface is None:
+            return
+        # Right-aligned so the newest sample sits at the edge
+        cr.set_source_surface(self._surface, width - self._surface.get_width(), 0)
+        cr.paint()
@@ -12,11 +12,19 @@
 
 import gi
 gi.require_version("Gtk", "4.0")
-from gi.repository import Gtk, GObject, Gio
+from gi.repository import Gtk
+
+import time
+
+from CascadeRT.core.history import (SESSION_HISTORY_LENGTH, TORRENT_HISTORY_LENGTH, RateHistory,
+                                    history_slot)
+from CascadeRT.ui.file_view import FileView
+from CascadeRT.ui.peer_list import PeerList
+from CascadeRT.ui.sparkline import Sparkline
 
 
 class TorrentDetailPanel(Gtk.Box):
-    def __init__(self):
+    def __init__(self, session):
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
         
         self.set_margin_top(16)
@@ -26,6 +34,7 @@ class TorrentDetailPanel(Gtk.Box):
         
         self._current_torrent = None
         self._peer_conn_id = None  
+        self._tracker_conn_ids = []
         
         # Widgets for detail display
         # 💡 Apply Pango setup to Peers, Trackers, and DHT labels for size consistency
@@ -49,19 +58,57 @@ class TorrentDetailPanel(Gtk.Box):
         self.dht_nodes_label.set_markup(f"<span size='small'>DHT Nodes: --</span>")
 
 
+        # Session-wide totals, fed from the shared SessionSnapshot once per tick
+        self.session_rate_label = Gtk.Label()
+        self.session_rate_label.set_xalign(0)
+        self.session_rate_label.set_use_markup(True)
+        self.session_rate_label.set_markup("<span size='small'>Total: --</span>")
+
+        self.disk_queue_label = Gtk.Label()
+        self.disk_queue_label.set_xalign(0)
+        self.disk_queue_label.set_use_markup(True)
+        self.disk_queue_label.set_markup("<span size='small'>Disk queue: --</span>")
+
         # Add widgets to the panel
         detail_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=30)
         
         detail_box.append(self.peer_count_label)
         detail_box.append(self.tracker_count_label)
         detail_box.append(self.dht_nodes_label)
+        detail_box.append(self.session_rate_label)
+        detail_box.append(self.disk_queue_label)
         
         separator = Gtk.Separator()
         separator.set_margin_top(5) 
         separator.set_margin_bottom(8)
 
+        # Rate history: the selected torrent's (kept on its model) and the session totals
+        self.session_history = RateHistory(SESSION_HISTORY_LENGTH)
+        self.torrent_graph = Sparkline(TORRENT_HISTORY_LENGTH, sample_width=2)
+        self.session_graph = Sparkline(SESSION_HISTORY_LENGTH // 2, sample_width=1)
+        self.session_graph.set_history(self.session_history, history_slot())
+
+        graph_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        graph_box.append(Gtk.Label(label="Torrent:"))
+        graph_box.append(self.torrent_graph)
+        graph_box.append(Gtk.Label(label="Session:"))
+        graph_box.append(self.session_graph)
+
         self.append(separator)
         self.append(detail_box)
+        self.append(graph_box)
+
+        # Full peer table; only polled while the expander is open and a torrent is selected
+        self.peer_list = PeerList(session)
+        peers_expander = Gtk.Expander(label="Peers")
+        peers_expander.set_child(self.peer_list)
+        self.append(peers_expander)
+
+        # File tree with priorities; progress is fetched for on-screen rows only
+        self.file_view = FileView(session)
+        files_expander = Gtk.Expander(label="Files")
+        files_expander.set_child(self.file_view)
+        self.append(files_expander)
 
     def set_torrent(self, torrent_model):
         """Sets the torrent model and connects its properties to the detail panel."""
@@ -70,8 +117,14 @@ class TorrentDetailPanel(Gtk.Box):
         if self._current_torrent and self._peer_conn_id:
             self._current_torrent.disconnect(self._peer_conn_id)
             self._peer_conn_id = None
+        for conn_id in self._tracker_conn_ids:
+            self._current_torrent.disconnect(conn_id)
+        self._tracker_conn_ids = []
 
         self._current_torrent = torrent_model
+        self.torrent_graph.set_history(torrent_model.history if torrent_model else None, history_slot())
+        self.peer_list.set_torrent(torrent_model)
+        self.file_view.set_torrent(torrent_model)
         
         if torrent_model:
             # 2. PEERS: Manual connection (required for the clip fix)
@@ -82,23 +135,38 @@ class TorrentDetailPanel(Gtk.Box):
             self._peer_conn_id = torrent_model.connect("notify::num-peers", update_peers_markup)
             update_peers_markup(torrent_model, None)
             
-            # 3. TRACKERS & DHT: Use standard bind_property, but return markup string
-            
-            # Trackers
-            torrent_model.bind_property(
-                "num_trackers", self.tracker_count_label, "label", 
-                GObject.BindingFlags.DEFAULT, 
-                # 💡 Apply Pango size fix via the binding lambda
-                lambda p, v: f"<span size='small'>Trackers: {v}</span>")
-            
-            # DHT Nodes
-            torrent_model.bind_property(
-                "dht_nodes", self.dht_nodes_label, "label", 
-                GObject.BindingFlags.DEFAULT, 
-                # 💡 Apply Pango size fix via the binding lambda
-                lambda p, v: f"<span size='small'>DHT Nodes: {v}</span>")
+            # 3. TRACKERS: Summary from the session's tracker cache (alert driven)
+            self._tracker_conn_ids = [
+                torrent_model.connect(f"notify::{prop}", self._update_trackers_markup)
+                for prop in ("num-trackers", "trackers-working", "trackers-failing", "last-announce")
+            ]
+            self._update_trackers_markup(torrent_model, None)
         else:
             # 4. Clear display
             self.peer_count_label.set_markup(f"<span size='small'>Peers: --</span>")
             self.tracker_count_label.set_markup(f"<span size='small'>Trackers: --</span>")
-            self.dht_nodes_label.set_markup(f"<span size='small'>DHT Nodes: --</span>")
\ No newline at end of file
+
+    def _update_trackers_markup(self, torrent_model, pspec):
+        text = f"Trackers: {torrent_model.trackers_working}/{torrent_model.num_trackers} working"
+        if torrent_model.trackers_failing:
+            text += f", {torrent_model.trackers_failing} failing"
+        if torrent_model.last_announce:
+            ago = int(time.time() - torrent_model.last_announce)
+            text += f" (announced {ago}s ago)"
+        self.tracker_count_label.set_markup(f"<span size='small'>{text}</span>")
+
+    def set_session_stats(self, snapshot):
+        """Shows the session-wide SessionSnapshot (DHT, total rates, disk queue)."""
+        self.dht_nodes_label.set_markup(f"<span size='small'>DHT Nodes: {snapshot.dht_nodes}</span>")
+        self.session_rate_label.set_markup(
+            f"<span size='small'>Total: D:{snapshot.download_rate/1024:.1f} KB/s"
+            f" | U:{snapshot.upload_rate/1024:.1f} KB/s</span>")
+        self.disk_queue_label.set_markup(
+            f"<span size='small'>Disk queue: {snapshot.disk_queued_jobs} jobs</span>")
+
+        # Session stats arrive once per tick, which makes them the graphs' clock
+        slot = history_slot()
+        self.session_history.record(slot, snapshot.download_rate, snapshot.upload_rate)
+        self.session_graph.push(slot)
+        self.torrent_graph.push(slot)
+        return False
\ No newline at end of file
@@ -11,23 +11,69 @@
     #GNU General Public License for more details.
 import gi
 gi.require_version("Gtk", "4.0")
-from gi.repository import Gtk, Gio, GObject
+from gi.repository import Gtk, GObject
 
 from CascadeRT.core.model import TorrentModel
+from CascadeRT.ui.list_data import TorrentListData
+from CascadeRT.ui.session_calls import call_session
 
+# Rows re-announced one by one per batch; past this, one full re-sort is cheaper
+# than that many items_changed calls (each costs the sort model O(n))
+RESORT_ROWS_MAX = 32
+
+# (label, TorrentModel property, sorter kind); numeric keys default to largest first
+SORT_KEYS = (
+    ("Added", "added_time", "numeric"),
+    ("Queue", "queue_position", "numeric"),
+    ("Name", "name", "string"),
+    ("Download rate", "download_rate", "numeric"),
+    ("Upload rate", "upload_rate", "numeric"),
+    ("Progress", "progress", "numeric"),
+    ("ETA", "eta_seconds", "numeric"),
+    ("Size", "total_size", "numeric"),
+)
+
+# (label, TorrentModel.state value or None for everything)
+STATE_FILTERS = (
+    ("All", None),
+    ("Downloading", "downloading"),
+    ("Seeding", "seeding"),
+    ("Queued", "queued"),
+    ("Paused", "paused"),
+    ("Checking", "checking"),
+    ("Fetching metadata", "metadata"),
+)
 
 class TorrentList(Gtk.Box):
     def __init__(self, session):
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
         self.session = session
-        self.store = Gio.ListStore(item_type=TorrentModel)
+        # Store, registry, status table and the batching that feeds them (no widgets)
+        self.data = TorrentListData(on_resort=self._on_rows_moved,
+                                    on_summary=lambda text: self.summary.set_text(text))
+        self.store = self.data.store
+        self.registry = self.data.registry
+        self._selected = None
 
         factory = Gtk.SignalListItemFactory()
         factory.connect("setup", self._setup_item)
         factory.connect("bind", self._bind_item)
+        factory.connect("unbind", self._unbind_item)
+
+        # store -> sort -> filter -> selection. Both wrappers are incremental, so
+        # large batches are sorted and filtered across several main-loop iterations.
+        self._sort_key = SORT_KEYS[0]
+        self._state_filter = None
+        self._search = ""
+        self.sorter = self._make_sorter(self._sort_key, descending=False)
+        self.sort_model = Gtk.SortListModel(model=self.store, sorter=self.sorter, incremental=True)
+        self.filter = Gtk.CustomFilter.new(self._filter_func)
+        self.filter_model = Gtk.FilterListModel(model=self.sort_model, filter=self.filter, incremental=True)
+        self.toolbar = self._build_toolbar()
+        self._update_row_keys()
 
         # 💡 CHANGE: Use Gtk.SingleSelection to track one selected item
-        selection_model = Gtk.SingleSelection(model=self.store)
+        selection_model = Gtk.SingleSelection(model=self.filter_model)
         self.view = Gtk.ListView(model=selection_model, factory=factory)
         
         # 💡 NEW: Connect selection change signal
@@ -43,6 +89,13 @@ class TorrentList(Gtk.Box):
     # 💡 NEW: Method to handle when the selection model changes
     def _on_selection_changed(self, selection_model, pspec):
         selected_item = selection_model.get_selected_item()
+        # The detail panel follows the selection even when it is scrolled off screen
+        if self._selected is not None and not self._selected.bound:
+            self.data.shown.discard(self._selected)
+        self._selected = selected_item
+        self.data.set_selected_key(selected_item.key if selected_item is not None else None)
+        if selected_item is not None:
+            self.data.show(selected_item)
         # Emit a signal that MainWindow can listen to
         self.emit("torrent-selected", selected_item)
         
@@ -52,96 +105,247 @@ class TorrentList(Gtk.Box):
         'torrent-selected': (GObject.SIGNAL_RUN_LAST, GObject.TYPE_NONE, (TorrentModel,)),
     }
 
-    def add_torrent(self, handle):
-        model = TorrentModel(handle)
-        self.store.append(model)
-        return model
+    def _build_toolbar(self):
+        toolbar = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+
+        search = Gtk.SearchEntry(placeholder_text="Filter by name", hexpand=True)
+        search.connect("search-changed", self._on_search_changed)
+
+        state_dropdown = Gtk.DropDown.new_from_strings([label for label, _ in STATE_FILTERS])
+        state_dropdown.connect("notify::selected", self._on_state_filter_changed)
+
+        sort_dropdown = Gtk.DropDown.new_from_strings([label for label, _, _ in SORT_KEYS])
+        sort_dropdown.connect("notify::selected", self._on_sort_changed)
+        self._descending = Gtk.ToggleButton(icon_name="view-sort-descending-symbolic",
+                                            tooltip_text="Descending")
+        self._descending.connect("toggled", self._on_sort_changed)
+        self._sort_dropdown = sort_dropdown
+
+        # Library-wide counts and ETA, aggregated from the status table every flush
+        self.summary = Gtk.Label(xalign=1)
+
+        toolbar.append(search)
+        toolbar.append(state_dropdown)
+        toolbar.append(sort_dropdown)
+        toolbar.append(self._descending)
+        toolbar.append(self.summary)
+        return toolbar
+
+    def _make_sorter(self, sort_key, descending):
+        _, prop, kind = sort_key
+        expression = Gtk.PropertyExpression.new(TorrentModel, None, prop.replace("_", "-"))
+        if kind == "string":
+            sorter = Gtk.StringSorter(expression=expression, ignore_case=True)
+            # StringSorter has no sort order; descending is handled by a reversing wrapper
+            if descending:
+                return Gtk.CustomSorter.new(lambda a, b, _: -int(sorter.compare(a, b)), None)
+            return sorter
+        order = Gtk.SortType.DESCENDING if descending else Gtk.SortType.ASCENDING
+        return Gtk.NumericSorter(expression=expression, sort_order=order)
+
+    def _on_sort_changed(self, *args):
+        self._sort_key = SORT_KEYS[self._sort_dropdown.get_selected()]
+        self._update_row_keys()
+        # Rows off screen only carry the old sort key; bring the new one up to date first
+        props = {self._sort_key[1]}
+        for entry in self.registry.entries():
+            entry.model.sync(self.data.table, props)
+        self.sorter = self._make_sorter(self._sort_key, self._descending.get_active())
+        self.sort_model.set_sorter(self.sorter)
+
+    def _on_state_filter_changed(self, dropdown, pspec):
+        self._state_filter = STATE_FILTERS[dropdown.get_selected()][1]
+        self._update_row_keys()
+        self.filter.changed(Gtk.FilterChange.DIFFERENT)
+
+    def _on_search_changed(self, entry):
+        text = entry.get_text().strip().lower()
+        old, self._search = self._search, text
+        self._update_row_keys()
+        # Tell the filter model which rows can possibly change so it only
+        # re-checks the currently visible (or currently hidden) ones.
+        if old in text:
+            change = Gtk.FilterChange.MORE_STRICT
+        elif text in old:
+            change = Gtk.FilterChange.LESS_STRICT
+        else:
+            change = Gtk.FilterChange.DIFFERENT
+        self.filter.changed(change)
+
+    def _filter_func(self, model):
+        if self._state_filter is not None and model.state != self._state_filter:
+            return False
+        # name_lower is kept by the model itself, so typing costs one substring test per row
+        return not self._search or self._search in model.name_lower
+
+    def _on_rows_moved(self, positions):
+        # Rows whose sort key, state or name changed in one batch
+        if len(positions) <= RESORT_ROWS_MAX:
+            for position in positions:
+                self.store.items_changed(position, 1, 1)
+            return
+        self.sorter.changed(Gtk.SorterChange.DIFFERENT)
+        if self._state_filter is not None or self._search:
+            self.filter.changed(Gtk.FilterChange.DIFFERENT)
+
+    def _update_row_keys(self):
+        """Tells the data path which model properties sorting and filtering read."""
+        keys = {self._sort_key[1]}
+        if self._state_filter is not None:
+            keys.add("state")
+        if self._search:
+            keys.add("name")
+        self.data.resort_keys = keys
+        self.data.row_props = {self._sort_key[1], "state", "name"}
+
+    def queue_added(self, added):
+        """Queues [(info-hash, name, paused), ...] from any thread for insertion."""
+        self.data.queue_added(added)
+
+    def queue_removed(self, keys):
+        """Queues removed info-hashes from any thread."""
+        self.data.queue_removed(keys)
+
+    def queue_statuses(self, statuses):
+        """Queues a {info-hash: status} batch from any thread; see TorrentListData.queue_statuses."""
+        self.data.queue_statuses(statuses)
+
+    def queue_trackers(self, summaries):
+        """Queues {info-hash: TrackerSummary} from any thread."""
+        self.data.queue_trackers(summaries)
+
+    def set_refresh_interval(self, seconds):
+        """Pushes statuses every batch (0), every `seconds`, or not at all (None)."""
+        self.data.set_refresh_interval(seconds)
+
+    def get_model(self, key):
+        return self.data.get_model(key)
 
     def _setup_item(self, factory, list_item):
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=3)
+        # Widgets and button handlers are created once per recycled list item
+        list_item.set_child(TorrentRow(self.session))
 
-        name_label = Gtk.Label(xalign=0)
-        progress = Gtk.ProgressBar()
-        info_label = Gtk.Label(xalign=0)
+    def _bind_item(self, factory, list_item):
+        model = list_item.get_item()
+        model.bound = True
+        self.data.show(model)
+        list_item.get_child().bind(model)
+
+    def _unbind_item(self, factory, list_item):
+        model = list_item.get_item()
+        list_item.get_child().unbind()
+        model.bound = False
+        if model is not self._selected:
+            self.data.shown.discard(model)
+
+
+class TorrentRow(Gtk.Box):
+    """One list row. Owns the bindings to whichever TorrentModel it currently shows.
+
+    Gtk.ListView recycles rows while scrolling, so bind() and unbind() must be
+    symmetric: everything connected in bind() is released in unbind(), and the
+    buttons act on the row's current torrent rather than capturing one.
+    """
+
+    def __init__(self, session):
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=3)
+        self.session = session
+        self._torrent = None
+        self._bindings = []
+        self._handler_ids = []
+
+        self._name = Gtk.Label(xalign=0)
+        self._progress = Gtk.ProgressBar()
+        self._info = Gtk.Label(xalign=0)
 
         # Row for control buttons
         button_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=3)
         pause_btn = Gtk.Button(label="⏸ Pause")
         resume_btn = Gtk.Button(label="▶ Resume")
         remove_btn = Gtk.Button(label="✖ Remove")
+        pause_btn.connect("clicked", self._on_pause)
+        resume_btn.connect("clicked", self._on_resume)
+        remove_btn.connect("clicked", self._on_remove)
 
         button_row.append(pause_btn)
         button_row.append(resume_btn)
         button_row.append(remove_btn)
 
-        box.append(name_label)
-        box.append(progress)
-        box.append(info_label)
-        box.append(button_row)
-
-        list_item.set_child(box)
+        # Queue controls: the new order shows up through queue_position in the next status batch
+        for icon, direction, tooltip in (("go-top-symbolic", "top", "Move to top of queue"),
+                                         ("go-up-symbolic", "up", "Move up in queue"),
+                                         ("go-down-symbolic", "down", "Move down in queue"),
+                                         ("go-bottom-symbolic", "bottom", "Move to bottom of queue")):
+            queue_btn = Gtk.Button(icon_name=icon, tooltip_text=tooltip)
+            queue_btn.connect("clicked", self._on_queue_move, direction)
+            button_row.append(queue_btn)
+        self._queue_label = Gtk.Label(xalign=0)
+        button_row.append(self._queue_label)
 
-        # Store references in the list_item
-        list_item._name = name_label
-        list_item._progress = progress
-        list_item._info = info_label
-        list_item._pause_btn = pause_btn
-        list_item._resume_btn = resume_btn
-        list_item._remove_btn = remove_btn
+        self.append(self._name)
+        self.append(self._progress)
+        self.append(self._info)
+        self.append(button_row)
 
-    def _bind_item(self, factory, list_item):
-        torrent = list_item.get_item()
+    def bind(self, torrent):
+        self.unbind()
+        self._torrent = torrent
 
         # 💡 NEW: Use GObject.Binding for automatic, continuous updates.
+        self._bindings = [
+            torrent.bind_property("name", self._name, "label", GObject.BindingFlags.SYNC_CREATE),
+            torrent.bind_property("progress", self._progress, "fraction", GObject.BindingFlags.SYNC_CREATE),
+            torrent.bind_property("queue-position", self._queue_label, "label",
+                                  GObject.BindingFlags.SYNC_CREATE,
+                                  lambda binding, position: f"#{position + 1}" if position >= 0 else ""),
+        ]
 
-        # 1. Bind Name to Label
-        torrent.bind_property("name", list_item._name, "label", GObject.BindingFlags.DEFAULT)
-        
-        # 2. Bind Progress to ProgressBar fraction
-        torrent.bind_property("progress", list_item._progress, "fraction", GObject.BindingFlags.DEFAULT)
-
-        # 3. Bind Info Label: Requires a custom function as it uses multiple properties (rate/eta).
-        def update_info_label(model, pspec=None):
-            d_rate = model.download_rate
-            u_rate = model.upload_rate
-            eta = model.eta
-            
-            list_item._info.set_text(
-                # 💡 NEW FORMAT: Display Download (D) and Upload (U) rates, then ETA.
-                f"D:{d_rate/1024:.1f} KB/s | U:{u_rate/1024:.1f} KB/s • {eta}"
-            )
-
-        # Connect the custom function to the property change signals
-        # We need to store these connections so they aren't garbage collected
-        list_item._connections = [
-            torrent.connect("notify::download-rate", update_info_label),
-            torrent.connect("notify::eta", update_info_label),
-            torrent.connect("notify::upload-rate", update_info_label)
+        # Info label combines several properties (rate/eta)
+        self._handler_ids = [
+            torrent.connect("notify::download-rate", self._update_info_label),
+            torrent.connect("notify::eta", self._update_info_label),
+            torrent.connect("notify::upload-rate", self._update_info_label),
         ]
-        
-        # Call initially to set the text
-        update_info_label(torrent) 
-
-        def on_pause(btn):
-            torrent.handle.pause()
-            # 💡 Instant UI update: set the model property directly.
-            # This triggers the GObject binding immediately.
-            torrent.paused = True 
-
-        def on_resume(btn):
-            torrent.handle.resume()
-            # 💡 Instant UI update
-            torrent.paused = False
-
-        def on_remove(btn):
-            # This logic assumes you made the structural fix in the previous step
-            # where the session object was passed to TorrentList.__init__
-            self.session.remove_torrent(torrent.handle) 
-            found, index = self.store.find(torrent) 
-            if found:
-                self.store.remove(index)
-
-        list_item._pause_btn.connect("clicked", on_pause)
-        list_item._resume_btn.connect("clicked", on_resume)
-        list_item._remove_btn.connect("clicked", on_remove)
+        self._update_info_label(torrent)
+
+    def unbind(self):
+        for binding in self._bindings:
+            binding.unbind()
+        self._bindings = []
+
+        if self._torrent is not None:
+            for handler_id in self._handler_ids:
+                self._torrent.disconnect(handler_id)
+        self._handler_ids = []
+        self._torrent = None
+
+    def _update_info_label(self, model, pspec=None):
+        # 💡 NEW FORMAT: Display Download (D) and Upload (U) rates, then ETA.
+        self._info.set_text(
+            f"D:{model.download_rate/1024:.1f} KB/s | U:{model.upload_rate/1024:.1f} KB/s • {model.eta}"
+        )
+
+    def _on_pause(self, btn):
+        if self._torrent is None:
+            return
+        call_session(self.session.pause_torrent, self._torrent.key)
+        # 💡 Instant UI update: set the model property directly.
+        self._torrent.paused = True
+
+    def _on_resume(self, btn):
+        if self._torrent is None:
+            return
+        call_session(self.session.resume_torrent, self._torrent.key)
+        # 💡 Instant UI update
+        self._torrent.paused = False
+
+    def _on_queue_move(self, btn, direction):
+        if self._torrent is None:
+            return
+        call_session(self.session.move_queue, self._torrent.key, direction)
 
+    def _on_remove(self, btn):
+        if self._torrent is None:
+            return
+        # The row goes away when the session reports the removal (see remove_torrents)
+        call_session(self.session.remove_torrent, self._torrent.key)
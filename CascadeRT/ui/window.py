@@ -16,16 +16,20 @@ from gi.repository import Gtk, Gio, GLib
 from pathlib import Path
 
 from CascadeRT.core.session import TorrentSession
+from CascadeRT.ui.bandwidth_bar import BandwidthBar
+from CascadeRT.ui.refresh import RefreshScheduler
+from CascadeRT.ui.session_calls import call_session
 from CascadeRT.ui.torrent_list import TorrentList
 
 
 class MainWindow(Gtk.ApplicationWindow):
-    def __init__(self, app):
+    def __init__(self, app, session=None):
         super().__init__(application=app)
         self.set_title("CascadeRT")
         self.set_default_size(900, 550)
 
-        self.session = TorrentSession()
+        # Either an embedded engine or a RemoteSession attached to a running daemon
+        self.session = session if session is not None else TorrentSession()
 
         self.connect("close-request", self.on_close_request)
 
@@ -58,6 +62,18 @@ class MainWindow(Gtk.ApplicationWindow):
         path_row.append(self.path_label)
         path_row.append(choose_btn)
 
+        # 💡 Performance profile selector (applied live through apply_settings)
+        # Filled in once the session answers (see _show_profiles)
+        self._profiles = []
+        self.profile_dropdown = Gtk.DropDown.new_from_strings([])
+        self.profile_dropdown.set_sensitive(False)
+        self.profile_dropdown.set_hexpand(True)
+        self.profile_dropdown.set_halign(Gtk.Align.END)
+        self.profile_dropdown.connect("notify::selected", self.on_profile_selected)
+        path_row.append(Gtk.Label(label="Profile:"))
+        path_row.append(self.profile_dropdown)
+        call_session(self.session.list_profiles, on_done=self._show_profiles)
+
         box.append(path_row)
 
         # Magnet entry
@@ -66,9 +82,16 @@ class MainWindow(Gtk.ApplicationWindow):
         box.append(self.entry)
 
         # Add torrent button
+        add_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
         button = Gtk.Button(label="Add Torrent")
+        button.set_hexpand(True)
         button.connect("clicked", self.on_add_clicked)
-        box.append(button)
+        # Bulk import: many .torrent files / magnet lists, parsed off the main thread
+        import_btn = Gtk.Button(label="Import Files…")
+        import_btn.connect("clicked", self.on_import_clicked)
+        add_row.append(button)
+        add_row.append(import_btn)
+        box.append(add_row)
 
         # Torrent list view
         # 💡 Change 1: Pass the session object to the TorrentList
@@ -80,19 +103,42 @@ class MainWindow(Gtk.ApplicationWindow):
         scrolled_list.set_child(self.list.view)
         # 💡 FIX: Ensure the ScrolledWindow expands to take up vertical space
         scrolled_list.set_vexpand(True)
+        box.append(self.list.toolbar)
         box.append(scrolled_list)
 
         # 💡 NEW: Detail Panel for selected torrent stats
         from CascadeRT.ui.torrent_detail import TorrentDetailPanel
-        self.detail_panel = TorrentDetailPanel()
+        self.detail_panel = TorrentDetailPanel(self.session)
         box.append(self.detail_panel)
 
-        # 💡 Load saved state after the UI list view is initialized
-        self.session.load_state(self.list)
+        # 💡 Global / per-torrent rate limits (schedule changes arrive via subscribe_limits)
+        self.bandwidth_bar = BandwidthBar(self.session)
+        box.append(self.bandwidth_bar)
+
+        # 💡 One status batch per tick for the whole library, applied in a single main-loop hop
+        self.session.subscribe_status(self._on_status_batch)
+        self.session.subscribe_added(self.list.queue_added)
+        self.session.subscribe_trackers(self.list.queue_trackers)
+        self.session.subscribe_removed(self.list.queue_removed)
+        self.session.subscribe_stats(
+            lambda snapshot: GLib.idle_add(self.detail_panel.set_session_stats, snapshot))
+        self.session.subscribe_limits(
+            lambda limits: GLib.idle_add(self.bandwidth_bar.set_limits, limits))
+        self.session.start_status_pump()
+
+        # 💡 Slower status ticks while unfocused, none pushed to GTK while hidden or minimized
+        self.refresh = RefreshScheduler(self, self.list, self.session)
+
+        # 💡 Load saved state in the background; rows stream in while the window is already up
+        self.session.load_state()
+        self.session.start_watch_folder()
+        self.session.start_metrics_server()
 
         # 💡 NEW: Connect the TorrentList signal to the Detail Panel setter
         self.list.connect("torrent-selected", 
                           lambda list_view, torrent: self.detail_panel.set_torrent(torrent))
+        self.list.connect("torrent-selected",
+                          lambda list_view, torrent: self.bandwidth_bar.set_torrent(torrent))
 
 
     #
@@ -116,6 +162,24 @@ class MainWindow(Gtk.ApplicationWindow):
         except Exception as e:
             print("Folder selection error:", e)
 
+    #
+    # PERFORMANCE PROFILE
+    #
+    def _show_profiles(self, result):
+        active_profile, profiles = result
+        self._profiles = []
+        # Filling the list moves the selection; only the user's picks apply a profile
+        self.profile_dropdown.set_model(Gtk.StringList.new(profiles))
+        self.profile_dropdown.set_selected(profiles.index(active_profile))
+        self._profiles = profiles
+        self.profile_dropdown.set_sensitive(True)
+
+    def on_profile_selected(self, dropdown, pspec):
+        if not self._profiles:
+            return
+        name = self._profiles[dropdown.get_selected()]
+        call_session(self.session.apply_profile, name)
+
     #
     # ADD TORRENT
     #
@@ -125,21 +189,34 @@ class MainWindow(Gtk.ApplicationWindow):
         if not source:
             return
 
-        # Add torrent (magnet or .torrent) to session
-        # The handle for a .torrent file will now have the name immediately
-        handle = self.session.add_torrent(source, self.download_path)
-
-        # Add corresponding UI model row
-        torrent_row = self.list.add_torrent(handle)
+        # Add torrent(s) to session: several magnets may be pasted at once,
+        # anything else is a single .torrent path (which may contain spaces).
+        # The row is inserted once libtorrent confirms the add (see subscribe_added)
+        sources = source.split() if source.startswith("magnet:") else [source]
+        call_session(self.session.import_sources, sources, self.download_path)
+        self.entry.set_text("")
 
-        # Periodic updater
-        def on_update(h, status):
+    def on_import_clicked(self, button):
+        dialog = Gtk.FileDialog()
+        dialog.set_title("Import Torrents")
+        dialog.open_multiple(self, None, self._on_import_selected)
 
-            dht_count = self.session.get_dht_node_count()
+    def _on_import_selected(self, dialog, result):
+        try:
+            files = dialog.open_multiple_finish(result)
+        except Exception as e:
+            print("Import selection error:", e)
+            return
+        if files is None:
+            return
 
-            GLib.idle_add(torrent_row.update, status, dht_count)
+        paths = [files.get_item(i).get_path() for i in range(files.get_n_items())]
+        call_session(self.session.import_sources, paths, self.download_path)
 
-        self.session.start_background_loop(handle, on_update)
+    def _on_status_batch(self, statuses):
+        # Runs on the pump thread: let the list coalesce the batch into a single
+        # main-loop callback.
+        self.list.queue_statuses(statuses)
 
     # Add a handler for the window being destroyed
     def do_close(self):
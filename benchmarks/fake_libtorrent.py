@@ -0,0 +1,496 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+"""Stand-in for the libtorrent bindings: synthetic handles and alerts, no network or disk I/O.
+
+Covers exactly the API surface CascadeRT uses. install() puts it in
+sys.modules["libtorrent"] so it must run before anything from CascadeRT.core
+is imported. Every tick, post_torrent_updates() reports a CHURN fraction of
+the torrents as changed, the way a busy real session would.
+"""
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+
+# Fraction of torrents whose status changes between two post_torrent_updates() calls
+CHURN = 0.1
+
+_rng = random.Random(1234)
+
+
+def install():
+    sys.modules["libtorrent"] = sys.modules[__name__]
+
+
+# --- constants and enums ---
+
+class _Enum:
+    def __init__(self, **members):
+        for name, value in members.items():
+            setattr(self, name, value)
+
+
+class _State:
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+
+alert = SimpleNamespace(category_t=_Enum(error_notification=1, status_notification=2,
+                                          storage_notification=4, tracker_notification=8))
+torrent_flags = _Enum(paused=1 << 0, auto_managed=1 << 1)
+options_t = _Enum(delete_files=1)
+storage_mode_t = _Enum(storage_mode_sparse=1, storage_mode_allocate=0)
+metric_type_t = _Enum(counter=0, gauge=1)
+choking_algorithm_t = _Enum(fixed_slots_choker=0, rate_based_choker=2)
+seed_choking_algorithm_t = _Enum(round_robin=0, fastest_upload=1, anti_leech=2)
+bandwidth_mixed_algo_t = _Enum(prefer_tcp=0, peer_proportional=1)
+
+STATES = {name: _State(name) for name in ("checking_files", "downloading_metadata", "downloading",
+                                           "finished", "seeding", "checking_resume_data")}
+
+_SETTING_NAMES = (
+    "listen_interfaces", "enable_dht", "enable_lsd", "enable_upnp", "enable_natpmp",
+    "active_downloads", "active_seeds", "active_limit", "dont_count_slow_torrents",
+    "connections_limit", "unchoke_slots_limit", "choking_algorithm", "seed_choking_algorithm",
+    "send_buffer_watermark", "send_buffer_low_watermark", "send_buffer_watermark_factor",
+    "send_socket_buffer_size", "recv_socket_buffer_size", "aio_threads", "hashing_threads",
+    "max_queued_disk_bytes", "file_pool_size", "listen_queue_size", "max_out_request_queue",
+    "max_allowed_in_request_queue", "mixed_mode_algorithm", "max_peerlist_size",
+    "max_paused_peerlist_size", "alert_mask", "alert_queue_size", "download_rate_limit",
+    "upload_rate_limit",
+)
+
+
+def default_settings():
+    return {name: 0 for name in _SETTING_NAMES}
+
+
+_METRICS = (
+    ("dht.dht_nodes", metric_type_t.gauge),
+    ("peer.num_peers_connected", metric_type_t.gauge),
+    ("net.recv_payload_bytes", metric_type_t.counter),
+    ("net.sent_payload_bytes", metric_type_t.counter),
+    ("disk.queued_disk_jobs", metric_type_t.gauge),
+    ("disk.queued_write_bytes", metric_type_t.gauge),
+)
+
+
+def session_stats_metrics():
+    return [SimpleNamespace(name=name, value_index=i, type=kind) for i, (name, kind) in enumerate(_METRICS)]
+
+
+class ip_filter:
+    def __init__(self):
+        self.rules = []
+
+    def add_rule(self, first, last, flags):
+        self.rules.append((first, last, flags))
+
+
+# --- torrents ---
+
+class info_hash_t:
+    def __init__(self, hex_hash, v2=None):
+        self.v1 = hex_hash
+        self.v2 = v2
+
+    def get_best(self):
+        return self.v2 or self.v1
+
+    def has_v1(self):
+        return True
+
+    def has_v2(self):
+        return self.v2 is not None
+
+
+def fake_info_hash(i):
+    return hashlib.sha1(f"cascadert-bench-{i}".encode()).hexdigest()
+
+
+class add_torrent_params:
+    def __init__(self):
+        self.ti = None
+        self.name = ""
+        self.flags = 0
+        self.save_path = ""
+        self.storage_mode = storage_mode_t.storage_mode_sparse
+        self.info_hashes = None
+        self.download_limit = -1
+        self.upload_limit = -1
+        self.total_wanted = 0
+        self.have_pieces = []
+        self.added_time = 0
+
+    @property
+    def info_hash(self):
+        return self.info_hashes.v1 if self.info_hashes is not None else None
+
+
+class torrent_info:
+    """Metadata from a bdecoded dict or a .torrent path holding one.
+
+    The dict has "info_hash", "name", "total_size" and, for hybrid torrents, "info_hash_v2".
+    """
+
+    def __init__(self, source):
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                source = bdecode(f.read())
+        if not isinstance(source, dict):
+            raise RuntimeError("invalid torrent metadata")
+        self._source = source
+        self._hashes = info_hash_t(source["info_hash"], source.get("info_hash_v2"))
+        self._name = source.get("name", "")
+        self._total_size = source.get("total_size", 0)
+
+    def info_hashes(self):
+        return self._hashes
+
+    def name(self):
+        return self._name
+
+    def total_size(self):
+        return self._total_size
+
+    def piece_length(self):
+        return 16 * 1024
+
+
+class create_torrent:
+    def __init__(self, info):
+        self._info = info
+
+    def generate(self):
+        return dict(self._info._source)
+
+
+def bencode(obj):
+    return json.dumps(obj).encode()
+
+
+def bdecode(data):
+    # Like the real bindings: None rather than an exception for malformed input
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
+
+
+def parse_magnet_uri(uri):
+    query = parse_qs(urlparse(uri).query)
+    params = add_torrent_params()
+    params.info_hashes = info_hash_t(query["xt"][0].rsplit(":", 1)[-1].lower())
+    params.name = query.get("dn", [""])[0]
+    return params
+
+
+def write_resume_data_buf(params):
+    return json.dumps({
+        "info_hash": params.info_hashes.v1,
+        "name": params.name,
+        "flags": params.flags,
+        "save_path": params.save_path,
+        "total_wanted": params.total_wanted,
+        "added_time": params.added_time,
+        "download_limit": params.download_limit,
+        "upload_limit": params.upload_limit,
+    }).encode()
+
+
+def read_resume_data(data):
+    fields = json.loads(data)
+    params = add_torrent_params()
+    params.info_hashes = info_hash_t(fields["info_hash"])
+    params.name = fields["name"]
+    params.flags = fields["flags"]
+    params.save_path = fields["save_path"]
+    params.total_wanted = fields.get("total_wanted", 0)
+    params.added_time = fields.get("added_time", 0)
+    params.download_limit = fields.get("download_limit", -1)
+    params.upload_limit = fields.get("upload_limit", -1)
+    return params
+
+
+def make_params(i, paused=False):
+    """Synthetic params for torrent number i, as read from a resume file."""
+    params = add_torrent_params()
+    params.info_hashes = info_hash_t(fake_info_hash(i))
+    params.name = f"Synthetic torrent {i:05d}"
+    params.flags = torrent_flags.paused if paused else torrent_flags.auto_managed
+    params.save_path = "/tmp/cascadert-bench"
+    params.total_wanted = _rng.randint(1, 50) * 1024 * 1024 * 64
+    return params
+
+
+class torrent_status:
+    def __init__(self, handle):
+        self.handle = handle
+        self.info_hashes = handle._hashes
+        self.name = handle._params.name
+        self.has_metadata = True
+        self.total_wanted = handle._params.total_wanted
+        self.total_done = 0
+        self.progress = 0.0
+        self.num_peers = 0
+        self.download_rate = 0
+        self.upload_rate = 0
+        self.added_time = int(time.time())
+        self.queue_position = -1
+        self.state = STATES["downloading"]
+        self.need_save_resume = False
+
+    @property
+    def paused(self):
+        return bool(self.handle._flags & torrent_flags.paused)
+
+    @property
+    def auto_managed(self):
+        return bool(self.handle._flags & torrent_flags.auto_managed)
+
+    def advance(self):
+        if self.paused:
+            return
+        self.download_rate = _rng.randint(0, 4 * 1024 * 1024)
+        self.upload_rate = _rng.randint(0, 512 * 1024)
+        self.num_peers = _rng.randint(0, 80)
+        self.total_done = min(self.total_wanted, self.total_done + self.download_rate)
+        self.progress = self.total_done / self.total_wanted if self.total_wanted else 1.0
+        if self.progress >= 1.0:
+            self.state = STATES["seeding"]
+        self.need_save_resume = True
+
+
+class torrent_handle:
+    save_info_dict = 1
+
+    def __init__(self, session, params):
+        self._session = session
+        if params.ti is not None:
+            # Like libtorrent: an add with metadata takes its hashes, name and size from it
+            params.info_hashes = params.ti.info_hashes()
+            params.name = params.name or params.ti.name()
+            params.total_wanted = params.total_wanted or params.ti.total_size()
+        self._params = params
+        self._hashes = params.info_hashes
+        self._flags = params.flags
+        self._valid = True
+        self._status = torrent_status(self)
+
+    def is_valid(self):
+        return self._valid
+
+    def info_hashes(self):
+        return self._hashes
+
+    def status(self):
+        return self._status
+
+    def torrent_file(self):
+        return self._params.ti
+
+    def trackers(self):
+        return [{"url": "udp://tracker.invalid:1337/announce"}]
+
+    def need_save_resume_data(self):
+        return self._status.need_save_resume
+
+    def save_resume_data(self, flags=0):
+        self._status.need_save_resume = False
+        params = self._params
+        params.flags = self._flags
+        self._session._post(save_resume_data_alert(self, params))
+
+    def pause(self):
+        self._flags |= torrent_flags.paused
+
+    def resume(self):
+        self._flags &= ~torrent_flags.paused
+
+    def set_flags(self, flags):
+        self._flags |= flags
+
+    def unset_flags(self, flags):
+        self._flags &= ~flags
+
+    def set_download_limit(self, limit):
+        self._params.download_limit = limit
+
+    def set_upload_limit(self, limit):
+        self._params.upload_limit = limit
+
+    def download_limit(self):
+        return self._params.download_limit
+
+    def upload_limit(self):
+        return self._params.upload_limit
+
+    def queue_position_up(self):
+        pass
+
+    queue_position_down = queue_position_top = queue_position_bottom = queue_position_up
+
+
+# --- alerts ---
+
+class _Error:
+    def value(self):
+        return 0
+
+
+class _Alert:
+    def message(self):
+        return type(self).__name__
+
+
+class add_torrent_alert(_Alert):
+    def __init__(self, handle, params):
+        self.handle = handle
+        self.params = params
+        self.error = _Error()
+
+
+class state_update_alert(_Alert):
+    def __init__(self, statuses):
+        self.status = statuses
+
+
+class session_stats_alert(_Alert):
+    def __init__(self, values):
+        self.values = values
+
+
+class save_resume_data_alert(_Alert):
+    def __init__(self, handle, params):
+        self.handle = handle
+        self.params = params
+
+
+class save_resume_data_failed_alert(_Alert):
+    def __init__(self, handle):
+        self.handle = handle
+
+
+class torrent_removed_alert(_Alert):
+    def __init__(self, handle):
+        self.handle = handle
+        self.info_hashes = handle._hashes
+
+
+class metadata_received_alert(_Alert):
+    def __init__(self, handle):
+        self.handle = handle
+
+
+class tracker_announce_alert(_Alert):
+    pass
+
+
+class tracker_reply_alert(_Alert):
+    pass
+
+
+class tracker_error_alert(_Alert):
+    pass
+
+
+# --- session ---
+
+class session:
+    global_peer_class_id = 0
+    tcp_peer_class_id = 1
+    local_peer_class_id = 2
+
+    def __init__(self, settings=None):
+        self.settings = dict(settings or {})
+        self._handles = {}
+        self._new = []
+        self._alerts = deque()
+        self._cond = threading.Condition()
+        self._received = 0
+        self._sent = 0
+
+    def _post(self, alert):
+        with self._cond:
+            self._alerts.append(alert)
+            self._cond.notify()
+
+    def apply_settings(self, settings):
+        self.settings.update(settings)
+
+    def set_peer_class_filter(self, pcf):
+        self.peer_class_filter = pcf
+
+    def async_add_torrent(self, params):
+        handle = torrent_handle(self, params)
+        with self._cond:
+            self._handles[handle._hashes.v1] = handle
+            self._new.append(handle)
+        self._post(add_torrent_alert(handle, params))
+
+    def remove_torrent(self, handle, flags=0):
+        with self._cond:
+            self._handles.pop(handle._hashes.v1, None)
+        handle._valid = False
+        self._post(torrent_removed_alert(handle))
+
+    def get_torrent_status(self, predicate):
+        with self._cond:
+            handles = list(self._handles.values())
+        return [h._status for h in handles if predicate(h._status)]
+
+    def post_torrent_updates(self):
+        with self._cond:
+            handles = list(self._handles.values())
+            new, self._new = self._new, []
+        changed = {id(h): h for h in new}
+        if handles:
+            for h in _rng.sample(handles, max(1, int(len(handles) * CHURN))):
+                h._status.advance()
+                changed[id(h)] = h
+        statuses = [h._status for h in changed.values()]
+        if statuses:
+            self._post(state_update_alert(statuses))
+
+    def post_session_stats(self):
+        with self._cond:
+            handles = list(self._handles.values())
+        self._received += sum(h._status.download_rate for h in handles[:100])
+        self._sent += sum(h._status.upload_rate for h in handles[:100])
+        self._post(session_stats_alert([400, len(handles) * 20, self._received, self._sent, 0, 0]))
+
+    def wait_for_alert(self, timeout_ms):
+        with self._cond:
+            if not self._alerts:
+                self._cond.wait(timeout_ms / 1000)
+            return self._alerts[0] if self._alerts else None
+
+    def pop_alerts(self):
+        with self._cond:
+            alerts = list(self._alerts)
+            self._alerts.clear()
+        return alerts
+
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
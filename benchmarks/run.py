@@ -0,0 +1,233 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+"""Scale benchmark: TorrentSession, TorrentModel.sync and the TorrentList store on fake libtorrent.
+
+    python benchmarks/run.py                          # 100, 1k and 10k torrents
+    python benchmarks/run.py --sizes 1000 --ticks 30 --output before.json
+
+Each size runs in its own subprocess with a throwaway HOME, so peak RSS and
+the config dir belong to that size alone. Without a display the list is
+driven through TorrentListData alone (store, registry, batched inserts,
+queue_statuses and its coalesced flush); run under xvfb-run to include the
+widgets and the sort/filter models.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _summary(values):
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else None,
+        "p50": _percentile(values, 0.50),
+        "p95": _percentile(values, 0.95),
+        "max": max(values) if values else None,
+    }
+
+
+def _seed_resume_files(config_dir, size, lt):
+    resume_dir = config_dir / "resume"
+    resume_dir.mkdir(parents=True)
+    for i in range(size):
+        params = lt.make_params(i, paused=(i % 10 == 0))
+        # Written directly: seeding isn't measured and doesn't need ResumeStore's fsyncs
+        (resume_dir / f"{params.info_hashes.v1}.fastresume").write_bytes(lt.write_resume_data_buf(params))
+
+
+def run_size(size, ticks, tick_interval):
+    """Runs one scale point in this process and returns its results dict."""
+    home = Path(tempfile.mkdtemp(prefix="cascadert-bench-"))
+    os.environ["HOME"] = str(home)
+    sys.path.insert(0, str(REPO_ROOT))
+
+    from benchmarks import fake_libtorrent
+    fake_libtorrent.install()
+    _seed_resume_files(home / ".config" / "CascadeRT", size, fake_libtorrent)
+
+    import gi
+    gi.require_version("Gtk", "4.0")
+    from gi.repository import GLib, Gtk
+
+    from CascadeRT.core.session import TorrentSession
+    from CascadeRT.ui.list_data import TorrentListData
+
+    session = TorrentSession()
+    session.tick_interval = tick_interval
+    # Only the explicit save at the end should write resume data
+    session.checkpoint_interval = 1e9
+
+    widgets = Gtk.init_check()
+    if widgets:
+        from CascadeRT.ui.torrent_list import TorrentList
+        data = TorrentList(session).data
+    else:
+        data = TorrentListData()
+
+    loop = GLib.MainLoop()
+    latencies = []
+    apply_times = []
+    batch_sizes = []
+
+    # When the oldest status in the list's pending batch was queued
+    queued_at = []
+
+    def on_status_batch(statuses):
+        # Pump thread, same hop as MainWindow: queue_statuses coalesces into one flush
+        if not queued_at:
+            queued_at.append(time.perf_counter())
+        data.queue_statuses(statuses)
+
+    flush_pending = data.flush_pending
+
+    def timed_flush():
+        started = time.perf_counter()
+        if queued_at:
+            latencies.append(started - queued_at.pop())
+        batch_sizes.append(data.pending_count())
+        flush_pending()
+        apply_times.append(time.perf_counter() - started)
+        return GLib.SOURCE_REMOVE
+
+    # queue_statuses schedules self.flush_pending, so this instance attribute is what runs
+    data.flush_pending = timed_flush
+    session.subscribe_status(on_status_batch)
+    session.subscribe_added(data.queue_added)
+
+    def run_until(predicate, timeout):
+        deadline = time.monotonic() + timeout
+
+        def check():
+            if predicate() or time.monotonic() >= deadline:
+                loop.quit()
+                return GLib.SOURCE_REMOVE
+            return GLib.SOURCE_CONTINUE
+
+        GLib.timeout_add(5, check)
+        loop.run()
+
+    # --- load_state: resume files -> rows in the store ---
+    started = time.perf_counter()
+    session.start_status_pump()
+    session.load_state()
+    run_until(lambda: data.store.get_n_items() >= size, timeout=max(60, size / 50))
+    load_seconds = time.perf_counter() - started
+    loaded = data.store.get_n_items()
+
+    # --- steady state: status ticks with CHURN of the library changing each tick ---
+    del latencies[:], apply_times[:], batch_sizes[:]
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    run_until(lambda: len(apply_times) >= ticks, timeout=ticks * tick_interval * 10 + 10)
+    cpu_seconds = time.process_time() - cpu_started
+    wall_seconds = time.perf_counter() - wall_started
+    observed_ticks = max(1, len(apply_times))
+
+    # --- save_state via stop(): every torrent that changed gets a resume file ---
+    started = time.perf_counter()
+    report = session.stop()
+    save_seconds = time.perf_counter() - started
+
+    return {
+        "size": size,
+        "widgets": widgets,
+        "loaded": loaded,
+        "load_state_seconds": load_seconds,
+        "ticks": len(apply_times),
+        "tick_interval": tick_interval,
+        "cpu_seconds_per_tick": cpu_seconds / observed_ticks,
+        "cpu_utilisation": cpu_seconds / wall_seconds if wall_seconds else None,
+        "status_batch_size": _summary(batch_sizes),
+        "main_loop_latency_seconds": _summary(latencies),
+        "main_thread_apply_seconds": _summary(apply_times),
+        "save_state_seconds": save_seconds,
+        "saved": len(report["saved"]),
+        "save_failed": len(report["failed"]),
+        "save_missing": report["missing"],
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CascadeRT scale benchmark (fake libtorrent backend)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="library sizes to run (default: 100 1000 10000)")
+    parser.add_argument("--ticks", type=int, default=20, help="status ticks to measure per size")
+    parser.add_argument("--tick-interval", type=float, default=0.25, help="status pump interval in seconds")
+    parser.add_argument("--output", default="benchmark-results.json", help="where to write the JSON results")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single is not None:
+        # Child process: one size, result as the last line of stdout
+        result = run_size(args.single, args.ticks, args.tick_interval)
+        print(json.dumps(result))
+        return
+
+    results = []
+    for size in args.sizes:
+        print(f"Running {size} torrents...", file=sys.stderr)
+        proc = subprocess.run([sys.executable, __file__, "--single", str(size), "--ticks", str(args.ticks),
+                               "--tick-interval", str(args.tick_interval)],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(proc.stdout + proc.stderr, file=sys.stderr)
+            results.append({"size": size, "error": proc.returncode})
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(f"  load {result['load_state_seconds']:.2f}s, save {result['save_state_seconds']:.2f}s, "
+              f"{result['cpu_seconds_per_tick'] * 1000:.1f} ms CPU/tick, "
+              f"p95 main-loop latency {result['main_loop_latency_seconds']['p95'] or 0:.4f}s, "
+              f"peak RSS {result['peak_rss_kib'] / 1024:.0f} MiB", file=sys.stderr)
+
+    output = {
+        "commit": _git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,24 +9,51 @@
     #but WITHOUT ANY WARRANTY; without even the implied warranty of
     #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
     #GNU General Public License for more details.
+import argparse
+
 import gi
 gi.require_version("Gtk", "4.0")
 from gi.repository import Gtk
 
-from CascadeRT.ui.window import MainWindow
-
 
 class CascadeApp(Gtk.Application):
-    def __init__(self):
+    def __init__(self, attach_socket=None, shards=1):
         super().__init__(application_id="com.cascade.rt")
+        self.attach_socket = attach_socket
+        self.shards = shards
 
     def do_activate(self):
-        win = MainWindow(self)
+        from CascadeRT.ui.window import MainWindow
+
+        session = None
+        if self.attach_socket is not None:
+            from CascadeRT.core.rpc import RemoteSession
+            session = RemoteSession(self.attach_socket or None)
+        elif self.shards > 1:
+            from CascadeRT.core.shards import ShardedSession
+            session = ShardedSession(self.shards)
+
+        win = MainWindow(self, session)
         win.present()
 
 
 def main():
-    app = CascadeApp()
+    parser = argparse.ArgumentParser(description="CascadeRT torrent client")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run the engine headless and serve it on a local socket")
+    parser.add_argument("--attach", nargs="?", const="", metavar="SOCKET",
+                        help="attach the window to a running daemon instead of embedding the engine")
+    parser.add_argument("--socket", help="daemon socket path (with --daemon)")
+    parser.add_argument("--shards", type=int, default=1, metavar="N",
+                        help="run the engine as N processes, each with its own libtorrent session")
+    args = parser.parse_args()
+
+    if args.daemon:
+        from CascadeRT.daemon import run_daemon
+        run_daemon(args.socket, shards=args.shards)
+        return
+
+    app = CascadeApp(args.attach, args.shards)
     app.run()
 
 
@@ -0,0 +1,102 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+"""Shared fixtures: every test runs on benchmarks/fake_libtorrent with a throwaway HOME.
+
+The engine still needs PyGObject (the importer's watch folder uses GLib), so
+tests that build a TorrentSession are skipped where gi is not installed.
+"""
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks import fake_libtorrent
+
+# Before anything from CascadeRT.core imports libtorrent
+fake_libtorrent.install()
+
+# Pump tick for tests; short so alerts round-trip quickly
+TICK = 0.05
+
+
+def wait_until(predicate, timeout=5.0):
+    """Polls predicate() until it is true; fails the test after timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            pytest.fail("timed out waiting for the session")
+        time.sleep(0.01)
+
+
+def status(download_rate=0, paused=False, state="downloading", name="torrent"):
+    """A torrent_status stand-in with the fields StatusTable.update reads."""
+    return SimpleNamespace(paused=paused, auto_managed=False, state=state, queue_position=-1,
+                           added_time=1, num_peers=0, download_rate=download_rate, upload_rate=0,
+                           has_metadata=True, name=name, progress=0.5, total_wanted=1 << 20,
+                           total_done=1 << 19)
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    path = tmp_path / ".config" / "CascadeRT"
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def library(config_dir):
+    """Ten resume files on disk; the even-numbered torrents are paused. Returns their info-hashes."""
+    resume_dir = config_dir / "resume"
+    resume_dir.mkdir()
+    keys = []
+    for i in range(10):
+        params = fake_libtorrent.make_params(i, paused=(i % 2 == 0))
+        (resume_dir / f"{params.info_hashes.v1}.fastresume").write_bytes(
+            fake_libtorrent.write_resume_data_buf(params))
+        keys.append(params.info_hashes.v1)
+    return keys
+
+
+@pytest.fixture
+def session(library):
+    """A running TorrentSession that has loaded library."""
+    pytest.importorskip("gi")
+    from CascadeRT.core.session import TorrentSession
+
+    session = TorrentSession()
+    session.tick_interval = TICK
+    added = []
+    session.subscribe_added(added.extend)
+    session.start_status_pump()
+    session.load_state()
+    wait_until(lambda: len(added) == len(library))
+    yield session
+    session.stop()
+
+
+@pytest.fixture
+def remote(session, tmp_path):
+    """A RemoteSession connected to session through an RpcServer on a socket under tmp_path."""
+    from CascadeRT.core.rpc import RemoteSession, RpcServer
+
+    server = RpcServer(session, tmp_path / "rpc.sock")
+    server.start()
+    client = RemoteSession(server.socket_path, timeout=5.0)
+    yield client
+    client.stop()
+    server.shutdown()
@@ -0,0 +1,47 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import time
+
+from conftest import wait_until
+
+
+def test_checkpoint_counts_saves_answered_immediately(session, library):
+    key = library[1]
+    handle = session.registry.get(key).handle
+    answered = []
+    save_resume_data = handle.save_resume_data
+
+    def answer_first(flags=0):
+        # The alert is handled before save_resume_data() returns
+        save_resume_data(flags)
+        session._handle_alerts(session.session.pop_alerts())
+        answered.append(session._outstanding_saves)
+
+    session._stop_pump()
+    handle.save_resume_data = answer_first
+    with session._dirty_lock:
+        session._dirty = {}
+        session._outstanding_saves = 0
+    session._mark_dirty(key, handle)
+    assert session.checkpoint() == 1
+    assert answered == [0]
+    assert session._outstanding_saves == 0
+
+
+def test_stop_saves_every_changed_torrent(session, library):
+    running = library[1::2]
+    wait_until(lambda: any(session.registry.get(k).handle.need_save_resume_data() for k in running))
+    started = time.monotonic()
+    report = session.stop()
+    assert time.monotonic() - started < session.shutdown_timeout
+    assert report["missing"] == 0
+    assert report["saved"]
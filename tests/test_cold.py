@@ -0,0 +1,118 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import time
+from types import SimpleNamespace
+
+from benchmarks import fake_libtorrent as lt
+from conftest import TICK, wait_until
+
+
+def is_cold(session, key):
+    return session.registry.get(key).cold is not None
+
+
+def is_live(session, key):
+    entry = session.registry.get(key)
+    return entry.cold is None and entry.handle is not None
+
+
+def test_paused_torrents_load_cold(session, library):
+    paused, running = library[0::2], library[1::2]
+    assert all(is_cold(session, key) for key in paused)
+    assert all(is_live(session, key) for key in running)
+    statuses = session.get_statuses()
+    assert set(statuses) == set(library)
+    assert statuses[paused[0]].state == "cold"
+
+
+def test_resume_brings_cold_torrent_back(session, library):
+    key = library[0]
+    session.resume_torrent(key)
+    wait_until(lambda: is_live(session, key))
+    assert not session.get_statuses([key])[key].paused
+
+
+def test_demote_keeps_resume_file(session, library):
+    key = library[1]
+    session.demote_torrent(key)
+    wait_until(lambda: is_cold(session, key))
+    assert session.registry.get(key).handle is None
+    assert session.resume_store.path_for(key).exists()
+
+
+def test_resume_during_demote_keeps_torrent_live(session, library):
+    key = library[1]
+    # Resumed before the demotion's resume save comes back: the save must not evict it
+    session.demote_torrent(key)
+    session.resume_torrent(key)
+    wait_until(lambda: session._outstanding_saves == 0)
+    # A few ticks for a wrongly issued removal to come back
+    time.sleep(5 * TICK)
+    assert is_live(session, key)
+    assert key not in session._demoting
+
+
+def test_remove_cold_torrent_deletes_resume_file(session, library):
+    key = library[2]
+    removed = []
+    session.subscribe_removed(removed.extend)
+    session.remove_torrent(key)
+    wait_until(lambda: key in removed)
+    assert key not in session.registry
+    assert not session.resume_store.path_for(key).exists()
+
+
+def drain(session):
+    # With the pump stopped, the test decides when each batch of alerts is handled
+    session._handle_alerts(session.session.pop_alerts())
+
+
+def test_resume_while_demotion_removal_is_in_flight(session, library):
+    key = library[1]
+    removed = []
+    session.subscribe_removed(removed.extend)
+    session._stop_pump()
+    drain(session)
+
+    session.demote_torrent(key)
+    drain(session) # resume save written; remove_torrent requested
+    assert is_cold(session, key)
+    session.resume_torrent(key) # before torrent_removed_alert
+    drain(session) # removal: keeps the entry and re-adds the torrent
+    drain(session) # add_torrent_alert
+
+    assert is_live(session, key)
+    assert session.resume_store.path_for(key).exists()
+    assert removed == []
+
+
+def test_resume_with_unreadable_resume_file_stays_cold(session, library):
+    key = library[0]
+    session.resume_store.path_for(key).unlink()
+    session.resume_torrent(key)
+    assert is_cold(session, key)
+
+
+def test_failed_re_add_keeps_torrent_cold(session, library):
+    key = library[0]
+    record = session.registry.get(key).cold
+
+    def fail_add(params):
+        alert = lt.add_torrent_alert(None, params)
+        alert.error = SimpleNamespace(value=lambda: 1)
+        session.session._post(alert)
+
+    session.session.async_add_torrent = fail_add
+    session.resume_torrent(key)
+    wait_until(lambda: is_cold(session, key))
+    assert session.registry.get(key).cold is record
+    assert session.resume_store.path_for(key).exists()
@@ -0,0 +1,77 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+from benchmarks import fake_libtorrent as lt
+
+
+def magnet(i):
+    return f"magnet:?xt=urn:btih:{lt.fake_info_hash(1000 + i)}&dn=import{i}"
+
+
+def test_import_parses_in_bounded_chunks(session, tmp_path, monkeypatch):
+    from CascadeRT.core import ingest
+
+    monkeypatch.setattr(ingest, "IMPORT_CHUNK", 2)
+    importer = session.importer
+    chunks = []
+    pool_map = importer._pool.map
+
+    def recording_map(fn, items):
+        chunks.append(len(items))
+        return pool_map(fn, items)
+
+    monkeypatch.setattr(importer._pool, "map", recording_map)
+    importer._run([magnet(i) for i in range(5)], str(tmp_path), None)
+    assert chunks == [2, 2, 1]
+    assert all(lt.fake_info_hash(1000 + i) in session.registry for i in range(5))
+
+
+def test_watch_folder_keeps_failed_magnet_lines(session, tmp_path):
+    from CascadeRT.core.ingest import FAILED_SUFFIX, IMPORTED_SUFFIX
+
+    listing = tmp_path / "links.magnets"
+    listing.write_text(f"{magnet(0)}\nmagnet:?dn=no-info-hash\n{magnet(1)}\n")
+    importer = session.importer
+    importer._run([str(listing)], str(tmp_path), importer._mark_imported)
+
+    assert not listing.exists()
+    assert (tmp_path / f"links.magnets{IMPORTED_SUFFIX}").exists()
+    assert (tmp_path / f"links.magnets{FAILED_SUFFIX}").read_text() == "magnet:?dn=no-info-hash\n"
+    assert lt.fake_info_hash(1001) in session.registry
+
+
+def test_watch_folder_sets_aside_files_with_nothing_to_add(session, tmp_path):
+    from CascadeRT.core.ingest import FAILED_SUFFIX
+
+    broken = tmp_path / "broken.torrent"
+    broken.write_bytes(b"not bencoded")
+    listing = tmp_path / "bad.magnets"
+    listing.write_text("magnet:?dn=no-info-hash\n")
+    importer = session.importer
+    importer._run([str(broken), str(listing)], str(tmp_path), importer._mark_imported)
+
+    assert not broken.exists() and not listing.exists()
+    assert (tmp_path / f"broken.torrent{FAILED_SUFFIX}").read_bytes() == b"not bencoded"
+    assert (tmp_path / f"bad.magnets{FAILED_SUFFIX}").read_text() == "magnet:?dn=no-info-hash\n"
+
+
+def test_shutdown_mid_import_exits_quietly(session, tmp_path, monkeypatch):
+    importer = session.importer
+    imported = []
+    pool_map = importer._pool.map
+
+    def shut_down_first(fn, items):
+        importer.shutdown()
+        return pool_map(fn, items)
+
+    monkeypatch.setattr(importer._pool, "map", shut_down_first)
+    importer._run([magnet(i) for i in range(5)], str(tmp_path), lambda *args: imported.append(args))
+    assert imported == []
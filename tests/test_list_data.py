@@ -0,0 +1,136 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+"""TorrentListData: the list's store and status batching, which run without a display."""
+import pytest
+
+from conftest import status
+
+KEYS = ("a" * 40, "b" * 40, "c" * 40)
+
+
+def run_idle():
+    """Runs main-loop callbacks until none are ready."""
+    from gi.repository import GLib
+
+    context = GLib.MainContext.default()
+    while context.iteration(False):
+        pass
+
+
+def count_flushes(data):
+    """Counts scheduled status flushes from here on; returns the list they are recorded in."""
+    flushes = []
+    flush_pending = data.flush_pending
+
+    def counted():
+        flushes.append(data.pending_count())
+        return flush_pending()
+
+    data.flush_pending = counted
+    return flushes
+
+
+@pytest.fixture
+def data():
+    """A TorrentListData holding KEYS, with nothing left queued."""
+    pytest.importorskip("gi")
+    from CascadeRT.ui.list_data import TorrentListData
+
+    data = TorrentListData()
+    data.queue_added([(key, key[:1], False) for key in KEYS])
+    run_idle()
+    yield data
+    data.set_refresh_interval(0)
+    run_idle()
+
+
+def test_removed_torrent_drops_its_queued_status(data):
+    data.queue_statuses({KEYS[0]: status(download_rate=4096)})
+    data.remove_torrents([KEYS[0]])
+    assert data.pending_count() == 0
+    run_idle()
+    # Not kept back as an early status for a row that will never be inserted
+    assert KEYS[0] not in data._early_statuses
+    assert data.get_model(KEYS[0]) is None
+    assert data.store.get_n_items() == 2
+
+
+def test_ticks_are_coalesced_into_one_flush(data):
+    flushes = count_flushes(data)
+    data.queue_statuses({KEYS[0]: status(download_rate=4096), KEYS[1]: status()})
+    data.queue_statuses({KEYS[0]: status(download_rate=8192)})
+    # One main-loop callback for both ticks, latest status wins
+    run_idle()
+    assert flushes == [2]
+    assert data.table.download_rate[data.get_model(KEYS[0]).slot] == 8192
+
+
+def test_only_shown_rows_copy_every_property(data):
+    shown, hidden = data.get_model(KEYS[0]), data.get_model(KEYS[1])
+    data.show(shown)
+    data.apply_statuses({KEYS[0]: status(download_rate=4096), KEYS[1]: status(download_rate=4096)})
+    assert data.table.download_rate[hidden.slot] == 4096
+    assert shown.download_rate == 4096
+    # Off screen: the status is in the table, the model only keeps its sort and filter keys
+    assert hidden.download_rate == 0
+    data.show(hidden)
+    assert hidden.download_rate == 4096
+
+
+def test_summary_follows_the_table(data):
+    summaries = []
+    data._on_summary = summaries.append
+    data.queue_statuses({KEYS[0]: status(state="seeding"), KEYS[1]: status(download_rate=1024)})
+    run_idle()
+    assert summaries[-1].startswith("3 torrents: 2 downloading, 1 seeding")
+
+
+def test_held_refresh_applies_everything_on_resume(data):
+    from CascadeRT.core.trackers import TrackerSummary
+
+    flushes = count_flushes(data)
+    data.set_refresh_interval(None)
+    data.queue_statuses({KEYS[0]: status(download_rate=1024)})
+    data.queue_statuses({KEYS[0]: status(download_rate=2048), KEYS[1]: status()})
+    data.queue_trackers({KEYS[2]: TrackerSummary(2, 1, 1, 0, 0.0)})
+    run_idle()
+    # Hidden window: coalesced per torrent, no main-loop work at all
+    assert flushes == []
+    assert data.pending_count() == 2
+    data.set_refresh_interval(0)
+    run_idle()
+    assert flushes == [2]
+    assert data.table.download_rate[data.get_model(KEYS[0]).slot] == 2048
+    assert data.get_model(KEYS[2]).num_trackers == 2
+
+
+def test_slowed_refresh_pushes_only_hot_torrents(data):
+    flushes = count_flushes(data)
+    data.set_refresh_interval(60)
+    data.queue_statuses({key: status(download_rate=1024) for key in KEYS})
+    run_idle()
+    assert flushes == [] and data.pending_count() == 3
+
+    # The selection skips the wait
+    data.set_selected_key(KEYS[1])
+    data.queue_statuses({KEYS[1]: status(download_rate=2048)})
+    run_idle()
+    assert data.table.download_rate[data.get_model(KEYS[1]).slot] == 2048
+    assert data.pending_count() == 2
+
+    # So does a torrent whose state just changed
+    data.queue_statuses({KEYS[2]: status(paused=True)})
+    run_idle()
+    assert data.table.state_name(data.get_model(KEYS[2]).slot) == "paused"
+    assert data.pending_count() == 1
+    assert data.table.download_rate[data.get_model(KEYS[0]).slot] == 0
+    assert flushes == []
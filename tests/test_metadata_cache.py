@@ -0,0 +1,68 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+from benchmarks import fake_libtorrent as lt
+from conftest import wait_until
+from CascadeRT.core.metadata_cache import MetadataCache
+
+KEY = lt.fake_info_hash(1000)
+MAGNET = f"magnet:?xt=urn:btih:{KEY}&dn=cached"
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = MetadataCache(tmp_path, max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"
+    cache.put("c", b"12345")
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert not cache.path_for("b").exists()
+
+
+def test_cache_keeps_entries_across_restarts(tmp_path):
+    MetadataCache(tmp_path).put("a", b"data")
+    assert MetadataCache(tmp_path).get("a") == b"data"
+
+
+def test_cached_magnet_is_added_with_metadata(session, tmp_path):
+    session.metadata_cache.put(KEY, lt.bencode({"info_hash": KEY, "name": "cached", "total_size": 1024}))
+    key, params = session.parse_source(MAGNET, tmp_path)
+    assert key == KEY
+    assert params.ti is not None and params.ti.name() == "cached"
+    assert params.flags == lt.torrent_flags.auto_managed
+
+
+def test_corrupt_cache_entry_falls_back_to_magnet(session, tmp_path):
+    session.metadata_cache.put(KEY, b"d4:info")
+    key, params = session.parse_source(MAGNET, tmp_path)
+    assert key == KEY
+    assert params.ti is None
+    assert params.flags == lt.torrent_flags.paused
+    # Evicted, so the next add doesn't trip over it again
+    assert KEY not in session.metadata_cache
+    assert not session.metadata_cache.path_for(KEY).exists()
+
+
+def test_hybrid_metadata_is_found_by_v1_magnet(session, tmp_path):
+    v2 = "ab" * 32
+    key = session.add_torrent(MAGNET, tmp_path)
+    wait_until(lambda: session.registry.get(key).handle is not None)
+    handle = session.registry.get(key).handle
+    # Metadata arrives: the torrent turns out to be hybrid, best hash v2
+    info = lt.torrent_info({"info_hash": KEY, "info_hash_v2": v2, "name": "hybrid", "total_size": 1})
+    handle._params.ti = info
+    handle._hashes = info.info_hashes()
+    session._on_metadata_received(lt.metadata_received_alert(handle))
+
+    assert KEY in session.metadata_cache and v2 in session.metadata_cache
+    _, params = session.parse_source(MAGNET, tmp_path)
+    assert params.ti is not None and params.ti.name() == "hybrid"
@@ -0,0 +1,31 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+from CascadeRT.core.metrics import METRICS, MetricsRegistry
+
+
+def test_registry_renders_collectors_until_removed():
+    registry = MetricsRegistry()
+
+    def collector():
+        return [("cascadert_test_value", "gauge", "A test value", [({}, 3)])]
+
+    registry.add_collector(collector)
+    assert "cascadert_test_value 3" in registry.render()
+    registry.remove_collector(collector)
+    assert "cascadert_test_value" not in registry.render()
+
+
+def test_stopped_session_leaves_metrics_registry(session):
+    assert session._collect_metrics in METRICS._collectors
+    session.stop()
+    assert session._collect_metrics not in METRICS._collectors
+    assert "cascadert_alerts_per_pop" in METRICS.render()
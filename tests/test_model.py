@@ -0,0 +1,73 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import pytest
+
+from conftest import status
+
+KEY = "a" * 40
+
+
+@pytest.fixture
+def row():
+    """(StatusTable, TorrentModel) for one torrent, synced once from a 100 KiB/s status."""
+    pytest.importorskip("gi")
+    from CascadeRT.core.model import TorrentModel
+    from CascadeRT.core.status_table import StatusTable
+
+    table = StatusTable()
+    model = TorrentModel(KEY, "torrent")
+    model.slot = table.add(KEY, "torrent")
+    table.update(model.slot, status(download_rate=100 * 1024))
+    model.sync(table)
+    return table, model
+
+
+def sync(row, **fields):
+    table, model = row
+    table.update(model.slot, status(**fields))
+    return model.sync(table)
+
+
+def test_unchanged_status_writes_nothing(row):
+    assert sync(row, download_rate=100 * 1024) == set()
+
+
+def test_rate_jitter_below_the_label_precision_is_dropped(row):
+    from CascadeRT.core.model import RATE_MIN_DELTA
+
+    _, model = row
+    assert "download_rate" not in sync(row, download_rate=100 * 1024 + RATE_MIN_DELTA - 1)
+    assert model.download_rate == 100 * 1024
+
+
+def test_rate_change_past_the_threshold_is_written(row):
+    _, model = row
+    # 2% of 100 KiB/s is above the 0.1 KB/s floor
+    changed = sync(row, download_rate=103 * 1024)
+    assert "download_rate" in changed and "eta" in changed
+    assert model.download_rate == 103 * 1024
+
+
+def test_rate_drop_to_zero_is_always_written(row):
+    _, model = row
+    assert "download_rate" in sync(row, download_rate=0)
+    assert model.download_rate == 0
+
+
+def test_sync_limited_to_some_props(row):
+    _, model = row
+    # Off-screen rows only copy their sort and filter keys
+    changed = model.sync(row[0], {"state"})
+    assert changed == set()
+    row[0].update(model.slot, status(paused=True))
+    assert model.sync(row[0], {"state", "name"}) == {"state"}
+    assert not model.paused
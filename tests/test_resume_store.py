@@ -0,0 +1,63 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import pytest
+
+from conftest import wait_until
+from CascadeRT.core.resume import ResumeStore
+
+
+def test_write_replaces_the_file_atomically(tmp_path):
+    store = ResumeStore(tmp_path)
+    store.write("a", b"old")
+    store.write("a", b"new")
+    assert store.read("a") == b"new"
+    assert [path.name for path in tmp_path.iterdir()] == ["a.fastresume"]
+
+
+def test_load_all_skips_empty_files_and_interrupted_writes(tmp_path):
+    store = ResumeStore(tmp_path)
+    store.write("a", b"data")
+    store.path_for("b").write_bytes(b"")
+    leftover = tmp_path / "c.fastresume.tmp"
+    leftover.write_bytes(b"half")
+    assert list(store.load_all()) == [("a", b"data")]
+    assert not leftover.exists()
+
+
+def test_quarantine_keeps_the_file_out_of_the_way(tmp_path):
+    store = ResumeStore(tmp_path)
+    store.write("a", b"garbage")
+    store.quarantine("a")
+    assert not store.path_for("a").exists()
+    assert (tmp_path / "a.fastresume.corrupt").read_bytes() == b"garbage"
+    assert list(store.load_all()) == []
+    # Nothing to move is not an error
+    store.quarantine("a")
+
+
+def test_corrupt_checkpoint_is_quarantined_on_load(config_dir, library):
+    pytest.importorskip("gi")
+    from CascadeRT.core.session import TorrentSession
+
+    corrupt = config_dir / "resume" / ("f" * 40 + ResumeStore.SUFFIX)
+    corrupt.write_bytes(b"not a checkpoint")
+    session = TorrentSession()
+    added = []
+    session.subscribe_added(added.extend)
+    session.start_status_pump()
+    try:
+        session.load_state()
+        # The rest of the library still loads
+        wait_until(lambda: len(added) == len(library) and not corrupt.exists())
+        assert corrupt.with_name(corrupt.name + ".corrupt").exists()
+    finally:
+        session.stop()
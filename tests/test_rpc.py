@@ -0,0 +1,80 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import socket
+import stat
+
+import pytest
+
+from conftest import wait_until
+
+
+def test_socket_is_owner_only(remote):
+    assert stat.S_IMODE(remote.socket_path.stat().st_mode) == 0o600
+
+
+def test_statuses_round_trip(session, remote, library):
+    local = session.get_statuses()
+    statuses = remote.get_statuses()
+    assert set(statuses) == set(library)
+    for key in library:
+        assert statuses[key].name == local[key].name
+        assert statuses[key].paused == local[key].paused
+
+
+def test_calls_reach_the_session(session, remote, library):
+    key = library[1]
+    remote.pause_torrent(key)
+    assert session.get_statuses([key])[key].paused
+    remote.set_global_limits(2048, 1024)
+    wait_until(lambda: remote.get_limits().download_limit == 2048)
+
+
+def test_subscribe_streams_library_and_changes(session, remote, library):
+    added, removed = [], []
+    remote.subscribe_added(added.extend)
+    remote.subscribe_removed(removed.extend)
+    remote.start_status_pump()
+    wait_until(lambda: len(added) == len(library))
+    assert {entry[0] for entry in added} == set(library)
+
+    session.remove_torrent(library[3])
+    wait_until(lambda: removed == [library[3]])
+
+
+def test_errors_come_back_as_rpc_errors(remote):
+    from CascadeRT.core.registry import DuplicateTorrentError
+    from CascadeRT.core.rpc import RpcError
+
+    with pytest.raises(RpcError):
+        remote.call("stop")
+    with pytest.raises(RpcError):
+        remote.move_queue("0" * 40, "up")
+    with pytest.raises(DuplicateTorrentError):
+        remote.add_source(f"magnet:?xt=urn:btih:{remote.list_torrents()[0][0]}", "/tmp")
+
+
+def test_server_replaces_stale_socket_but_not_live_one(session, tmp_path):
+    from CascadeRT.core.rpc import RpcError, RpcServer
+
+    path = tmp_path / "stale.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    server = RpcServer(session, path)
+    server.start()
+    try:
+        with pytest.raises(RpcError):
+            RpcServer(session, path).start()
+    finally:
+        server.shutdown()
+    assert not path.exists()
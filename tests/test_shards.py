@@ -0,0 +1,146 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import socket
+
+import pytest
+
+from benchmarks import fake_libtorrent as lt
+from conftest import wait_until
+from CascadeRT.core.infohash import shard_index
+from CascadeRT.core.registry import DuplicateTorrentError
+from CascadeRT.core.resume import rebalance_resume_files, shard_data_dir
+
+
+def write_resume_files(directory, count):
+    directory.mkdir(parents=True, exist_ok=True)
+    keys = [lt.fake_info_hash(i) for i in range(count)]
+    for key in keys:
+        (directory / f"{key}.fastresume").write_bytes(b"resume")
+    return keys
+
+
+def test_shard_index_is_stable_and_in_range():
+    keys = [lt.fake_info_hash(i) for i in range(200)]
+    indices = [shard_index(key, 4) for key in keys]
+    assert indices == [shard_index(key, 4) for key in keys]
+    assert set(indices) == {0, 1, 2, 3}
+
+
+def test_rebalance_moves_files_to_owner_and_back(config_dir):
+    keys = write_resume_files(config_dir / "resume", 20)
+
+    rebalance_resume_files(config_dir, 4)
+    assert not list((config_dir / "resume").iterdir())
+    for key in keys:
+        assert (shard_data_dir(config_dir, shard_index(key, 4)) / "resume" / f"{key}.fastresume").exists()
+
+    rebalance_resume_files(config_dir, 3)
+    for key in keys:
+        assert (shard_data_dir(config_dir, shard_index(key, 3)) / "resume" / f"{key}.fastresume").exists()
+
+    rebalance_resume_files(config_dir, 1)
+    assert sorted(p.name for p in (config_dir / "resume").iterdir()) == sorted(f"{k}.fastresume" for k in keys)
+
+
+def test_rate_shares_follow_traffic():
+    pytest.importorskip("gi")
+    from CascadeRT.core.shards import IDLE_SHARE, rebalance_shares
+
+    limit = 1000
+    shares = [0.25] * 4
+    assert rebalance_shares([0, 0, 0, 0], shares, limit) == shares
+    assert rebalance_shares([250, 0, 0, 0], shares, 0) == shares
+
+    # All the traffic is on shard 0, which is held at its share: it takes over the limit
+    for _ in range(5):
+        shares = rebalance_shares([shares[0] * limit, 0, 0, 0], shares, limit)
+    assert sum(shares) == pytest.approx(1.0)
+    assert shares[0] == pytest.approx(1 - IDLE_SHARE + IDLE_SHARE / 4)
+    assert shares[1] == pytest.approx(IDLE_SHARE / 4)
+
+
+def sharded_over(remote):
+    from CascadeRT.core.shards import ShardedSession
+
+    # One shard over the test's RPC connection; no worker processes
+    sharded = ShardedSession.__new__(ShardedSession)
+    sharded.count = 1
+    sharded.shards = [remote]
+    return sharded
+
+
+def test_add_params_reports_duplicates_and_failures_apart(remote, tmp_path):
+    from CascadeRT.core.rpc import RpcError
+
+    path = tmp_path / "new.torrent"
+    path.write_bytes(lt.bencode({"info_hash": lt.fake_info_hash(500), "name": "new", "total_size": 1}))
+    sharded = sharded_over(remote)
+
+    key, params = sharded.parse_source(str(path), tmp_path)
+    sharded.add_params(key, params)
+    with pytest.raises(DuplicateTorrentError):
+        sharded.add_params(key, params)
+
+    # Parsed by the coordinator, corrupt by the time the shard reads it: a failure, not a duplicate
+    other = tmp_path / "other.torrent"
+    other.write_bytes(lt.bencode({"info_hash": lt.fake_info_hash(501), "name": "other", "total_size": 1}))
+    key, params = sharded.parse_source(str(other), tmp_path)
+    other.write_bytes(b"d4:info")
+    with pytest.raises(RpcError):
+        sharded.add_params(key, params)
+
+
+def test_second_instance_leaves_live_shards_alone(config_dir, tmp_path, monkeypatch):
+    pytest.importorskip("gi")
+    from CascadeRT.core.shards import ShardedSession
+
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    keys = write_resume_files(config_dir / "resume", 5)
+    live = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    live.bind(str(tmp_path / "cascadert-shard1.sock"))
+    live.listen()
+    try:
+        with pytest.raises(RuntimeError):
+            ShardedSession(2)
+    finally:
+        live.close()
+    assert (tmp_path / "cascadert-shard1.sock").exists()
+    # Refused before touching the other instance's resume files
+    assert len(list((config_dir / "resume").iterdir())) == len(keys)
+
+
+def test_rate_shares_scale_session_limits(session):
+    applied = session.session.settings
+    session.set_global_limits(1000, 1000)
+    wait_until(lambda: applied.get("download_rate_limit") == 1000)
+    session.set_rate_shares(0.5, 0.25)
+    wait_until(lambda: (applied["download_rate_limit"], applied["upload_rate_limit"]) == (500, 250))
+    assert session.get_limits().download_limit == 1000
+
+
+def test_unsharded_session_leaves_live_shards_alone(config_dir, tmp_path, monkeypatch):
+    pytest.importorskip("gi")
+    from CascadeRT.core.rpc import shard_socket_path
+    from CascadeRT.core.session import TorrentSession
+
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    shard_resume = shard_data_dir(config_dir, 0) / "resume"
+    keys = write_resume_files(shard_resume, 3)
+    live = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    live.bind(str(shard_socket_path(0)))
+    live.listen()
+    try:
+        with pytest.raises(RuntimeError):
+            TorrentSession()
+    finally:
+        live.close()
+    assert len(list(shard_resume.iterdir())) == len(keys)
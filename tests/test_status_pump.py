@@ -0,0 +1,54 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import threading
+
+from benchmarks import fake_libtorrent as lt
+from conftest import wait_until
+
+
+def drain(session):
+    session._handle_alerts(session.session.pop_alerts())
+
+
+def test_one_batch_per_tick_with_only_changed_torrents(session, library):
+    running = set(library[1::2])
+    session._stop_pump()
+    # Newly added torrents all report once; get that out of the way
+    session.session.post_torrent_updates()
+    drain(session)
+    batches = []
+    session.subscribe_status(batches.append)
+
+    session.session.post_torrent_updates()
+    drain(session)
+
+    assert len(batches) == 1
+    batch = batches[0]
+    # The fake reports a CHURN fraction of the live torrents as changed; cold ones never
+    assert batch and set(batch) <= running
+    assert len(batch) < len(running)
+
+
+def test_no_thread_per_torrent(session, tmp_path):
+    before = threading.active_count()
+    keys = [session.add_torrent(f"magnet:?xt=urn:btih:{lt.fake_info_hash(2000 + i)}&dn=more{i}", tmp_path)
+            for i in range(20)]
+    wait_until(lambda: all(session.registry.get(key).handle is not None for key in keys))
+    assert threading.active_count() == before
+    assert sum(thread.name == "cascadert-pump" for thread in threading.enumerate()) == 1
+
+
+def test_statuses_keep_flowing_while_running(session, library):
+    seen = set()
+    session.subscribe_status(seen.update)
+    # Every live torrent shows up within a few ticks; one changed set per tick is enough
+    wait_until(lambda: set(library[1::2]) <= seen)
@@ -0,0 +1,78 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+import pytest
+
+from conftest import status
+
+
+@pytest.fixture(params=["numpy", "array"])
+def status_table(request, monkeypatch):
+    """The status_table module, with its aggregates on NumPy (when installed) or the array module."""
+    pytest.importorskip("gi")
+    from CascadeRT.core import status_table
+
+    if request.param == "numpy":
+        if status_table.numpy is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(status_table, "numpy", None)
+    return status_table
+
+
+@pytest.fixture
+def table(status_table):
+    """Three downloading torrents at 1, 2 and 3 KiB/s, each with 512 KiB of 1 MiB left, and one seeding."""
+    table = status_table.StatusTable()
+    for i, rate in enumerate((1024, 2048, 3072)):
+        table.update(table.add(f"d{i}", "torrent"), status(download_rate=rate))
+    table.update(table.add("s", "seed"), status(download_rate=0, state="seeding"))
+    return table
+
+
+def test_update_writes_the_columns(table):
+    slot = table.slots["d1"]
+    assert table.download_rate[slot] == 2048
+    assert table.progress[slot] == 0.5
+    assert table.total_size[slot] == 1 << 20
+    assert table.state_name(slot) == "downloading"
+    assert table.eta_seconds[slot] == (1 << 19) // 2048
+
+
+def test_paused_torrent_has_no_rate(table):
+    slot = table.slots["d0"]
+    table.update(slot, status(download_rate=1024, paused=True))
+    assert table.download_rate[slot] == 0
+    assert table.state_name(slot) == "paused"
+
+
+def test_aggregates(table, status_table):
+    assert table.total_rates() == (1024 + 2048 + 3072, 0)
+    assert table.state_counts() == {"downloading": 3, "seeding": 1}
+    # 3 * 512 KiB left at 6 KiB/s
+    assert table.session_eta() == 3 * (1 << 19) // (6 * 1024)
+
+
+def test_removed_slot_is_zeroed_and_reused(table, status_table):
+    slot = table.slots["d2"]
+    table.remove("d2")
+    assert "d2" not in table and len(table) == 3
+    assert table.total_rates() == (1024 + 2048, 0)
+    assert table.state_counts() == {"downloading": 2, "seeding": 1}
+    assert table.add("new", "new") == slot
+
+
+def test_session_eta_unknown_without_downloads(status_table):
+    from CascadeRT.core.model import ETA_UNKNOWN
+
+    table = status_table.StatusTable()
+    table.update(table.add("s", "seed"), status(state="seeding"))
+    assert table.session_eta() == ETA_UNKNOWN
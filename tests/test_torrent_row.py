@@ -0,0 +1,85 @@
+    #Copyright (C) 2025 Partakith
+
+    #This program is free software: you can redistribute it and/or modify
+    #it under the terms of the GNU General Public License as published by
+    #the Free Software Foundation, either version 3 of the License, or
+    #(at your option) any later version.
+
+    #This program is distributed in the hope that it will be useful,
+    #but WITHOUT ANY WARRANTY; without even the implied warranty of
+    #MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    #GNU General Public License for more details.
+"""TorrentRow's bind/unbind lifecycle; needs GTK 4 and a display (e.g. under xvfb-run)."""
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import wait_until
+
+
+@pytest.fixture
+def row():
+    gi = pytest.importorskip("gi")
+    try:
+        gi.require_version("Gtk", "4.0")
+        from gi.repository import Gtk
+    except (ValueError, ImportError):
+        pytest.skip("GTK 4 is not installed")
+
+    if not Gtk.init_check():
+        pytest.skip("no display")
+    from CascadeRT.ui.torrent_list import TorrentRow
+
+    calls = []
+    session = SimpleNamespace(pause_torrent=lambda key: calls.append(("pause", key)),
+                              resume_torrent=lambda key: calls.append(("resume", key)))
+    row = TorrentRow(session)
+    row.calls = calls
+    return row
+
+
+def model(key, name):
+    from CascadeRT.core.model import TorrentModel
+
+    return TorrentModel(key, name)
+
+
+def test_bind_shows_the_torrent(row):
+    torrent = model("a" * 40, "first")
+    row.bind(torrent)
+    assert row._name.get_label() == "first"
+    torrent.download_rate = 2048
+    assert row._info.get_text().startswith("D:2.0 KB/s")
+
+
+def test_unbind_releases_the_old_torrent(row):
+    torrent = model("a" * 40, "first")
+    row.bind(torrent)
+    row.unbind()
+    torrent.name = "renamed"
+    torrent.download_rate = 4096
+    assert row._name.get_label() == "first"
+    assert not row._info.get_text().startswith("D:4.0")
+
+
+def test_rebinding_a_recycled_row_follows_only_the_new_torrent(row):
+    first, second = model("a" * 40, "first"), model("b" * 40, "second")
+    row.bind(first)
+    row.bind(second)
+    first.name = "stale"
+    first.download_rate = 4096
+    assert row._name.get_label() == "second"
+    assert row._info.get_text().startswith("D:0.0")
+    second.download_rate = 1024
+    assert row._info.get_text().startswith("D:1.0")
+
+
+def test_buttons_act_on_the_current_torrent(row):
+    row.bind(model("a" * 40, "first"))
+    row.bind(model("b" * 40, "second"))
+    row._on_pause(None)
+    wait_until(lambda: row.calls)
+    assert row.calls == [("pause", "b" * 40)]
+    row.unbind()
+    row._on_resume(None)
+    assert row.calls == [("pause", "b" * 40)]